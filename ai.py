@@ -7,9 +7,40 @@ evaluation functions, move simulation, and the core search algorithms.
 """
 
 from copy import deepcopy
-from constants import RED, BLACK, ROWS, COLS
+from collections import namedtuple
+from constants import (RED, BLACK, ROWS, COLS, MAX_SEARCH_DEPTH, LMR_ENABLED, LMR_MIN_DEPTH, LMR_MIN_MOVES,
+                       LMR_REDUCTION, FUTILITY_ENABLED, FUTILITY_DEPTH, FUTILITY_MARGIN, ANYTIME_ENABLED,
+                       SYMMETRY_ENABLED)
+from history import is_irreversible
+from move_cache import MoveCache
+from position import Position, mirror_move
+from shared_tt import SharedTranspositionTable
+from tt import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND, NEGATED_FLAGS
+from tracer import LEAF, TT_HIT, CUTOFF, FAIL_LOW, NO_MOVES, EXACT as TRACE_EXACT
 import time
 import random
+import multiprocessing
+
+default_move_cache = MoveCache()
+
+SearchSettings = namedtuple(
+    'SearchSettings',
+    ['lmr', 'lmr_min_depth', 'lmr_min_moves', 'lmr_reduction', 'futility', 'futility_depth', 'futility_margin',
+     'anytime', 'symmetry'],
+    defaults=[LMR_ENABLED, LMR_MIN_DEPTH, LMR_MIN_MOVES, LMR_REDUCTION, FUTILITY_ENABLED, FUTILITY_DEPTH, FUTILITY_MARGIN,
+              ANYTIME_ENABLED, SYMMETRY_ENABLED])
+SearchSettings.__doc__ = """Switches and parameters of the selective search.
+
+lmr: reduce late quiet moves. lmr_min_depth: remaining depth needed to reduce.
+lmr_min_moves: moves searched at full depth before reducing. lmr_reduction: plies removed.
+futility: skip quiet moves near the leaves when the static evaluation plus a
+margin cannot reach the window. futility_depth: deepest remaining depth to prune
+at. futility_margin: evaluation margin per ply of remaining depth.
+anytime: when the limits interrupt an iteration, play the best root move it
+searched completely instead of the previous iteration's move.
+symmetry: share transposition table entries between a position and its
+mirror image (see Board.canonical_key).
+"""
 
 def evaluate_board(board):
     """
@@ -32,38 +63,161 @@ def evaluate_board(board):
         return float('-inf')
 
     score = 0
-    for row in range(ROWS):
-        for col in range(COLS):
-            piece = board.board[row][col]
-            if piece != 0:
-                piece_score = 10
-                if piece.king:
-                    piece_score = 20
-                
-                if 2 <= row <= 5 and 2 <= col <= 5:
-                    piece_score += 2
-                
-                if not piece.king:
-                    if piece.color == BLACK:
-                        piece_score += row
-                    else:
-                        piece_score += (7 - row)
-                
-                if col == 0 or col == COLS - 1:
-                    piece_score += 1
-                
+    for color in (RED, BLACK):
+        for piece in board.pieces[color]:
+            row, col = piece.row, piece.col
+            piece_score = 10
+            if piece.king:
+                piece_score = 20
+            
+            if 2 <= row <= 5 and 2 <= col <= 5:
+                piece_score += 2
+            
+            if not piece.king:
                 if piece.color == BLACK:
-                    score += piece_score
+                    piece_score += row
                 else:
-                    score -= piece_score
+                    piece_score += (7 - row)
+            
+            if col == 0 or col == COLS - 1:
+                piece_score += 1
+            
+            if piece.color == BLACK:
+                score += piece_score
+            else:
+                score -= piece_score
     
     return score
 
-def minimax(position, depth, alpha, beta, max_player, start_time, time_limit):
+class SearchContext:
+    """
+    Holds the limits and shared state of one search.
+
+    Attributes:
+        start_time (float): The time when the search started.
+        time_limit (float or None): Maximum allowed time in seconds, or None for no clock.
+        deadline (float or None): start_time + time_limit, or None for no clock.
+        max_nodes (int or None): Maximum number of nodes to visit, or None for no budget.
+        nodes (int): Number of nodes visited so far.
+        rng (random.Random): Generator used to shuffle moves. Seed it for reproducible searches.
+        history (GameHistory or None): Positions played so far, used for repetition detection.
+        cache (MoveCache or None): Cache used to generate moves at interior nodes.
+        tt (TranspositionTable or None): Table of earlier search results.
+        settings (SearchSettings): Selective search switches and parameters.
+        tracer (SearchTracer or None): Records the searched tree when set.
+        stopped (bool): Set by stop() to abort the search from another thread.
+        root (Board or None): Root position of the running iteration, set by search().
+        root_best (tuple or None): (move details, score) of the best root move
+            searched completely in the running iteration.
+        root_searched (list): Root moves searched completely in the running iteration.
+    """
+    def __init__(self, time_limit=None, max_nodes=None, seed=None, history=None, cache=None, start_time=None, tt=None,
+                 settings=None, tracer=None):
+        """
+        Initializes the search state.
+
+        Args:
+            time_limit (float, optional): Time limit in seconds. Defaults to None (no clock).
+            max_nodes (int, optional): Node budget. Defaults to None (unlimited).
+            seed (int, optional): Seed for move shuffling. Defaults to None (unseeded).
+            history (GameHistory, optional): Positions played so far. Defaults to None.
+            cache (MoveCache, optional): Move cache. Defaults to None.
+            start_time (float, optional): Start of the clock. Defaults to now.
+            tt (TranspositionTable, optional): Transposition table. Defaults to None.
+            settings (SearchSettings, optional): Selective search settings.
+                Defaults to SearchSettings(), configured in constants.py.
+            tracer (SearchTracer, optional): Search tree tracer. Defaults to None.
+        """
+        self.start_time = time.time() if start_time is None else start_time
+        self.time_limit = time_limit
+        self.deadline = None if time_limit is None else self.start_time + time_limit
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.rng = random.Random(seed)
+        self.history = history
+        self.cache = cache
+        self.tt = tt
+        self.settings = SearchSettings() if settings is None else settings
+        self.tracer = tracer
+        self.stopped = False
+        self.root = None
+        self.root_best = None
+        self.root_searched = []
+
+    def stop(self):
+        """Asks a running search to stop at its next node."""
+        self.stopped = True
+
+    def check_limits(self):
+        """
+        Counts a node and checks the search budget.
+
+        Raises:
+            TimeoutError: If the search was stopped, or the time limit or the node budget is exhausted.
+        """
+        self.nodes += 1
+        if self.stopped:
+            raise TimeoutError
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise TimeoutError
+        if self.deadline is not None and time.time() > self.deadline:
+            raise TimeoutError
+
+    def check_clock(self):
+        """
+        Checks the clock without counting a node.
+
+        Called between the child positions generated at a node, each of which
+        costs a board copy, so the search stops within one copy of the deadline.
+
+        Raises:
+            TimeoutError: If the search was stopped or the time limit is exhausted.
+        """
+        if self.stopped or (self.deadline is not None and time.time() > self.deadline):
+            raise TimeoutError
+
+    def root_done(self, move_details, best_move, value):
+        """
+        Notes a completely searched root move and the best move and score so far.
+
+        The best move is only replaced when the score improves: a later move
+        that fails low can return a bound equal to the best score, and such a
+        tie says nothing about the move.
+        """
+        self.root_searched.append(move_details)
+        if best_move is not None and (self.root_best is None or value != self.root_best[1]):
+            self.root_best = (best_move, value)
+
+SearchResult = namedtuple('SearchResult', ['move', 'score', 'depth', 'nodes', 'elapsed', 'partial'],
+                          defaults=[False])
+SearchResult.__doc__ = """Outcome of a search: best move, its score, completed depth, nodes visited and
+seconds used. partial is True when the move and score come from the
+interrupted iteration after the completed depth."""
+
+PVLine = namedtuple('PVLine', ['move', 'score', 'pv'])
+PVLine.__doc__ = """One line of a multi-PV search: root move, its score and the expected line starting with it."""
+
+MultiPVResult = namedtuple('MultiPVResult', ['lines', 'depth', 'nodes', 'elapsed'])
+MultiPVResult.__doc__ = """Outcome of a multi-PV search: PVLines best first, completed depth, nodes visited and seconds used."""
+
+def minimax(position, depth, alpha, beta, max_player, context):
     """
     Minimax algorithm with Alpha-Beta pruning.
 
-    Recursively searches the game tree to find the best move.
+    Recursively searches the game tree to find the best move. When the
+    context has a transposition table, stored results cut the search short
+    where their depth and bound allow it, the stored best move is tried
+    first, and every finished node is stored.
+
+    The context settings can make the search selective. Late move reductions
+    search quiet moves (no capture, no promotion) that come late in the move
+    order with less depth, and search them again at full depth if they turn
+    out better than the best move so far. Futility pruning skips quiet moves
+    near the leaves when the static evaluation plus a margin cannot reach the
+    alpha-beta window. The first move is always searched in full.
+
+    When the context has a tracer, every node is reported to it on entry and
+    exit; see tracer.py.
 
     Args:
         position (Board): The current board state.
@@ -71,93 +225,486 @@ def minimax(position, depth, alpha, beta, max_player, start_time, time_limit):
         alpha (float): The best value that the maximizer currently can guarantee.
         beta (float): The best value that the minimizer currently can guarantee.
         max_player (bool): True if maximizing player (BLACK), False if minimizing (RED).
-        start_time (float): The time when the search started.
-        time_limit (float): The maximum allowed time for the search.
+        context (SearchContext): Limits, node counter, RNG, history, cache and
+            transposition table of the search. When a history is present,
+            positions repeated in the game or along the search path score as draws.
 
     Returns:
         tuple: (evaluation score, best move details)
     
     Raises:
-        TimeoutError: If the search exceeds the time limit.
+        TimeoutError: If the search is stopped or exceeds its time limit or node budget.
     """
-    if time.time() - start_time > time_limit:
-        raise TimeoutError
+    context.check_limits()
+    tracer = context.tracer
+    if tracer is not None:
+        tracer.enter(depth, alpha, beta, context.nodes)
 
     if depth == 0 or position.winner() != None:
-        return evaluate_board(position), position
+        score = evaluate_board(position)
+        if tracer is not None:
+            tracer.leave(context.nodes, score, LEAF)
+        return score, position
+
+    tt = context.tt
+    tt_move = None
+    alpha_orig, beta_orig = alpha, beta
+    settings = context.settings
+    if tt is not None:
+        if settings.symmetry:
+            key, mirrored = position.canonical_key(BLACK if max_player else RED)
+        else:
+            key, mirrored = position.position_key(BLACK if max_player else RED), False
+        entry = tt.probe(key)
+        if entry is not None:
+            entry_depth, score, flag, tt_move = entry
+            if mirrored:
+                score, flag, tt_move = -score, NEGATED_FLAGS[flag], mirror_move(tt_move)
+            if entry_depth >= depth and tt_move is not None:
+                if flag == EXACT:
+                    if tracer is not None:
+                        tracer.leave(context.nodes, score, TT_HIT)
+                    return score, tt_move
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    if tracer is not None:
+                        tracer.leave(context.nodes, score, TT_HIT)
+                    return score, tt_move
+
+    moves = get_all_moves(position, BLACK if max_player else RED, context.cache, context)
+    context.rng.shuffle(moves)
+    moves.sort(key=lambda x: len(x[1][2]), reverse=True)
+    if tt_move is not None:
+        moves.sort(key=lambda x: x[1] != tt_move)
+    
+    static_eval = None
+    if settings.futility and depth <= settings.futility_depth:
+        static_eval = evaluate_board(position)
+        margin = settings.futility_margin * depth
+    reduce_late = settings.lmr and depth >= settings.lmr_min_depth
+    reduction = min(settings.lmr_reduction, depth - 1)
     
     if max_player:
         maxEval = float('-inf')
         best_move = None
-        moves = get_all_moves(position, BLACK)
-        random.shuffle(moves)
-        moves.sort(key=lambda x: len(x[1][2]), reverse=True)
+        searched = 0
         
-        for move, move_details in moves:
-            evaluation = minimax(move, depth-1, alpha, beta, False, start_time, time_limit)[0]
+        for index, (move, move_details) in enumerate(moves):
+            if tracer is not None:
+                tracer.child(index, move_details)
+            quiet = index > 0 and is_quiet(position, move_details)
+            if quiet and static_eval is not None and static_eval + margin <= alpha:
+                continue
+            searched += 1
+            if quiet and reduce_late and index >= settings.lmr_min_moves and reduction > 0:
+                evaluation = _search_child(position, move, move_details, depth - reduction, alpha, beta, False, context)
+                if evaluation > alpha:
+                    if tracer is not None:
+                        tracer.child(index, move_details)
+                    evaluation = _search_child(position, move, move_details, depth, alpha, beta, False, context)
+            else:
+                evaluation = _search_child(position, move, move_details, depth, alpha, beta, False, context)
             maxEval = max(maxEval, evaluation)
             if maxEval == evaluation:
                 best_move = move_details
+            if position is context.root:
+                context.root_done(move_details, best_move, maxEval)
             alpha = max(alpha, evaluation)
             if beta <= alpha:
                 break
         
-        return maxEval, best_move
+        value = maxEval
     else:
         minEval = float('inf')
         best_move = None
-        moves = get_all_moves(position, RED)
-        random.shuffle(moves)
-        moves.sort(key=lambda x: len(x[1][2]), reverse=True)
+        searched = 0
         
-        for move, move_details in moves:
-            evaluation = minimax(move, depth-1, alpha, beta, True, start_time, time_limit)[0]
+        for index, (move, move_details) in enumerate(moves):
+            if tracer is not None:
+                tracer.child(index, move_details)
+            quiet = index > 0 and is_quiet(position, move_details)
+            if quiet and static_eval is not None and static_eval - margin >= beta:
+                continue
+            searched += 1
+            if quiet and reduce_late and index >= settings.lmr_min_moves and reduction > 0:
+                evaluation = _search_child(position, move, move_details, depth - reduction, alpha, beta, True, context)
+                if evaluation < beta:
+                    if tracer is not None:
+                        tracer.child(index, move_details)
+                    evaluation = _search_child(position, move, move_details, depth, alpha, beta, True, context)
+            else:
+                evaluation = _search_child(position, move, move_details, depth, alpha, beta, True, context)
             minEval = min(minEval, evaluation)
             if minEval == evaluation:
                 best_move = move_details
+            if position is context.root:
+                context.root_done(move_details, best_move, minEval)
             beta = min(beta, evaluation)
             if beta <= alpha:
                 break
         
-        return minEval, best_move
+        value = minEval
+
+    if tt is not None:
+        if value <= alpha_orig:
+            flag = UPPER_BOUND
+        elif value >= beta_orig:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        if mirrored:
+            tt.store(key, depth, -value, NEGATED_FLAGS[flag], mirror_move(best_move))
+        else:
+            tt.store(key, depth, value, flag, best_move)
+
+    if tracer is not None:
+        if not moves:
+            reason = NO_MOVES
+        elif beta <= alpha:
+            reason = CUTOFF
+        elif value <= alpha_orig:
+            reason = FAIL_LOW
+        else:
+            reason = TRACE_EXACT
+        tracer.leave(context.nodes, value, reason, len(moves), searched - 1 if beta <= alpha else None,
+                     tt_move is not None)
 
-def iterative_deepening(position, max_player, time_limit=1.0):
+    return value, best_move
+
+def is_quiet(position, move_details):
     """
-    Performs Iterative Deepening Search.
+    Tells whether a move is quiet, i.e. neither a capture nor a promotion.
 
-    Repeatedly calls minimax with increasing depth until the time limit is reached.
-    This ensures the AI always has a valid move to return.
+    Args:
+        position (Board): The board before the move.
+        move_details (tuple): (start_coords, end_coords, skipped_coords).
+
+    Returns:
+        bool: True if the move captures nothing and does not crown a man.
+    """
+    (start_row, start_col), (end_row, _), skipped = move_details
+    if skipped:
+        return False
+    piece = position.get_piece(start_row, start_col)
+    if piece == 0 or piece.king:
+        return True
+    return end_row != (0 if piece.color == RED else ROWS - 1)
+
+def _search_child(position, move, move_details, depth, alpha, beta, max_player, context):
+    """
+    Searches the position reached by a move, scoring repetitions as draws.
+
+    Args:
+        position (Board): The board before the move.
+        move (Board): The board after the move.
+        move_details (tuple): (start_coords, end_coords, skipped_coords).
+        max_player (bool): True if BLACK is to move in the child position.
+        context (SearchContext): The search state.
+
+    Returns:
+        float: The evaluation of the child position.
+    """
+    history = context.history
+    if history is None:
+        return minimax(move, depth-1, alpha, beta, max_player, context)[0]
+
+    history.push(move.position_key(BLACK if max_player else RED), is_irreversible(position, move_details))
+    try:
+        if history.is_repetition():
+            return 0
+        return minimax(move, depth-1, alpha, beta, max_player, context)[0]
+    finally:
+        history.pop()
+
+def search(position, max_player, context, max_depth=MAX_SEARCH_DEPTH, callback=None):
+    """
+    Runs iterative deepening under the limits of a search context.
+
+    Depth 1, 2, 3... are searched in turn until the time limit or node budget
+    runs out, max_depth is completed, or a forced win or loss is found.
+
+    When the limits interrupt an iteration and the settings enable anytime
+    search, the iteration's best root move is kept if the previous best move
+    was among the root moves it searched completely. That move then scored at
+    least as well as the previous one at the deeper depth. The transposition
+    table orders the previous best move first, so usually only the first
+    root move has to finish.
 
     Args:
         position (Board): The current board state.
         max_player (bool): True if maximizing player (BLACK), False if minimizing (RED).
-        time_limit (float, optional): Time limit in seconds. Defaults to 1.0.
+        context (SearchContext): Limits and shared state of the search.
+        max_depth (int, optional): Deepest iteration to run. Defaults to MAX_SEARCH_DEPTH.
+        callback (function, optional): Called with a SearchResult after every
+            completed iteration, e.g. to print progress. Defaults to None.
 
     Returns:
-        tuple: The best move found (start_pos, end_pos, skipped_pieces).
+        SearchResult: The best move of the deepest completed iteration, or
+            of the interrupted one (see above).
     """
-    start_time = time.time()
     best_move = None
-    depth = 1
+    best_score = None
+    completed = 0
+    partial = False
     
     try:
-        while True:
-            if time.time() - start_time > time_limit:
-                break
-            
-            val, move = minimax(position, depth, float('-inf'), float('inf'), max_player, start_time, time_limit)
+        for depth in range(1, max_depth + 1):
+            context.root, context.root_best, context.root_searched = position, None, []
+            val, move = minimax(position, depth, float('-inf'), float('inf'), max_player, context)
             if move:
                 best_move = move
+                best_score = val
+            completed = depth
+            if callback is not None:
+                callback(SearchResult(best_move, best_score, completed, context.nodes, time.time() - context.start_time))
             
-            depth += 1
-            
-            if abs(val) == float('inf') or depth > 20:
+            if abs(val) == float('inf'):
                 break
                 
     except TimeoutError:
-        pass
+        if context.tracer is not None:
+            context.tracer.abort()
+        if (context.settings.anytime and context.root_best is not None
+                and (best_move is None or best_move in context.root_searched)):
+            best_move, best_score = context.root_best
+            partial = True
+    context.root = None
         
-    return best_move
+    return SearchResult(best_move, best_score, completed, context.nodes, time.time() - context.start_time, partial)
+
+def search_multi_pv(position, max_player, context, lines=3, max_depth=MAX_SEARCH_DEPTH, callback=None):
+    """
+    Runs iterative deepening that keeps the best few root moves with exact scores.
+
+    All root moves are searched once per iteration. Until ``lines`` moves
+    have a score, each move gets a full window. After that a move is searched
+    with the score of the current last line as its bound, so moves that
+    cannot enter the list fail low quickly. Each iteration tries the previous
+    iteration's lines first, and the transposition table carries results
+    between moves and iterations. The cost is much lower than running one
+    search per line. The result of an interrupted iteration is discarded.
+
+    Args:
+        position (Board): The current board state.
+        max_player (bool): True if maximizing player (BLACK), False if minimizing (RED).
+        context (SearchContext): Limits and shared state of the search.
+        lines (int, optional): Number of root moves to keep. Defaults to 3.
+        max_depth (int, optional): Deepest iteration to run. Defaults to MAX_SEARCH_DEPTH.
+        callback (function, optional): Called with a MultiPVResult after every
+            completed iteration. Defaults to None.
+
+    Returns:
+        MultiPVResult: The lines of the deepest completed iteration, best
+            first. Scores are from BLACK's side, like evaluate_board.
+    """
+    moves = get_all_moves(position, BLACK if max_player else RED, context.cache)
+    context.rng.shuffle(moves)
+    moves.sort(key=lambda x: len(x[1][2]), reverse=True)
+    sign = 1 if max_player else -1
+    best = []
+    completed = 0
+
+    def result():
+        pv_lines = []
+        for value, move, move_details in best:
+            pv = [move_details]
+            if context.tt is not None:
+                pv += principal_variation(move, not max_player, context.tt, completed - 1)
+            pv_lines.append(PVLine(move_details, value * sign, pv))
+        return MultiPVResult(pv_lines, completed, context.nodes, time.time() - context.start_time)
+
+    try:
+        for depth in range(1, max_depth + 1):
+            top = []
+            for move, move_details in moves:
+                bound = top[-1][0] if len(top) >= lines else float('-inf')
+                if max_player:
+                    evaluation = _search_child(position, move, move_details, depth, bound, float('inf'), False, context)
+                else:
+                    evaluation = _search_child(position, move, move_details, depth, float('-inf'), -bound, True, context)
+                value = evaluation * sign
+                if len(top) < lines or value > bound:
+                    top.append((value, move, move_details))
+                    top.sort(key=lambda entry: entry[0], reverse=True)
+                    del top[lines:]
+
+            chosen = {id(move) for _, move, _ in top}
+            moves = [(move, move_details) for _, move, move_details in top] + \
+                    [(move, move_details) for move, move_details in moves if id(move) not in chosen]
+            best = top
+            completed = depth
+            if callback is not None:
+                callback(result())
+
+            if all(abs(value) == float('inf') for value, _, _ in best):
+                break
+
+    except TimeoutError:
+        pass
+
+    return result()
+
+def multi_pv(position, max_player, lines=3, time_limit=1.0, history=None, cache=None,
+             max_depth=MAX_SEARCH_DEPTH, max_nodes=None, seed=None, tt=None, settings=None):
+    """
+    Finds the best few moves of a position, e.g. for hints or analysis.
+
+    Args:
+        position (Board): The current board state.
+        max_player (bool): True if maximizing player (BLACK), False if minimizing (RED).
+        lines (int, optional): Number of moves to return. Defaults to 3.
+        time_limit (float, optional): Time limit in seconds, or None for no clock. Defaults to 1.0.
+        history (GameHistory, optional): Positions played so far. Defaults to None.
+        cache (MoveCache, optional): Move cache. Defaults to the module-wide cache.
+        max_depth (int, optional): Deepest iteration to run. Defaults to MAX_SEARCH_DEPTH.
+        max_nodes (int, optional): Node budget. Defaults to None.
+        seed (int, optional): Seed for move shuffling. Defaults to None.
+        tt (TranspositionTable, optional): Transposition table. Defaults to a fresh table.
+        settings (SearchSettings, optional): Selective search settings. Defaults to SearchSettings().
+
+    Returns:
+        list: PVLine entries, best first (see search_multi_pv).
+    """
+    if cache is None:
+        cache = default_move_cache
+    if tt is None:
+        tt = TranspositionTable()
+
+    context = SearchContext(time_limit, max_nodes, seed, history, cache, tt=tt, settings=settings)
+    return search_multi_pv(position, max_player, context, lines, max_depth).lines
+
+def iterative_deepening(position, max_player, time_limit=1.0, history=None, cache=None,
+                        max_depth=MAX_SEARCH_DEPTH, max_nodes=None, seed=None, tt=None, settings=None, tracer=None):
+    """
+    Performs Iterative Deepening Search.
+
+    Repeatedly calls minimax with increasing depth until the time limit is reached.
+    This ensures the AI always has a valid move to return.
+
+    For reproducible results, pass time_limit=None together with max_depth
+    (fixed-depth mode) or max_nodes (fixed-node mode) and a seed: the same
+    position and settings then give the same move and node count on any machine.
+
+    Args:
+        position (Board): The current board state.
+        max_player (bool): True if maximizing player (BLACK), False if minimizing (RED).
+        time_limit (float, optional): Time limit in seconds, or None for no clock. Defaults to 1.0.
+        history (GameHistory, optional): Positions played so far, used for
+            repetition detection. Defaults to None.
+        cache (MoveCache, optional): Move cache shared by all iterations.
+            Defaults to the module-wide cache, which persists across moves.
+            Pass MoveCache(0) to disable caching.
+        max_depth (int, optional): Deepest iteration to run. Defaults to MAX_SEARCH_DEPTH.
+        max_nodes (int, optional): Node budget for the whole search. Defaults to None.
+        seed (int, optional): Seed for move shuffling. Defaults to None.
+        tt (TranspositionTable, optional): Table shared by all iterations.
+            Defaults to a fresh table for this search; pass a persistent
+            table to reuse results across searches.
+        settings (SearchSettings, optional): Selective search settings.
+            Defaults to SearchSettings().
+        tracer (SearchTracer, optional): Records the searched tree. Defaults to None.
+
+    Returns:
+        tuple: The best move found (start_pos, end_pos, skipped_pieces).
+    """
+    if cache is None:
+        cache = default_move_cache
+    if tt is None:
+        tt = TranspositionTable()
+
+    context = SearchContext(time_limit, max_nodes, seed, history, cache, tt=tt, settings=settings, tracer=tracer)
+    return search(position, max_player, context, max_depth).move
+
+def _parallel_worker(job):
+    """Pool entry point: runs one helper search of parallel_iterative_deepening."""
+    position, max_player, time_limit, history, max_depth, max_nodes, seed, tt, start_time, settings = job
+    context = SearchContext(time_limit, max_nodes, seed, history, MoveCache(), start_time, tt, settings)
+    return search(position, max_player, context, max_depth)
+
+def parallel_iterative_deepening(position, max_player, workers=2, time_limit=1.0, history=None,
+                                 max_depth=MAX_SEARCH_DEPTH, max_nodes=None, seed=None, tt=None, pool=None,
+                                 settings=None):
+    """
+    Runs iterative deepening in several processes sharing one transposition table.
+
+    Every worker searches the same position with a differently seeded move
+    shuffle, so the workers explore the tree in different orders and pick up
+    each other's results from the shared table (the "lazy SMP" scheme). The
+    move of the worker that completed the deepest iteration is returned.
+
+    Args:
+        position (Board): The current board state.
+        max_player (bool): True if maximizing player (BLACK), False if minimizing (RED).
+        workers (int, optional): Number of searching processes. Defaults to 2.
+        time_limit (float, optional): Time limit in seconds, or None for no clock. Defaults to 1.0.
+        history (GameHistory, optional): Positions played so far. Defaults to None.
+        max_depth (int, optional): Deepest iteration to run. Defaults to MAX_SEARCH_DEPTH.
+        max_nodes (int, optional): Node budget of each worker. Defaults to None.
+        seed (int, optional): Seed of the first worker; worker i uses seed + i. Defaults to None.
+        tt (SharedTranspositionTable, optional): Table to share. Defaults to a
+            table created and freed for this search; pass a persistent table
+            to reuse results across searches.
+        pool (multiprocessing.Pool, optional): Pool to run the workers in.
+            Defaults to a pool created for this search.
+        settings (SearchSettings, optional): Selective search settings.
+            Defaults to SearchSettings().
+
+    Returns:
+        tuple: The best move found (start_pos, end_pos, skipped_pieces).
+    """
+    start_time = time.time()
+    own_tt = tt is None
+    if own_tt:
+        tt = SharedTranspositionTable()
+    jobs = [(position, max_player, time_limit, history, max_depth, max_nodes,
+             None if seed is None else seed + i, tt, start_time, settings) for i in range(workers)]
+    try:
+        if pool is None:
+            with multiprocessing.Pool(workers) as own_pool:
+                results = own_pool.map(_parallel_worker, jobs)
+        else:
+            results = pool.map(_parallel_worker, jobs)
+    finally:
+        if own_tt:
+            tt.close()
+    best = max(results, key=lambda result: result.depth)
+    return best.move
+
+def principal_variation(position, max_player, tt, max_length=MAX_SEARCH_DEPTH):
+    """
+    Follows the stored best moves from a position through a transposition table.
+
+    Entries stored by the mirror image of a position (see Board.canonical_key)
+    are found as well.
+
+    Args:
+        position (Board): The root board state.
+        max_player (bool): True if BLACK is to move at the root.
+        tt (TranspositionTable or SharedTranspositionTable): The table filled by a search.
+        max_length (int, optional): Maximum number of moves. Defaults to MAX_SEARCH_DEPTH.
+
+    Returns:
+        list: Move details of the expected line of play.
+    """
+    line = []
+    snapshot = Position.from_board(position, BLACK if max_player else RED)
+    seen = set()
+    while len(line) < max_length and snapshot.hash not in seen:
+        seen.add(snapshot.hash)
+        entry = tt.get(snapshot.hash)
+        if entry is None:
+            key, mirrored = snapshot.canonical_key()
+            entry = tt.get(key) if mirrored else None
+            if entry is not None:
+                entry = entry[:3] + (mirror_move(entry[3]) if isinstance(entry[3], tuple) else None,)
+        if entry is None or not isinstance(entry[3], tuple):
+            break
+        line.append(entry[3])
+        snapshot = snapshot.apply(entry[3])
+    return line
 
 def simulate_move(piece, move, board, skip):
     """
@@ -177,25 +724,43 @@ def simulate_move(piece, move, board, skip):
         board.remove(skip, visual=False)
     return board
 
-def get_all_moves(board, color):
+def get_all_moves(board, color, cache=None, context=None):
     """
     Retrieves all valid moves for a given color.
 
     Args:
         board (Board): The current board state.
         color (int): The color of the player (RED or BLACK).
+        cache (MoveCache, optional): Cache to take the move list from. Defaults to None.
+        context (SearchContext, optional): Search whose clock is checked before
+            each child board is built. Defaults to None.
 
     Returns:
         list: A list of tuples (new_board_state, move_details).
+
+    Raises:
+        TimeoutError: If the context's time runs out.
     """
-    moves = []
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)
-        for move, skip in valid_moves.items():
+    if cache is not None:
+        moves = []
+        for start, end, skipped_coords in cache.get_moves(board, color):
+            if context is not None:
+                context.check_clock()
             temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, skip)
-            skipped_coords = [(p.row, p.col) for p in skip]
-            move_details = ((piece.row, piece.col), move, skipped_coords)
-            moves.append((new_board, move_details))
+            temp_piece = temp_board.get_piece(start[0], start[1])
+            skip = [temp_board.get_piece(r, c) for r, c in skipped_coords]
+            new_board = simulate_move(temp_piece, end, temp_board, skip)
+            moves.append((new_board, (start, end, list(skipped_coords))))
+        return moves
+
+    moves = []
+    for piece, move, skip in board.get_all_valid_moves(color):
+        if context is not None:
+            context.check_clock()
+        temp_board = deepcopy(board)
+        temp_piece = temp_board.get_piece(piece.row, piece.col)
+        new_board = simulate_move(temp_piece, move, temp_board, skip)
+        skipped_coords = [(p.row, p.col) for p in skip]
+        move_details = ((piece.row, piece.col), move, skipped_coords)
+        moves.append((new_board, move_details))
     return moves
@@ -5,10 +5,27 @@ This module handles the game state, including the board representation,
 piece movement, rule validation, and rendering to the console.
 """
 
+import random
+from copy import deepcopy
 import bext
 import colorama
 from constants import *
 
+_zobrist_rng = random.Random(ZOBRIST_SEED)
+ZOBRIST_PIECES = [[[_zobrist_rng.getrandbits(64) for _ in range(4)] for _ in range(COLS)] for _ in range(ROWS)]
+ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+# Key of the mirrored piece: the square rotated by 180 degrees and the color swapped.
+ZOBRIST_MIRROR = [[[ZOBRIST_PIECES[ROWS - 1 - row][COLS - 1 - col][index ^ 1] for index in range(4)]
+                   for col in range(COLS)] for row in range(ROWS)]
+
+def zobrist_key(piece):
+    """Returns the Zobrist key of a piece on its current square."""
+    return ZOBRIST_PIECES[piece.row][piece.col][piece.color + 2 * piece.king - 1]
+
+def mirror_key(piece):
+    """Returns the Zobrist key of a piece's mirror image (see Board.canonical_key)."""
+    return ZOBRIST_MIRROR[piece.row][piece.col][piece.color + 2 * piece.king - 1]
+
 class Piece:
     """
     Represents a single checker piece.
@@ -19,6 +36,8 @@ class Piece:
         color (int): The color of the piece (RED or BLACK).
         king (bool): Whether the piece has been promoted to a king.
     """
+    __slots__ = ('row', 'col', 'color', 'king')
+
     def __init__(self, row, col, color):
         """
         Initializes a new Piece.
@@ -68,15 +87,25 @@ class Board:
         black_left (int): Number of black pieces remaining.
         red_kings (int): Number of red kings.
         black_kings (int): Number of black kings.
+        pieces (dict): Color -> dict whose keys are the pieces of that color on
+            the board (an insertion-ordered set), kept up to date by move and remove.
+            It is built from the grid on first use and left out of deep
+            copies, so the many boards copied during a search that are never
+            expanded do not carry one.
         last_move (tuple): Stores the start and end coordinates of the last move for highlighting.
+        hash (int): Zobrist hash of the piece placement, updated incrementally.
+        mirror_hash (int): Zobrist hash of the mirrored placement, the board
+            rotated by 180 degrees with the colors swapped.
     """
     def __init__(self):
         """Initializes the board and sets up the pieces."""
         self.board = []
         self.red_left = self.black_left = 12
         self.red_kings = self.black_kings = 0
+        self._pieces = None
         self.last_move = None
         self.create_board()
+        self.reindex()
 
     def create_board(self):
         """Populates the board with pieces in their starting positions."""
@@ -93,6 +122,88 @@ class Board:
                 else:
                     self.board[row].append(0)
 
+    def __deepcopy__(self, memo):
+        """Copies the board without its piece index, which the copy rebuilds on first use."""
+        copy = Board.__new__(Board)
+        memo[id(self)] = copy
+        for name, value in self.__dict__.items():
+            setattr(copy, name, None if name == '_pieces' else deepcopy(value, memo))
+        return copy
+
+    @property
+    def pieces(self):
+        """The piece index (see the class attributes), built from the grid on first use."""
+        if self._pieces is None:
+            self._pieces = {RED: {}, BLACK: {}}
+            for row in self.board:
+                for piece in row:
+                    if piece != 0:
+                        self._pieces[piece.color][piece] = None
+        return self._pieces
+
+    def reindex(self):
+        """
+        Rebuilds the piece index, the piece and king counters and the hashes
+        from the grid. Call it after editing ``board`` directly.
+        """
+        self._pieces = None
+        pieces = self.pieces
+        self.red_left = len(pieces[RED])
+        self.black_left = len(pieces[BLACK])
+        self.red_kings = sum(piece.king for piece in pieces[RED])
+        self.black_kings = sum(piece.king for piece in pieces[BLACK])
+        self.hash = self.compute_hash()
+        self.mirror_hash = self.compute_hash(mirror_key)
+
+    def compute_hash(self, key=zobrist_key):
+        """
+        Computes the Zobrist hash of the piece placement from scratch.
+
+        Args:
+            key (function, optional): Key of one piece. Pass mirror_key for
+                the hash of the mirror image. Defaults to zobrist_key.
+        """
+        h = 0
+        for row in self.board:
+            for piece in row:
+                if piece != 0:
+                    h ^= key(piece)
+        return h
+
+    def position_key(self, turn):
+        """
+        Returns a hash identifying the position together with the side to move.
+
+        Args:
+            turn (int): The color to move (RED or BLACK).
+
+        Returns:
+            int: A 64-bit position key.
+        """
+        return self.hash ^ ZOBRIST_BLACK_TO_MOVE if turn == BLACK else self.hash
+
+    def canonical_key(self, turn):
+        """
+        Returns one key for a position and its mirror image.
+
+        Rotating the board by 180 degrees, swapping the colors and passing
+        the move to the other side gives a position of equal value for the
+        other color: scores from BLACK's point of view change sign, and moves
+        map square by square. Both positions get the smaller of their two
+        position keys, so tables keep one entry for the pair.
+
+        Args:
+            turn (int): The color to move (RED or BLACK).
+
+        Returns:
+            tuple: (key, mirrored) where mirrored is True if the key belongs
+            to the mirror image, so that stored scores, bounds and moves are
+            seen from the other side (see position.mirror_move).
+        """
+        key = self.hash ^ ZOBRIST_BLACK_TO_MOVE if turn == BLACK else self.hash
+        mirrored = self.mirror_hash ^ ZOBRIST_BLACK_TO_MOVE if turn == RED else self.mirror_hash
+        return (mirrored, True) if mirrored < key else (key, False)
+
     def draw(self):
         """Renders the entire board to the console."""
         bext.clear()
@@ -192,6 +303,8 @@ class Board:
             # Set new highlight
             self.last_move = ((piece.row, piece.col), (row, col))
 
+        self.hash ^= zobrist_key(piece)
+        self.mirror_hash ^= mirror_key(piece)
         self.board[piece.row][piece.col], self.board[row][col] = self.board[row][col], self.board[piece.row][piece.col]
         
         if visual:
@@ -200,13 +313,38 @@ class Board:
         piece.row = row
         piece.col = col
 
-        if row == ROWS - 1 or row == 0:
-            if (piece.color == RED and row == 0) or (piece.color == BLACK and row == ROWS - 1):
-                piece.make_king()
+        if not piece.king and row == (0 if piece.color == RED else ROWS - 1):
+            piece.make_king()
+            if piece.color == RED:
+                self.red_kings += 1
+            else:
+                self.black_kings += 1
+
+        self.hash ^= zobrist_key(piece)
+        self.mirror_hash ^= mirror_key(piece)
 
         if visual:
             self.update_piece_visual(row, col)
 
+    def apply_move(self, move_details, visual=True):
+        """
+        Plays a move given as coordinates, as returned by the AI.
+
+        Args:
+            move_details (tuple): (start_coords, end_coords, skipped_coords).
+            visual (bool, optional): Whether to update the display. Defaults to True.
+        """
+        start_coords, end_coords, skipped_coords = move_details
+        piece = self.get_piece(start_coords[0], start_coords[1])
+        self.move(piece, end_coords[0], end_coords[1], visual)
+        if skipped_coords:
+            pieces_to_remove = []
+            for r, c in skipped_coords:
+                p = self.get_piece(r, c)
+                if p != 0:
+                    pieces_to_remove.append(p)
+            self.remove(pieces_to_remove, visual)
+
     def get_piece(self, row, col):
         """Returns the piece at the given coordinates."""
         return self.board[row][col]
@@ -215,6 +353,11 @@ class Board:
         """
         Calculates all valid moves for a specific piece.
 
+        Captures are mandatory: if the piece can jump, only its complete
+        jump sequences are returned. Quiet moves are only returned when the
+        piece has no capture available; use :meth:`get_all_valid_moves` to
+        enforce the rule across all pieces of a color.
+
         Args:
             piece (Piece): The piece to check.
 
@@ -222,106 +365,108 @@ class Board:
             dict: A dictionary where keys are target coordinates (row, col)
                   and values are lists of skipped pieces (captures).
         """
+        captures = self._get_captures(piece)
+        if captures:
+            return captures
+        return self._get_steps(piece)
+
+    def has_captures(self, color):
+        """Returns True if any piece of the given color can capture."""
+        for piece in self.get_all_pieces(color):
+            if self._get_captures(piece):
+                return True
+        return False
+
+    def _get_directions(self, piece):
+        """Returns the (row, col) steps a piece may move in."""
+        if piece.king:
+            return KING_DIRECTIONS
+        return RED_DIRECTIONS if piece.color == RED else BLACK_DIRECTIONS
+
+    def _get_steps(self, piece):
+        """Helper function to list the quiet (non-capturing) moves of a piece."""
         moves = {}
-        left = piece.col - 1
-        right = piece.col + 1
-        row = piece.row
-
-        if piece.color == RED or piece.king:
-            moves.update(self._traverse_left(row - 1, max(row - 3, -1), -1, piece.color, left))
-            moves.update(self._traverse_right(row - 1, max(row - 3, -1), -1, piece.color, right))
-        
-        if piece.color == BLACK or piece.king:
-            moves.update(self._traverse_left(row + 1, min(row + 3, ROWS), 1, piece.color, left))
-            moves.update(self._traverse_right(row + 1, min(row + 3, ROWS), 1, piece.color, right))
-    
+        for dr, dc in self._get_directions(piece):
+            r, c = piece.row + dr, piece.col + dc
+            if 0 <= r < ROWS and 0 <= c < COLS and self.board[r][c] == 0:
+                moves[(r, c)] = []
         return moves
 
-    def _traverse_left(self, start, stop, step, color, left, skipped=[]):
-        """Helper function to check diagonal moves to the left."""
+    def _get_captures(self, piece):
+        """
+        Helper function to build every complete jump sequence of a piece.
+
+        The sequences are expanded with an explicit stack instead of
+        recursion. A jump must be continued while another one is available,
+        and a man that reaches the king row ends its move there. When two
+        sequences end on the same square the one capturing more pieces is
+        kept.
+        """
         moves = {}
-        last = []
-        for r in range(start, stop, step):
-            if left < 0:
-                break
-            
-            current = self.board[r][left]
-            if current == 0:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, left)] = last + skipped
+        directions = self._get_directions(piece)
+        crown_row = 0 if piece.color == RED else ROWS - 1
+        stack = [(piece.row, piece.col, ())]
+
+        while stack:
+            row, col, skipped = stack.pop()
+            extended = False
+            for dr, dc in directions:
+                land_r, land_c = row + 2 * dr, col + 2 * dc
+                if not (0 <= land_r < ROWS and 0 <= land_c < COLS):
+                    continue
+
+                target = self.board[land_r][land_c]
+                if target != 0 and target is not piece:
+                    continue
+
+                jumped = self.board[row + dr][col + dc]
+                if jumped == 0 or jumped.color == piece.color or jumped in skipped:
+                    continue
+
+                extended = True
+                path = skipped + (jumped,)
+                if not piece.king and land_r == crown_row:
+                    self._add_capture(moves, (land_r, land_c), path)
                 else:
-                    moves[(r, left)] = last
-                
-                if last:
-                    if step == -1:
-                        row = max(r-3, -1)
-                    else:
-                        row = min(r+3, ROWS)
-                    moves.update(self._traverse_left(r+step, row, step, color, left-1, skipped=last))
-                    moves.update(self._traverse_right(r+step, row, step, color, left+1, skipped=last))
-                break
-            elif current.color == color:
-                break
-            else:
-                last = [current]
+                    stack.append((land_r, land_c, path))
+
+            if skipped and not extended:
+                self._add_capture(moves, (row, col), skipped)
 
-            left -= 1
-        
         return moves
 
-    def _traverse_right(self, start, stop, step, color, right, skipped=[]):
-        """Helper function to check diagonal moves to the right."""
-        moves = {}
-        last = []
-        for r in range(start, stop, step):
-            if right >= COLS:
-                break
-            
-            current = self.board[r][right]
-            if current == 0:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, right)] = last + skipped
-                else:
-                    moves[(r, right)] = last
-                
-                if last:
-                    if step == -1:
-                        row = max(r-3, -1)
-                    else:
-                        row = min(r+3, ROWS)
-                    moves.update(self._traverse_left(r+step, row, step, color, right-1, skipped=last))
-                    moves.update(self._traverse_right(r+step, row, step, color, right+1, skipped=last))
-                break
-            elif current.color == color:
-                break
-            else:
-                last = [current]
+    @staticmethod
+    def _add_capture(moves, target, skipped):
+        """Records a jump sequence, preferring the longest one per target."""
+        if len(skipped) > len(moves.get(target, ())):
+            moves[target] = list(skipped)
 
-            right += 1
-        
-        return moves
-    
     def remove(self, pieces, visual=True):
         """
         Removes pieces from the board (e.g., after capture).
 
+        The pieces are looked up by their squares, so pieces of a copied
+        board may be passed.
+
         Args:
             pieces (list): List of Piece objects to remove.
             visual (bool, optional): Whether to update the display. Defaults to True.
         """
         for piece in pieces:
+            occupant = self.board[piece.row][piece.col]
             self.board[piece.row][piece.col] = 0
+            self.hash ^= zobrist_key(piece)
+            self.mirror_hash ^= mirror_key(piece)
             if visual:
                 self.update_piece_visual(piece.row, piece.col)
-            if piece != 0:
-                if piece.color == RED:
-                    self.red_left -= 1
-                else:
-                    self.black_left -= 1
+            if self._pieces is not None:
+                self._pieces[piece.color].pop(occupant, None)
+            if piece.color == RED:
+                self.red_left -= 1
+                self.red_kings -= piece.king
+            else:
+                self.black_left -= 1
+                self.black_kings -= piece.king
     
     def winner(self):
         """
@@ -350,26 +495,28 @@ class Board:
         """
         Gets all valid moves for a player.
 
+        Captures are mandatory, so quiet moves are dropped whenever any
+        piece of the given color can jump.
+
         Args:
             color (int): The player's color.
 
         Returns:
             list: List of tuples (piece, move, skipped).
         """
+        pieces = self.get_all_pieces(color)
         moves = []
-        for row in self.board:
-            for piece in row:
-                if piece != 0 and piece.color == color:
-                    valid_moves = self.get_valid_moves(piece)
-                    for move, skipped in valid_moves.items():
-                        moves.append( (piece, move, skipped) )
+        for piece in pieces:
+            for move, skipped in self._get_captures(piece).items():
+                moves.append( (piece, move, skipped) )
+        if moves:
+            return moves
+
+        for piece in pieces:
+            for move, skipped in self._get_steps(piece).items():
+                moves.append( (piece, move, skipped) )
         return moves
 
     def get_all_pieces(self, color):
         """Returns a list of all pieces belonging to a specific color."""
-        pieces = []
-        for row in self.board:
-            for piece in row:
-                if piece != 0 and piece.color == color:
-                    pieces.append(piece)
-        return pieces
+        return list(self.pieces[color])
@@ -19,6 +19,50 @@ RED = 1
 BLACK = 2
 EMPTY = 0
 
+# Movement Directions (row step, column step)
+RED_DIRECTIONS = ((-1, -1), (-1, 1))
+BLACK_DIRECTIONS = ((1, -1), (1, 1))
+KING_DIRECTIONS = RED_DIRECTIONS + BLACK_DIRECTIONS
+
+# Draw Rules
+DRAW_REPETITIONS = 3
+NO_PROGRESS_PLIES = 80
+
+# Search Limits
+MAX_SEARCH_DEPTH = 20
+ANYTIME_ENABLED = True  # Play the best root move of an interrupted iteration
+
+# Selective Search
+LMR_ENABLED = False
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+LMR_REDUCTION = 1
+FUTILITY_ENABLED = False
+FUTILITY_DEPTH = 2
+FUTILITY_MARGIN = 12
+
+# Monte Carlo Tree Search
+MCTS_EXPLORATION = 1.4
+MCTS_PLAYOUT_PLIES = 20
+MCTS_EVAL_SCALE = 20
+
+# Hints
+HINT_LINES = 3  # Best moves shown by the 'hint' command
+HINT_TIME = 1.0  # Seconds spent searching for a hint
+
+# Spectator Mode
+SPECTATOR_FPS = 10  # Frames per second drawn while watching AI vs AI
+
+# Game Engines (registry spec strings)
+AI_ENGINE = "ai:time=1.0"  # Opponent in Player vs AI, RED when watching
+MCTS_ENGINE = "mcts:time=1.0"  # Opponent in Player vs MCTS AI, BLACK when watching
+
+# Hashing and Caches
+ZOBRIST_SEED = 20241026
+MOVE_CACHE_SIZE = 50000
+TT_SIZE = 200000
+SYMMETRY_ENABLED = True  # Key a position and its color-swapped 180 degree rotation alike
+
 # Color Definitions
 COLOR_RED = colorama.Fore.RED
 COLOR_BLACK = colorama.Fore.BLUE
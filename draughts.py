@@ -0,0 +1,504 @@
+"""
+Draughts Module for Console Checkers.
+
+This module plays draughts on boards of any even size using the lookup
+tables of geometry.py. Two rule sets are provided:
+
+- ``english``: the 8x8 game of the console version. Men move and capture
+  forward only, kings move one square, captures are mandatory and a man
+  that reaches the king row ends its move there.
+- ``international``: 10x10 international draughts. Men capture backwards
+  as well, kings fly along whole diagonals, the capture that takes the most
+  pieces is mandatory, jumped pieces stay on the board until the capture is
+  complete, and a man is only crowned if its move ends on the king row.
+
+The board is a flat list of square codes (the codes of position.py), with
+a set of occupied squares per color, so move generation only visits the
+pieces of the side to move and reads neighbours, jumps and rays from the
+tables. Moves are made and unmade in place. An alpha-beta search with a
+transposition table runs under the same SearchContext limits as ai.py.
+Repetition and no-progress draws are not tracked here.
+"""
+
+import random
+import time
+from collections import namedtuple
+from functools import lru_cache
+from constants import RED, BLACK, ZOBRIST_SEED, MAX_SEARCH_DEPTH
+from geometry import geometry, UP_DIRECTIONS, DOWN_DIRECTIONS
+from position import EMPTY_SQUARE, RED_MAN, BLACK_MAN, RED_KING, BLACK_KING, SQUARE_CHARS, CHAR_SQUARES
+from tt import EXACT, LOWER_BOUND, UPPER_BOUND
+from ai import SearchResult
+
+Variant = namedtuple('Variant', ['name', 'size', 'piece_rows', 'flying_kings', 'men_capture_backward',
+                                 'majority_capture'])
+Variant.__doc__ = """Rules of a draughts variant: board size, rows of men per side and capture and king rules."""
+
+VARIANTS = {
+    'english': Variant('english', 8, 3, False, False, False),
+    'international': Variant('international', 10, 4, True, True, True),
+}
+
+# Evaluation Weights (centipieces, from the side to move's point of view)
+MAN_VALUE = 100
+KING_VALUE = 300
+ADVANCE_VALUE = 3
+WIN_SCORE = 1000000
+
+@lru_cache(maxsize=None)
+def zobrist_tables(squares):
+    """
+    Returns the Zobrist keys of a board with the given number of squares.
+
+    Returns:
+        tuple: (keys, black_to_move) where keys[square][code] is the key of
+        a square code on a square.
+    """
+    rng = random.Random(ZOBRIST_SEED + squares)
+    keys = tuple(tuple(rng.getrandbits(64) if code else 0 for code in range(5)) for _ in range(squares))
+    return keys, rng.getrandbits(64)
+
+@lru_cache(maxsize=None)
+def mirror_tables(squares):
+    """
+    Returns the Zobrist keys of the mirror image of each square code.
+
+    The mirror image rotates the board by 180 degrees, which reverses the
+    square numbering, and swaps the colors.
+
+    Returns:
+        tuple: keys where keys[square][code] is the key of the mirrored code
+        on the mirrored square.
+    """
+    keys = zobrist_tables(squares)[0]
+    swapped = (EMPTY_SQUARE, BLACK_MAN, RED_MAN, BLACK_KING, RED_KING)
+    return tuple(tuple(keys[squares - 1 - square][swapped[code]] for code in range(5)) for square in range(squares))
+
+class DraughtsBoard:
+    """
+    A draughts position with in-place move making.
+
+    Attributes:
+        variant (Variant): The rules in play.
+        geometry (Geometry): Lookup tables of the board size.
+        squares (list): Square code of every playable square.
+        pieces (dict): Color -> set of the squares it occupies.
+        turn (int): The color to move. RED starts at the bottom and moves up.
+        hash (int): Zobrist hash of the piece placement.
+        mirror_hash (int): Zobrist hash of the mirrored placement (see canonical_key).
+    """
+    def __init__(self, variant='english'):
+        """
+        Sets up the starting position of a variant.
+
+        Args:
+            variant (str or Variant, optional): The rules. Defaults to 'english'.
+        """
+        self.variant = VARIANTS[variant] if isinstance(variant, str) else variant
+        size = self.variant.size
+        self.geometry = geometry(size)
+        self._zobrist, self._black_to_move = zobrist_tables(self.geometry.squares)
+        self._mirror_zobrist = mirror_tables(self.geometry.squares)
+        self._crown_row = {RED: 0, BLACK: size - 1}
+        self._forward = {RED: UP_DIRECTIONS, BLACK: DOWN_DIRECTIONS}
+        self._advance = {RED: tuple(size - 1 - row for row in self.geometry.rows), BLACK: self.geometry.rows}
+        squares = []
+        for row in self.geometry.rows:
+            if row < self.variant.piece_rows:
+                squares.append(BLACK_MAN)
+            elif row >= size - self.variant.piece_rows:
+                squares.append(RED_MAN)
+            else:
+                squares.append(EMPTY_SQUARE)
+        self._set_squares(squares, RED)
+
+    def _set_squares(self, squares, turn):
+        """Replaces the position and rebuilds the piece sets and hashes."""
+        self.squares = list(squares)
+        self.turn = turn
+        self.pieces = {RED: set(), BLACK: set()}
+        self.hash = self.mirror_hash = 0
+        for square, code in enumerate(self.squares):
+            if code:
+                self.pieces[RED if code & 1 else BLACK].add(square)
+                self.hash ^= self._zobrist[square][code]
+                self.mirror_hash ^= self._mirror_zobrist[square][code]
+
+    @classmethod
+    def from_rows(cls, rows, turn=RED, variant='english'):
+        """
+        Creates a position from a text diagram.
+
+        Uses the characters of Position.from_rows: '.' for an empty square,
+        'r'/'b' for men and 'R'/'B' for kings. Light squares must be '.'.
+
+        Args:
+            rows (list): One string per row, row 0 first.
+            turn (int, optional): The color to move. Defaults to RED.
+            variant (str or Variant, optional): The rules. Defaults to 'english'.
+
+        Returns:
+            DraughtsBoard: The position.
+        """
+        board = cls(variant)
+        size = board.variant.size
+        if len(rows) != size or any(len(row) != size for row in rows):
+            raise ValueError(f"expected {size} rows of {size} characters")
+        squares = []
+        for row, col in board.geometry.coords:
+            squares.append(CHAR_SQUARES[rows[row][col]])
+        board._set_squares(squares, turn)
+        return board
+
+    def rows(self):
+        """Returns the position as text rows (see from_rows)."""
+        size = self.variant.size
+        grid = [['.'] * size for _ in range(size)]
+        for square, (row, col) in enumerate(self.geometry.coords):
+            grid[row][col] = SQUARE_CHARS[self.squares[square]]
+        return ["".join(row) for row in grid]
+
+    def key(self):
+        """Returns the Zobrist key of the position including the side to move."""
+        return self.hash ^ self._black_to_move if self.turn == BLACK else self.hash
+
+    def canonical_key(self):
+        """
+        Returns one key for the position and its mirror image.
+
+        The mirror image rotates the board by 180 degrees, swaps the colors
+        and passes the move to the other side. Its score for the side to move
+        is the same, and its moves are the moves mapped by mirror_move.
+
+        Returns:
+            tuple: (key, mirrored), the smaller of the two position keys and
+            whether it belongs to the mirror image.
+        """
+        key = self.key()
+        mirrored = self.mirror_hash ^ self._black_to_move if self.turn == RED else self.mirror_hash
+        return (mirrored, True) if mirrored < key else (key, False)
+
+    def mirror_move(self, move):
+        """Maps a move onto the mirror image of the board, or returns None."""
+        if move is None:
+            return None
+        last = self.geometry.squares - 1
+        start, end, captured = move
+        return last - start, last - end, tuple(last - square for square in captured)
+
+    def move_text(self, move):
+        """Formats a move with PDN square numbers, e.g. ``32-28`` or ``28x19``."""
+        start, end, captured = move
+        return f"{start + 1}{'x' if captured else '-'}{end + 1}"
+
+    def generate_moves(self):
+        """
+        Lists the legal moves of the side to move.
+
+        Returns:
+            list: Moves as (start square, end square, captured squares in jump order).
+        """
+        color = self.turn
+        moves = []
+        for square in self.pieces[color]:
+            self._add_captures(square, moves)
+        if moves:
+            if self.variant.majority_capture:
+                longest = max(len(move[2]) for move in moves)
+                unique = {}
+                for move in moves:
+                    if len(move[2]) == longest:
+                        unique.setdefault((move[0], move[1], frozenset(move[2])), move)
+                return list(unique.values())
+            longest = {}
+            for move in moves:
+                target = (move[0], move[1])
+                if len(move[2]) > len(longest.get(target, (None, None, ()))[2]):
+                    longest[target] = move
+            return list(longest.values())
+
+        squares = self.squares
+        neighbors = self.geometry.neighbors
+        rays = self.geometry.rays
+        flying = self.variant.flying_kings
+        forward = self._forward[color]
+        for square in self.pieces[color]:
+            if squares[square] >= RED_KING:
+                if flying:
+                    for ray in rays[square]:
+                        for target in ray:
+                            if squares[target]:
+                                break
+                            moves.append((square, target, ()))
+                    continue
+                directions = range(4)
+            else:
+                directions = forward
+            for direction in directions:
+                target = neighbors[square][direction]
+                if target >= 0 and not squares[target]:
+                    moves.append((square, target, ()))
+        return moves
+
+    def _add_captures(self, origin, moves):
+        """
+        Appends every complete capture sequence of the piece on origin.
+
+        Sequences are expanded with an explicit stack. Jumped pieces stay on
+        the board until the move ends, so they can be neither jumped again
+        nor passed over; the moving piece's own square counts as empty.
+        """
+        squares = self.squares
+        code = squares[origin]
+        own = code & 1
+        king = code >= RED_KING
+        variant = self.variant
+        stack = [(origin, ())]
+
+        if king and variant.flying_kings:
+            rays = self.geometry.rays
+            while stack:
+                at, captured = stack.pop()
+                extended = False
+                for ray in rays[at]:
+                    length = len(ray)
+                    i = 0
+                    while i < length and (not squares[ray[i]] or ray[i] == origin):
+                        i += 1
+                    if i >= length:
+                        continue
+                    over = ray[i]
+                    if squares[over] & 1 == own or over in captured:
+                        continue
+                    i += 1
+                    path = captured + (over,)
+                    while i < length and (not squares[ray[i]] or ray[i] == origin):
+                        stack.append((ray[i], path))
+                        extended = True
+                        i += 1
+                if captured and not extended:
+                    moves.append((origin, at, captured))
+            return
+
+        jumps = self.geometry.jumps
+        rows = self.geometry.rows
+        directions = range(4) if king or variant.men_capture_backward else self._forward[RED if own else BLACK]
+        crown_row = self._crown_row[RED if own else BLACK]
+        ends_on_crowning = not king and not variant.majority_capture
+        while stack:
+            at, captured = stack.pop()
+            extended = False
+            for direction in directions:
+                jump = jumps[at][direction]
+                if jump is None:
+                    continue
+                over, land = jump
+                jumped = squares[over]
+                if not jumped or jumped & 1 == own or over in captured:
+                    continue
+                if squares[land] and land != origin:
+                    continue
+                extended = True
+                path = captured + (over,)
+                if ends_on_crowning and rows[land] == crown_row:
+                    moves.append((origin, land, path))
+                else:
+                    stack.append((land, path))
+            if captured and not extended:
+                moves.append((origin, at, captured))
+
+    def make(self, move):
+        """
+        Plays a move in place.
+
+        Args:
+            move (tuple): A move from generate_moves.
+
+        Returns:
+            tuple: Undo information for undo().
+        """
+        start, end, captured = move
+        squares, zobrist = self.squares, self._zobrist
+        color = self.turn
+        opponent = BLACK if color == RED else RED
+        code = squares[start]
+        removed = tuple(squares[square] for square in captured)
+        mirror = self._mirror_zobrist
+        for square, removed_code in zip(captured, removed):
+            squares[square] = EMPTY_SQUARE
+            self.pieces[opponent].discard(square)
+            self.hash ^= zobrist[square][removed_code]
+            self.mirror_hash ^= mirror[square][removed_code]
+
+        new_code = code
+        if code < RED_KING and self.geometry.rows[end] == self._crown_row[color]:
+            new_code = code + 2
+        squares[start] = EMPTY_SQUARE
+        squares[end] = new_code
+        own = self.pieces[color]
+        own.discard(start)
+        own.add(end)
+        self.hash ^= zobrist[start][code] ^ zobrist[end][new_code]
+        self.mirror_hash ^= mirror[start][code] ^ mirror[end][new_code]
+        self.turn = opponent
+        return move, code, removed
+
+    def undo(self, token):
+        """Takes back a move played with make()."""
+        (start, end, captured), code, removed = token
+        squares, zobrist, mirror = self.squares, self._zobrist, self._mirror_zobrist
+        opponent = self.turn
+        color = BLACK if opponent == RED else RED
+        new_code = squares[end]
+        squares[end] = EMPTY_SQUARE
+        squares[start] = code
+        own = self.pieces[color]
+        own.discard(end)
+        own.add(start)
+        self.hash ^= zobrist[start][code] ^ zobrist[end][new_code]
+        self.mirror_hash ^= mirror[start][code] ^ mirror[end][new_code]
+        for square, removed_code in zip(captured, removed):
+            squares[square] = removed_code
+            self.pieces[opponent].add(square)
+            self.hash ^= zobrist[square][removed_code]
+            self.mirror_hash ^= mirror[square][removed_code]
+        self.turn = color
+
+    def evaluate(self):
+        """
+        Scores the position for the side to move.
+
+        Men are worth MAN_VALUE plus ADVANCE_VALUE per row advanced, kings
+        KING_VALUE.
+
+        Returns:
+            int: Positive if the side to move is better.
+        """
+        squares = self.squares
+        score = 0
+        for color, sign in ((RED, 1), (BLACK, -1)):
+            advance = self._advance[color]
+            for square in self.pieces[color]:
+                if squares[square] >= RED_KING:
+                    score += sign * KING_VALUE
+                else:
+                    score += sign * (MAN_VALUE + ADVANCE_VALUE * advance[square])
+        return score if self.turn == RED else -score
+
+def perft(board, depth):
+    """
+    Counts the leaf nodes of the move tree to a fixed depth.
+
+    Args:
+        board (DraughtsBoard): The position; it is restored afterwards.
+        depth (int): Plies to expand.
+
+    Returns:
+        int: Number of move sequences of that length.
+    """
+    moves = board.generate_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    total = 0
+    for move in moves:
+        token = board.make(move)
+        total += perft(board, depth - 1)
+        board.undo(token)
+    return total
+
+def negamax(board, depth, alpha, beta, context, ply=0):
+    """
+    Alpha-beta search in negamax form.
+
+    Args:
+        board (DraughtsBoard): The position; it is restored afterwards.
+        depth (int): Remaining depth.
+        alpha (float): Lower bound of the window, from the side to move's view.
+        beta (float): Upper bound of the window.
+        context (SearchContext): Limits, node counter and optional transposition table.
+        ply (int, optional): Distance from the root, to prefer faster wins. Defaults to 0.
+
+    Returns:
+        tuple: (score for the side to move, best move or None)
+
+    Raises:
+        TimeoutError: If the search exceeds its limits.
+    """
+    context.check_limits()
+    if depth == 0:
+        return board.evaluate(), None
+
+    tt = context.tt
+    tt_move = None
+    alpha_orig = alpha
+    if tt is not None:
+        key, mirrored = board.canonical_key() if context.settings.symmetry else (board.key(), False)
+        entry = tt.probe(key)
+        if entry is not None:
+            entry_depth, score, flag, tt_move = entry
+            if mirrored:
+                tt_move = board.mirror_move(tt_move)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return score, tt_move
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score, tt_move
+
+    moves = board.generate_moves()
+    if not moves:
+        return -WIN_SCORE + ply, None
+    if tt_move in moves:
+        moves.remove(tt_move)
+        moves.insert(0, tt_move)
+
+    best_score, best_move = float('-inf'), None
+    for move in moves:
+        token = board.make(move)
+        try:
+            score = -negamax(board, depth - 1, -beta, -alpha, context, ply + 1)[0]
+        finally:
+            board.undo(token)
+        if score > best_score:
+            best_score, best_move = score, move
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+
+    if tt is not None:
+        if best_score <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        tt.store(key, depth, best_score, flag, board.mirror_move(best_move) if mirrored else best_move)
+    return best_score, best_move
+
+def search(board, context, max_depth=MAX_SEARCH_DEPTH):
+    """
+    Runs iterative deepening under the limits of a search context.
+
+    Args:
+        board (DraughtsBoard): The position to search.
+        context (SearchContext): Limits and shared state. Its tt, if set,
+            must be a TranspositionTable (moves are stored as square tuples).
+        max_depth (int, optional): Deepest iteration. Defaults to MAX_SEARCH_DEPTH.
+
+    Returns:
+        SearchResult: Best move of the deepest completed iteration and its
+        score for the side to move.
+    """
+    best_move, best_score, completed = None, None, 0
+    try:
+        for depth in range(1, max_depth + 1):
+            score, move = negamax(board, depth, float('-inf'), float('inf'), context)
+            best_move, best_score, completed = move, score, depth
+            if move is None or abs(score) >= WIN_SCORE - 1000:
+                break
+    except TimeoutError:
+        pass
+    return SearchResult(best_move, best_score, completed, context.nodes, time.time() - context.start_time)
@@ -0,0 +1,250 @@
+"""
+Engine Module for Console Checkers.
+
+This module runs the AI as a long-lived headless engine that talks a simple
+line protocol over stdin/stdout, in the spirit of UCI and CheckerBoard
+engines. Because the process stays alive, the transposition table and the
+move cache persist between commands, so a single engine can answer many
+queries without paying the import and warm-up cost each time.
+
+Commands (one per line):
+
+- ``isready``: answers ``readyok`` once the previous command is processed.
+- ``newgame``: resets the position to the start and clears the game history.
+- ``position startpos [moves M1 M2 ...]``: sets the start position, then plays moves.
+- ``position fen <FEN> [moves M1 M2 ...]``: sets a PDN FEN position, then plays moves.
+- ``go [depth N] [movetime MS] [nodes N] [seed N] [multipv N]``: starts a
+  search in the background. ``info`` lines are printed after every completed
+  iteration and ``bestmove <move>`` (or ``bestmove none``) when it ends.
+  Without limits the search uses DEFAULT_MOVETIME milliseconds. With
+  ``multipv N`` the N best moves are searched and each iteration prints one
+  ``info ... multipv K ...`` line per move, best first.
+- ``stop``: stops the running search, which then prints its bestmove.
+- ``clear``: empties the transposition table and move cache.
+- ``print``: prints the board diagram and FEN.
+- ``quit``: stops any search and exits.
+
+Moves use PDN square numbers (1-32), e.g. ``22-18`` or ``15x24``.
+"""
+
+import sys
+import threading
+from constants import RED, BLACK, MAX_SEARCH_DEPTH
+from history import GameHistory, is_irreversible
+from move_cache import MoveCache
+from position import Position, move_to_text, parse_move_text
+from tt import TranspositionTable
+import ai
+
+DEFAULT_MOVETIME = 1000
+
+class Engine:
+    """
+    Holds the engine state between protocol commands.
+
+    Attributes:
+        out (file): Stream the responses are written to.
+        tt (TranspositionTable): Table kept across searches.
+        cache (MoveCache): Move cache kept across searches.
+        board (Board): The current position.
+        turn (int): The color to move.
+        history (GameHistory): Positions of the current game.
+    """
+    def __init__(self, out=sys.stdout):
+        """
+        Initializes the engine at the starting position.
+
+        Args:
+            out (file, optional): Output stream. Defaults to sys.stdout.
+        """
+        self.out = out
+        self.tt = TranspositionTable()
+        self.cache = MoveCache()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._context = None
+        self.set_position(Position.initial(), [])
+
+    def send(self, line):
+        """Writes one response line and flushes it."""
+        with self._lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def set_position(self, position, moves):
+        """
+        Sets the current position and plays a list of moves from it.
+
+        Args:
+            position (Position): The starting position.
+            moves (list): Move texts to play.
+
+        Raises:
+            ValueError: If a move is illegal.
+        """
+        board = position.to_board()
+        turn = position.turn
+        history = GameHistory()
+        history.push(board.position_key(turn), True)
+        for text in moves:
+            legal = [((p.row, p.col), move, [(s.row, s.col) for s in skipped])
+                     for p, move, skipped in board.get_all_valid_moves(turn)]
+            move_details = parse_move_text(text, legal)
+            if move_details is None:
+                raise ValueError(f"illegal move {text!r}")
+            irreversible = is_irreversible(board, move_details)
+            board.apply_move(move_details, visual=False)
+            turn = BLACK if turn == RED else RED
+            history.push(board.position_key(turn), irreversible)
+        self.board, self.turn, self.history = board, turn, history
+
+    def go(self, depth=None, movetime=None, nodes=None, seed=None, multipv=1):
+        """
+        Starts a search of the current position in a background thread.
+
+        Args:
+            depth (int, optional): Deepest iteration. Defaults to MAX_SEARCH_DEPTH.
+            movetime (int, optional): Time limit in milliseconds.
+            nodes (int, optional): Node budget.
+            seed (int, optional): Seed for move shuffling.
+            multipv (int, optional): Number of best moves to report. Defaults to 1.
+        """
+        if movetime is None and depth is None and nodes is None:
+            movetime = DEFAULT_MOVETIME
+        time_limit = movetime / 1000 if movetime is not None else None
+        context = ai.SearchContext(time_limit, nodes, seed, self.history, self.cache, tt=self.tt)
+        max_player = self.turn == BLACK
+        board = self.board
+
+        def score_text(score):
+            score = score if max_player else -score
+            if abs(score) == float('inf'):
+                return "win" if score > 0 else "loss"
+            return f"{score:g}"
+
+        def stats(result):
+            elapsed_ms = int(result.elapsed * 1000)
+            nps = int(result.nodes / result.elapsed) if result.elapsed > 0 else 0
+            return f"nodes {result.nodes} time {elapsed_ms} nps {nps}"
+
+        def report(result):
+            pv = " ".join(move_to_text(m) for m in ai.principal_variation(board, max_player, self.tt, result.depth))
+            self.send(f"info depth {result.depth} score {score_text(result.score)} {stats(result)} pv {pv}")
+
+        def report_lines(result):
+            for number, line in enumerate(result.lines, 1):
+                pv = " ".join(move_to_text(m) for m in line.pv)
+                self.send(f"info depth {result.depth} multipv {number} score {score_text(line.score)} "
+                          f"{stats(result)} pv {pv}")
+
+        def run():
+            if multipv > 1:
+                result = ai.search_multi_pv(board, max_player, context, multipv, depth or MAX_SEARCH_DEPTH,
+                                            callback=report_lines)
+                move = result.lines[0].move if result.lines else None
+            else:
+                move = ai.search(board, max_player, context, depth or MAX_SEARCH_DEPTH, callback=report).move
+            self.send(f"bestmove {move_to_text(move) if move else 'none'}")
+
+        self._context = context
+        self._thread = threading.Thread(target=run, name='engine-search', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the running search, if any, and waits for its bestmove."""
+        if self._thread is not None:
+            self._context.stop()
+            self._thread.join()
+            self._thread = None
+            self._context = None
+
+    def handle(self, line):
+        """
+        Processes one protocol command.
+
+        Args:
+            line (str): The command line.
+
+        Returns:
+            bool: False when the engine should exit, True otherwise.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0].lower(), tokens[1:]
+
+        if command == 'quit':
+            self.stop()
+            return False
+        if command == 'stop':
+            self.stop()
+            return True
+        if self._thread is not None and not self._thread.is_alive():
+            self.stop()
+
+        if command == 'isready':
+            self.send("readyok")
+        elif command == 'newgame':
+            self.stop()
+            self.set_position(Position.initial(), [])
+        elif command == 'clear':
+            self.stop()
+            self.tt.clear()
+            self.cache.clear()
+        elif command == 'position':
+            self.stop()
+            self._handle_position(args)
+        elif command == 'go':
+            if self._thread is not None:
+                self.send("error search already running")
+            else:
+                self._handle_go(args)
+        elif command in ('print', 'd'):
+            position = Position.from_board(self.board, self.turn)
+            for row in position.rows():
+                self.send(row)
+            self.send(f"fen {position.to_fen()}")
+        else:
+            self.send(f"error unknown command {command!r}")
+        return True
+
+    def _handle_position(self, args):
+        """Parses the arguments of a position command."""
+        moves = []
+        if 'moves' in args:
+            index = args.index('moves')
+            args, moves = args[:index], args[index + 1:]
+        try:
+            if args[:1] == ['startpos']:
+                position = Position.initial()
+            elif args[:1] == ['fen'] and len(args) >= 2:
+                position = Position.from_fen("".join(args[1:]))
+            else:
+                raise ValueError("expected 'startpos' or 'fen <FEN>'")
+            self.set_position(position, moves)
+        except ValueError as e:
+            self.send(f"error {e}")
+
+    def _handle_go(self, args):
+        """Parses the arguments of a go command."""
+        limits = {}
+        if len(args) % 2:
+            self.send(f"error invalid go argument {args[-1]!r}")
+            return
+        for name, value in zip(args[::2], args[1::2]):
+            if name in ('depth', 'movetime', 'nodes', 'seed', 'multipv') and value.isdigit():
+                limits[name] = int(value)
+            else:
+                self.send(f"error invalid go argument {name!r}")
+                return
+        self.go(**limits)
+
+def main():
+    engine = Engine()
+    for line in sys.stdin:
+        if not engine.handle(line):
+            break
+    engine.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Geometry Module for Console Checkers.
+
+This module generates the lookup tables that describe a draughts board of
+any even size: the playable (dark) squares, their numbering, the neighbour
+of every square in each diagonal direction, the jump (square jumped over and
+landing square) in each direction, and the full diagonal ray used by flying
+kings. Move generators index these tables instead of computing coordinates
+and checking board edges square by square.
+
+Squares are numbered 0 to size * size / 2 - 1, row by row from row 0 (the
+top, BLACK's side), left to right. PDN square numbers are these plus one.
+"""
+
+from functools import lru_cache
+
+# Diagonal directions as (row step, col step). The first two point up the
+# board (towards row 0, RED's forward moves), the last two point down.
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+UP_DIRECTIONS = (0, 1)
+DOWN_DIRECTIONS = (2, 3)
+
+class Geometry:
+    """
+    Lookup tables of a square draughts board.
+
+    Attributes:
+        size (int): Number of rows and columns.
+        squares (int): Number of playable squares.
+        coords (tuple): Square -> (row, col).
+        index (dict): (row, col) -> square.
+        rows (tuple): Square -> row.
+        neighbors (tuple): Square -> tuple of the neighbouring square in each
+            of the four DIRECTIONS, or -1 at the edge.
+        jumps (tuple): Square -> tuple per direction of (jumped square,
+            landing square), or None when the jump would leave the board.
+        rays (tuple): Square -> tuple per direction of the squares along the
+            diagonal, nearest first.
+    """
+    def __init__(self, size):
+        """
+        Generates the tables for a board.
+
+        Args:
+            size (int): Number of rows and columns; must be even.
+        """
+        if size < 4 or size % 2:
+            raise ValueError(f"board size must be an even number of at least 4, got {size}")
+        self.size = size
+        coords = [(row, col) for row in range(size) for col in range(size) if (row + col) % 2 == 1]
+        self.squares = len(coords)
+        self.coords = tuple(coords)
+        self.index = {rc: square for square, rc in enumerate(coords)}
+        self.rows = tuple(row for row, _ in coords)
+
+        rays = []
+        for row, col in coords:
+            square_rays = []
+            for dr, dc in DIRECTIONS:
+                ray = []
+                r, c = row + dr, col + dc
+                while 0 <= r < size and 0 <= c < size:
+                    ray.append(self.index[(r, c)])
+                    r, c = r + dr, c + dc
+                square_rays.append(tuple(ray))
+            rays.append(tuple(square_rays))
+        self.rays = tuple(rays)
+        self.neighbors = tuple(tuple(ray[0] if ray else -1 for ray in square_rays) for square_rays in rays)
+        self.jumps = tuple(tuple((ray[0], ray[1]) if len(ray) >= 2 else None for ray in square_rays)
+                           for square_rays in rays)
+
+    def square_of(self, row, col):
+        """Returns the square at (row, col), or None for a light square."""
+        return self.index.get((row, col))
+
+    def number(self, square):
+        """Returns the PDN number (1-based) of a square."""
+        return square + 1
+
+@lru_cache(maxsize=None)
+def geometry(size):
+    """
+    Returns the shared Geometry of a board size, generating it on first use.
+
+    Args:
+        size (int): Number of rows and columns.
+
+    Returns:
+        Geometry: The tables for that size.
+    """
+    return Geometry(size)
@@ -0,0 +1,109 @@
+"""
+History Module for Console Checkers.
+
+This module keeps the sequence of position keys seen during a game (and
+during a search below it) and uses it to detect draws by threefold
+repetition or by the no-progress rule.
+"""
+
+from constants import DRAW_REPETITIONS, NO_PROGRESS_PLIES
+
+class GameHistory:
+    """
+    Records position keys and detects repetition and no-progress draws.
+
+    A move is irreversible when it captures or moves a man, since neither
+    can be undone. Positions from before the last irreversible move can
+    never repeat, and the no-progress counter restarts there.
+
+    Attributes:
+        repetition_limit (int): Occurrences of a position that make a draw.
+        no_progress_limit (int): Plies without an irreversible move that make a draw.
+        keys (list): Position keys in the order they occurred.
+        counts (dict): Number of occurrences of each key.
+        quiet_plies (list): Plies since the last irreversible move, per entry.
+    """
+    def __init__(self, repetition_limit=DRAW_REPETITIONS, no_progress_limit=NO_PROGRESS_PLIES):
+        """
+        Initializes an empty history.
+
+        Args:
+            repetition_limit (int, optional): Defaults to DRAW_REPETITIONS.
+            no_progress_limit (int, optional): Defaults to NO_PROGRESS_PLIES.
+        """
+        self.repetition_limit = repetition_limit
+        self.no_progress_limit = no_progress_limit
+        self.keys = []
+        self.counts = {}
+        self.quiet_plies = []
+
+    def push(self, key, irreversible=False):
+        """
+        Records a position reached by a move.
+
+        Args:
+            key (int): The position key (see Board.position_key).
+            irreversible (bool, optional): Whether the move leading here was a
+                capture or a man move. Defaults to False.
+        """
+        if irreversible or not self.quiet_plies:
+            quiet = 0
+        else:
+            quiet = self.quiet_plies[-1] + 1
+        self.keys.append(key)
+        self.quiet_plies.append(quiet)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def pop(self):
+        """Removes the most recent position, undoing the matching push."""
+        key = self.keys.pop()
+        self.quiet_plies.pop()
+        count = self.counts[key] - 1
+        if count:
+            self.counts[key] = count
+        else:
+            del self.counts[key]
+
+    def count(self, key):
+        """Returns how many times a position key has occurred."""
+        return self.counts.get(key, 0)
+
+    def is_draw(self):
+        """
+        Checks whether the game is drawn at the current position.
+
+        Returns:
+            bool: True on threefold repetition or when the no-progress limit is reached.
+        """
+        if not self.keys:
+            return False
+        return (self.counts[self.keys[-1]] >= self.repetition_limit
+                or self.quiet_plies[-1] >= self.no_progress_limit)
+
+    def is_repetition(self):
+        """
+        Checks whether the current position should be scored as a draw in search.
+
+        Unlike is_draw, a single earlier occurrence is enough: if the side to
+        move could repeat once, it can repeat again.
+
+        Returns:
+            bool: True if the position occurred before or the no-progress limit is reached.
+        """
+        if not self.keys:
+            return False
+        return self.counts[self.keys[-1]] > 1 or self.quiet_plies[-1] >= self.no_progress_limit
+
+def is_irreversible(board, move_details):
+    """
+    Checks whether a move can never be undone.
+
+    Args:
+        board (Board): The board before the move is made.
+        move_details (tuple): (start_coords, end_coords, skipped_coords).
+
+    Returns:
+        bool: True if the move captures or moves a man.
+    """
+    start, _, skipped = move_details
+    return bool(skipped) or not board.get_piece(start[0], start[1]).king
@@ -33,6 +33,19 @@ def parse_position(pos_str):
         return (row, col)
     return None
 
+def format_position(row, col):
+    """
+    Formats board indices as a position string, the inverse of parse_position.
+
+    Args:
+        row (int): Row index.
+        col (int): Column index.
+
+    Returns:
+        str: The position string, e.g. "C3".
+    """
+    return f"{chr(ord('A') + col)}{row + 1}"
+
 def get_player_move(turn_color):
     """
     Prompts the player for a move and parses the input.
@@ -44,14 +57,17 @@ def get_player_move(turn_color):
         tuple or str or None: 
             - (start_pos, end_pos) tuple if input is valid.
             - 'QUIT' if the user wants to quit.
+            - 'HINT' if the user asks for a hint.
             - None if the input format is invalid.
     """
     color_name = "RED" if turn_color == 1 else "BLACK"
     
     try:
-        move_str = input(f"{color_name}'s turn. Enter move (e.g., C3 D4) or 'q' to quit: ").strip()
+        move_str = input(f"{color_name}'s turn. Enter move (e.g., C3 D4), 'h' for a hint or 'q' to quit: ").strip()
         if move_str.lower() == 'q':
             return 'QUIT'
+        if move_str.lower() in ('h', 'hint'):
+            return 'HINT'
         
         parts = move_str.split()
         if len(parts) != 2:
@@ -5,12 +5,19 @@ This is the entry point of the application. It handles the game loop,
 UI rendering, and high-level game logic (turns, win conditions, mode selection).
 """
 
+import argparse
 import bext
 import colorama
 from constants import *
 from board import Board
-from input_handler import get_player_move
-from ai import iterative_deepening
+from input_handler import get_player_move, format_position
+from ai import multi_pv
+from position import Position
+from registry import AlphaBetaEngine, make_engine
+from spectator import Renderer, watch_game
+from history import GameHistory, is_irreversible
+from profiling import add_profile_arguments, profiler_from_args
+from tracer import add_trace_arguments, tracer_from_args
 
 def draw_welcome_screen():
     """Draws the ASCII art welcome screen and menu."""
@@ -26,7 +33,9 @@ def draw_welcome_screen():
     print("\nWelcome to Console Checkers!")
     print("1. Player vs Player")
     print("2. Player vs AI")
-    print("\nSelect mode (1 or 2): ", end='')
+    print("3. Player vs MCTS AI")
+    print("4. AI vs MCTS AI (watch)")
+    print("\nSelect mode (1, 2, 3 or 4): ", end='')
 
 def draw_score(board):
     """
@@ -38,7 +47,82 @@ def draw_score(board):
     bext.goto(BOARD_OFFSET_X, 0)
     print(f"{COLOR_RED}RED: {board.red_left} {KING_SYMBOL if board.red_kings > 0 else ''}   {COLOR_BLACK}BLACK: {board.black_left} {KING_SYMBOL if board.black_kings > 0 else ''}{COLOR_RESET}   ")
 
-def main():
+def draw_hint(board, turn, history, line):
+    """
+    Shows the best moves for the player to move, with their scores.
+
+    Args:
+        board (Board): The current board state.
+        turn (int): The color to move.
+        history (GameHistory): Positions played so far.
+        line (int): Screen row to print the hint on.
+    """
+    bext.goto(0, line)
+    print("Thinking...".ljust(80))
+    hints = []
+    for pv_line in multi_pv(board, turn == BLACK, HINT_LINES, time_limit=HINT_TIME, history=history):
+        score = pv_line.score if turn == BLACK else -pv_line.score
+        score_text = ("win" if score > 0 else "loss") if abs(score) == float('inf') else f"{score:+g}"
+        start, end, _ = pv_line.move
+        hints.append(f"{format_position(*start)} {format_position(*end)} ({score_text})")
+    bext.goto(0, line)
+    print(("Hint: " + ",  ".join(hints) if hints else "No legal moves.").ljust(80))
+
+def parse_args(argv=None):
+    """
+    Parses the command-line options.
+
+    Args:
+        argv (list, optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Play checkers in the console.")
+    parser.add_argument("--fps", type=float, default=SPECTATOR_FPS,
+                        help=f"frames per second while watching AI vs AI (default {SPECTATOR_FPS})")
+    parser.add_argument("--move-delay", type=float, default=0.0,
+                        help="seconds to pause after each move while watching AI vs AI (default 0)")
+    parser.add_argument("--engine", metavar="SPEC",
+                        help=f"engine spec of the AI opponent (default {AI_ENGINE}, or {MCTS_ENGINE} in mode 3)")
+    parser.add_argument("--watch", nargs=2, metavar=("RED", "BLACK"), default=[AI_ENGINE, MCTS_ENGINE],
+                        help=f"engine specs played against each other in mode 4 (default {AI_ENGINE} {MCTS_ENGINE})")
+    add_profile_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+    for spec in filter(None, [args.engine] + args.watch):
+        try:
+            make_engine(spec).close()
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+def watch(fps=SPECTATOR_FPS, move_delay=0.0, red_spec=AI_ENGINE, black_spec=MCTS_ENGINE):
+    """
+    Plays two engines against each other, by default the minimax AI (RED)
+    against the MCTS AI (BLACK), while the board is drawn from a separate
+    render thread.
+
+    Args:
+        fps (float, optional): Maximum frames per second. Defaults to SPECTATOR_FPS.
+        move_delay (float, optional): Pause after each move. Defaults to 0.
+        red_spec (str, optional): Engine spec of RED. Defaults to AI_ENGINE.
+        black_spec (str, optional): Engine spec of BLACK. Defaults to MCTS_ENGINE.
+    """
+    red_engine, black_engine = make_engine(red_spec), make_engine(black_spec)
+    renderer = Renderer(fps)
+    renderer.start()
+    try:
+        watch_game(red_engine, black_engine, renderer, move_delay=move_delay)
+    finally:
+        renderer.stop()
+        red_engine.close()
+        black_engine.close()
+    bext.goto(0, BOARD_OFFSET_Y + ROWS * 2 + 3)
+    print(f"Frames drawn: {renderer.frames}, dropped: {renderer.dropped}")
+
+def main(profiler=None, profile_move=None, fps=SPECTATOR_FPS, move_delay=0.0, tracer=None, engine_spec=None,
+         watch_specs=(AI_ENGINE, MCTS_ENGINE)):
     """
     The main game loop.
 
@@ -49,24 +133,69 @@ def main():
     - Input processing
     - AI move execution
     - Win/Loss detection
+
+    Args:
+        profiler (SearchProfiler, optional): Profiles the AI searches when given.
+            Only the search runs under the profiler, not the terminal I/O.
+        profile_move (int, optional): Only profile the AI search at this ply.
+        fps (float, optional): Frame rate of the watch mode. Defaults to SPECTATOR_FPS.
+        move_delay (float, optional): Pause after each move in the watch mode. Defaults to 0.
+        tracer (SearchTracer, optional): Traces the alpha-beta AI searches when given.
+        engine_spec (str, optional): Engine spec of the AI opponent. Defaults to
+            AI_ENGINE in mode 2 and MCTS_ENGINE in mode 3.
+        watch_specs (tuple, optional): RED and BLACK engine specs of the watch mode.
     """
     bext.title('Console Checkers')
     draw_welcome_screen()
     
     mode = ''
-    while mode not in ['1', '2']:
+    while mode not in ['1', '2', '3', '4']:
         mode = input().strip()
-        if mode not in ['1', '2']:
-            print("Invalid selection. Please enter 1 or 2: ", end='')
+        if mode not in ['1', '2', '3', '4']:
+            print("Invalid selection. Please enter 1, 2, 3 or 4: ", end='')
     
     bext.clear()
+    if mode == '4':
+        watch(fps, move_delay, *watch_specs)
+        return
+
     board = Board()
     board.draw()
     draw_score(board)
     
     turn = RED
     input_line = BOARD_OFFSET_Y + ROWS * 2 + 2
-    
+    history = GameHistory()
+    history.push(board.position_key(turn), True)
+    engine = None
+    if mode != '1':
+        engine = make_engine(engine_spec or (MCTS_ENGINE if mode == '3' else AI_ENGINE))
+        if not isinstance(engine, AlphaBetaEngine):
+            tracer = None
+        elif tracer is not None:
+            engine.tracer = tracer
+    try:
+        play(board, turn, history, mode, engine, input_line, profiler, profile_move, tracer)
+    finally:
+        if engine is not None:
+            engine.close()
+
+def play(board, turn, history, mode, engine, input_line, profiler=None, profile_move=None, tracer=None):
+    """
+    Runs the turns of a game until it ends or a player quits.
+
+    Args:
+        board (Board): The drawn starting board.
+        turn (int): The color to move.
+        history (GameHistory): Positions played so far.
+        mode (str): The selected mode, '1', '2' or '3'.
+        engine (Engine): The AI playing BLACK, or None in mode 1.
+        input_line (int): Screen row of the prompt.
+        profiler (SearchProfiler, optional): Profiles the AI searches when given.
+        profile_move (int, optional): Only profile the AI search at this ply.
+        tracer (SearchTracer, optional): Receives a begin() before each AI search.
+    """
+
     while True:
         winner = board.winner()
         if winner is not None:
@@ -76,6 +205,11 @@ def main():
             else:
                 print(f"{COLOR_BLACK}BLACK WINS!{COLOR_RESET}")
             break
+
+        if history.is_draw():
+            bext.goto(0, input_line)
+            print("DRAW! The position repeated or no progress was made.")
+            break
         
         draw_score(board)
         
@@ -95,6 +229,10 @@ def main():
                 
                 if move == 'QUIT':
                     return
+
+                if move == 'HINT':
+                    draw_hint(board, turn, history, input_line + 1)
+                    continue
                 
                 if move is None:
                     bext.goto(0, input_line + 1)
@@ -106,13 +244,18 @@ def main():
                 
                 if piece != 0 and piece.color == turn:
                     valid_moves = board.get_valid_moves(piece)
-                    if end in valid_moves:
+                    if end in valid_moves and not valid_moves[end] and board.has_captures(turn):
+                        bext.goto(0, input_line + 1)
+                        print("A capture is available. You must jump.")
+                    elif end in valid_moves:
                         skipped = valid_moves[end]
+                        irreversible = bool(skipped) or not piece.king
                         board.move(piece, end[0], end[1])
                         if skipped:
                             board.remove(skipped)
                         valid_move = True
                         turn = BLACK if turn == RED else RED
+                        history.push(board.position_key(turn), irreversible)
                     else:
                         bext.goto(0, input_line + 1)
                         print("Invalid move for this piece.")
@@ -125,7 +268,14 @@ def main():
             print("AI is thinking...")
             
             
-            move_details = iterative_deepening(board, True, time_limit=1.0)
+            ply = len(history.keys) - 1
+            if tracer is not None:
+                tracer.begin(f"ply {ply}")
+            position = Position.from_board(board, turn)
+            if profiler is not None and profile_move in (None, ply):
+                move_details = profiler.run(engine.choose_move, position, history=history)
+            else:
+                move_details = engine.choose_move(position, history=history)
             
             if move_details is None:
                 bext.goto(0, input_line)
@@ -133,6 +283,7 @@ def main():
                 break
             
             start_coords, end_coords, skipped_coords = move_details
+            irreversible = is_irreversible(board, move_details)
             
             piece = board.get_piece(start_coords[0], start_coords[1])
             board.move(piece, end_coords[0], end_coords[1])
@@ -146,14 +297,24 @@ def main():
                 board.remove(pieces_to_remove)
             
             turn = RED
+            history.push(board.position_key(turn), irreversible)
             
             bext.goto(0, input_line)
             print(' ' * 80)
 
 if __name__ == "__main__":
+    args = parse_args()
+    profiler = profiler_from_args(args)
+    tracer = tracer_from_args(args)
     try:
-        main()
+        main(profiler, args.profile_move, args.fps, args.move_delay, tracer, args.engine, args.watch)
     except KeyboardInterrupt:
         pass
     finally:
         print(COLOR_RESET)
+        if profiler is not None:
+            for path in profiler.write(args.profile):
+                print(f"Profile written to {path}")
+        if tracer is not None:
+            tracer.close()
+            print(f"Search trace written to {args.trace}")
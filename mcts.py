@@ -0,0 +1,272 @@
+"""
+Monte Carlo Tree Search Module for Console Checkers.
+
+This module provides an alternative AI to the alpha-beta search in ai.py.
+It grows a game tree by repeated playouts: UCT selects a path through the
+tree, one new node is added, a short random playout from it is scored with
+evaluate_board, and the result is backed up along the path. The move whose
+subtree received the most visits is played.
+
+The tree is kept between moves, so the part that stays relevant after the
+opponent's reply is reused. Several processes can search in parallel: each
+grows its own tree from the same root and the visit counts of the root
+moves are added up (root parallelism).
+"""
+
+import math
+import time
+import random
+import multiprocessing
+from collections import namedtuple
+from constants import RED, BLACK, MCTS_EXPLORATION, MCTS_PLAYOUT_PLIES, MCTS_EVAL_SCALE
+from position import Position
+from ai import evaluate_board
+
+MCTSResult = namedtuple('MCTSResult', ['move', 'visits', 'playouts', 'elapsed'])
+MCTSResult.__doc__ = """Outcome of an MCTS search: best move, its visit count, playouts run and seconds used."""
+
+def legal_moves(position):
+    """
+    Lists the legal moves of the side to move in a position.
+
+    Args:
+        position (Position): The position.
+
+    Returns:
+        list: Move details (start_coords, end_coords, skipped_coords).
+    """
+    board = position.to_board()
+    return [((piece.row, piece.col), end, [(p.row, p.col) for p in skipped])
+            for piece, end, skipped in board.get_all_valid_moves(position.turn)]
+
+class Node:
+    """
+    A node of the search tree.
+
+    Attributes:
+        position (Position): The position at this node.
+        parent (Node): The parent node, or None at the root.
+        move (tuple): The move that led here from the parent.
+        children (list): Expanded child nodes.
+        untried (list): Legal moves not expanded yet, or None before the first visit.
+        visits (int): Number of playouts through this node.
+        value (float): Sum of playout results, from the point of view of the
+            player who made the move leading to this node.
+    """
+    __slots__ = ('position', 'parent', 'move', 'children', 'untried', 'visits', 'value')
+
+    def __init__(self, position, parent=None, move=None):
+        self.position = position
+        self.parent = parent
+        self.move = move
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.value = 0.0
+
+    def select_child(self, exploration):
+        """Returns the child with the highest UCT score."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.value / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+    def best_child(self):
+        """Returns the most visited child, or None if there is none."""
+        return max(self.children, key=lambda child: child.visits, default=None)
+
+class MCTS:
+    """
+    A Monte Carlo Tree Search player.
+
+    Attributes:
+        exploration (float): UCT exploration constant.
+        playout_plies (int): Random plies played before a playout is scored
+            with evaluate_board. 0 scores new nodes by evaluation alone.
+        eval_scale (float): Evaluation difference that maps to a win
+            probability of about 73% (the logistic scale).
+        workers (int): Number of processes searching in parallel.
+        root (Node): Tree kept from the previous search, or None.
+        rng (random.Random): Generator for the playouts.
+    """
+    def __init__(self, exploration=MCTS_EXPLORATION, playout_plies=MCTS_PLAYOUT_PLIES,
+                 eval_scale=MCTS_EVAL_SCALE, seed=None, workers=1):
+        """
+        Initializes the player.
+
+        Args:
+            exploration (float, optional): UCT exploration constant. Defaults to MCTS_EXPLORATION.
+            playout_plies (int, optional): Random plies per playout. Defaults to MCTS_PLAYOUT_PLIES.
+            eval_scale (float, optional): Logistic scale of the evaluation. Defaults to MCTS_EVAL_SCALE.
+            seed (int, optional): Seed for the playouts. Defaults to None.
+            workers (int, optional): Parallel search processes. Defaults to 1.
+        """
+        self.exploration = exploration
+        self.playout_plies = playout_plies
+        self.eval_scale = eval_scale
+        self.seed = seed
+        self.workers = workers
+        self.root = None
+        self.rng = random.Random(seed)
+        self._pool = None
+
+    def close(self):
+        """Shuts down the worker processes, if any."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _root_for(self, position):
+        """
+        Finds a position in the kept tree, up to two plies below the old root.
+
+        Returns:
+            Node: The matching subtree detached from its parent, or a new node.
+        """
+        candidates = [self.root] if self.root is not None else []
+        for _ in range(3):
+            for node in candidates:
+                if node.position == position:
+                    node.parent = None
+                    node.move = None
+                    return node
+            candidates = [child for node in candidates for child in node.children]
+        return Node(position)
+
+    def _playout(self, position):
+        """
+        Plays random moves from a position and scores the result.
+
+        Returns:
+            float: Probability estimate (0 to 1) that BLACK wins.
+        """
+        board = position.to_board()
+        turn = position.turn
+        for _ in range(self.playout_plies):
+            moves = board.get_all_valid_moves(turn)
+            if not moves:
+                return 0.0 if turn == BLACK else 1.0
+            piece, end, skipped = self.rng.choice(moves)
+            board.move(piece, end[0], end[1], visual=False)
+            if skipped:
+                board.remove(skipped, visual=False)
+            turn = BLACK if turn == RED else RED
+            if board.winner() is not None:
+                break
+        score = evaluate_board(board)
+        if score == float('inf'):
+            return 1.0
+        if score == float('-inf'):
+            return 0.0
+        return 1 / (1 + math.exp(-score / self.eval_scale))
+
+    def _iterate(self, root):
+        """Runs one selection, expansion, playout and backup step from the root."""
+        node = root
+        while node.untried is not None and not node.untried and node.children:
+            node = node.select_child(self.exploration)
+
+        if node.untried is None:
+            node.untried = legal_moves(node.position)
+            self.rng.shuffle(node.untried)
+        if node.untried:
+            move = node.untried.pop()
+            node = Node(node.position.apply(move), node, move)
+            node.parent.children.append(node)
+            black_result = self._playout(node.position)
+        else:
+            # No legal moves: the side to move has lost.
+            black_result = 0.0 if node.position.turn == BLACK else 1.0
+
+        while node.parent is not None:
+            node.visits += 1
+            node.value += black_result if node.parent.position.turn == BLACK else 1 - black_result
+            node = node.parent
+        node.visits += 1
+
+    def grow(self, root, time_limit=None, max_playouts=None, start_time=None):
+        """
+        Grows a tree until the time limit or the playout budget runs out.
+
+        Args:
+            root (Node): The root of the tree.
+            time_limit (float, optional): Seconds to search, or None. Defaults to None.
+            max_playouts (int, optional): Playouts to run, or None. Defaults to None.
+            start_time (float, optional): Start of the clock. Defaults to now.
+
+        Returns:
+            int: The number of playouts run.
+        """
+        start_time = time.time() if start_time is None else start_time
+        playouts = 0
+        while (max_playouts is None or playouts < max_playouts) and \
+                (time_limit is None or time.time() - start_time < time_limit):
+            self._iterate(root)
+            playouts += 1
+            if root.untried is not None and not root.untried and not root.children:
+                break
+        return playouts
+
+    def search(self, board, max_player, time_limit=1.0, max_playouts=None):
+        """
+        Searches a position and returns the most visited move.
+
+        Args:
+            board (Board): The current board state.
+            max_player (bool): True if BLACK is to move, False if RED is.
+            time_limit (float, optional): Seconds to search, or None. Defaults to 1.0.
+            max_playouts (int, optional): Playout budget (per worker), or None.
+                Defaults to None. Give one of time_limit and max_playouts.
+
+        Returns:
+            MCTSResult: The chosen move with its visits, the playouts run and the time used.
+        """
+        start_time = time.time()
+        position = Position.from_board(board, BLACK if max_player else RED)
+
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(self.workers)
+            seed = self.rng.getrandbits(32)
+            jobs = [(self.exploration, self.playout_plies, self.eval_scale, seed + i,
+                     position, time_limit, max_playouts, start_time) for i in range(self.workers)]
+            totals = {}
+            playouts = 0
+            for counts, worker_playouts in self._pool.map(_grow_worker, jobs):
+                playouts += worker_playouts
+                for key, (move, visits) in counts.items():
+                    totals[key] = (move, totals.get(key, (move, 0))[1] + visits)
+            move, visits = max(totals.values(), key=lambda item: item[1], default=(None, 0))
+            return MCTSResult(move, visits, playouts, time.time() - start_time)
+
+        root = self._root_for(position)
+        playouts = self.grow(root, time_limit, max_playouts, start_time)
+        self.root = root
+        best = root.best_child()
+        if best is None:
+            return MCTSResult(None, 0, playouts, time.time() - start_time)
+        return MCTSResult(best.move, best.visits, playouts, time.time() - start_time)
+
+    def choose_move(self, board, max_player, time_limit=1.0):
+        """
+        Returns the move to play, like ai.iterative_deepening.
+
+        Args:
+            board (Board): The current board state.
+            max_player (bool): True if BLACK is to move, False if RED is.
+            time_limit (float, optional): Seconds to search. Defaults to 1.0.
+
+        Returns:
+            tuple: The chosen move details, or None if there is no legal move.
+        """
+        return self.search(board, max_player, time_limit).move
+
+def _grow_worker(job):
+    """Pool entry point: grows a private tree and returns the root move visit counts."""
+    exploration, playout_plies, eval_scale, seed, position, time_limit, max_playouts, start_time = job
+    player = MCTS(exploration, playout_plies, eval_scale, seed)
+    root = Node(position)
+    playouts = player.grow(root, time_limit, max_playouts, start_time)
+    counts = {(child.move[0], child.move[1], tuple(child.move[2])): (child.move, child.visits)
+              for child in root.children}
+    return counts, playouts
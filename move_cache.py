@@ -0,0 +1,104 @@
+"""
+Move Cache Module for Console Checkers.
+
+This module provides a bounded least-recently-used cache of generated
+moves. Positions recur constantly during iterative deepening and across
+the moves of a game, so remembering their move lists avoids walking every
+piece again. Entries are keyed by the Zobrist position key, which already
+includes the side to move, and store moves as plain coordinate tuples.
+A position and its mirror image, the board rotated by 180 degrees with the
+colors and the side to move swapped, share one entry under their canonical
+key; the moves of the mirror image are the stored moves rotated.
+"""
+
+from collections import OrderedDict
+from constants import MOVE_CACHE_SIZE, SYMMETRY_ENABLED
+from position import mirror_move
+
+class MoveCache:
+    """
+    A bounded LRU cache of move lists.
+
+    Attributes:
+        capacity (int): Maximum number of positions kept. 0 disables caching.
+        symmetric (bool): Whether mirror images share entries.
+        entries (OrderedDict): Position key -> tuple of compact moves.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that generated moves.
+    """
+    def __init__(self, capacity=MOVE_CACHE_SIZE, symmetric=SYMMETRY_ENABLED):
+        """
+        Initializes an empty cache.
+
+        Args:
+            capacity (int, optional): Maximum number of positions. Defaults to MOVE_CACHE_SIZE.
+            symmetric (bool, optional): Share entries between mirror images. Defaults to SYMMETRY_ENABLED.
+        """
+        self.capacity = capacity
+        self.symmetric = symmetric
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_moves(self, board, color):
+        """
+        Returns the legal moves of a color, generating them on a miss.
+
+        Args:
+            board (Board): The current board state.
+            color (int): The color to move (RED or BLACK).
+
+        Returns:
+            tuple: Tuples (start_coords, end_coords, skipped_coords), where
+                   skipped_coords is a tuple of (row, col) pairs.
+        """
+        if self.symmetric:
+            key, mirrored = board.canonical_key(color)
+        else:
+            key, mirrored = board.position_key(color), False
+        moves = self.entries.get(key)
+        if moves is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return tuple(sorted(mirror_move(move) for move in moves)) if mirrored else moves
+
+        self.misses += 1
+        # Sorted so the order does not depend on the piece order of the board
+        # that filled the entry, and seeded searches repeat move for move.
+        moves = tuple(sorted(
+            ((piece.row, piece.col), move, tuple((p.row, p.col) for p in skipped))
+            for piece, move, skipped in board.get_all_valid_moves(color)
+        ))
+        if self.capacity > 0:
+            self.entries[key] = tuple(sorted(mirror_move(move) for move in moves)) if mirrored else moves
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        return moves
+
+    def hit_rate(self):
+        """Returns the fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Summarizes cache usage.
+
+        Returns:
+            dict: size, capacity, hits, misses and hit_rate.
+        """
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+        }
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        self.entries.clear()
+        self.hits = self.misses = 0
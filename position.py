@@ -0,0 +1,369 @@
+"""
+Position Module for Console Checkers.
+
+This module provides a compact, immutable snapshot of a game position.
+A Position stores the board as a flat tuple of small integer codes plus the
+side to move, which makes it cheap to copy, natural to hash and small in
+memory compared to a full Board of Piece objects. Adapters convert to and
+from the Board used by the game loop and the AI.
+"""
+
+from constants import RED, BLACK, ROWS, COLS
+from board import Board, Piece, ZOBRIST_PIECES, ZOBRIST_BLACK_TO_MOVE
+
+# Square Codes
+EMPTY_SQUARE = 0
+RED_MAN = 1
+BLACK_MAN = 2
+RED_KING = 3
+BLACK_KING = 4
+
+# PDN colors: RED plays the white pieces at the bottom, BLACK the black pieces at the top.
+FEN_COLORS = {RED: 'W', BLACK: 'B'}
+FEN_TURNS = {'W': RED, 'B': BLACK}
+
+SQUARE_CHARS = {EMPTY_SQUARE: '.', RED_MAN: 'r', BLACK_MAN: 'b', RED_KING: 'R', BLACK_KING: 'B'}
+CHAR_SQUARES = {char: code for code, char in SQUARE_CHARS.items()}
+
+def encode_piece(piece):
+    """Returns the square code of a Piece, or EMPTY_SQUARE for 0."""
+    if piece == 0:
+        return EMPTY_SQUARE
+    return piece.color + 2 * piece.king
+
+def code_color(code):
+    """Returns the color (RED or BLACK) of a non-empty square code."""
+    return RED if code in (RED_MAN, RED_KING) else BLACK
+
+def code_is_king(code):
+    """Returns True if the square code holds a king."""
+    return code >= RED_KING
+
+def square_number(row, col):
+    """
+    Returns the PDN number (1-32) of a dark square.
+
+    Squares are numbered row by row from BLACK's home row (row 0), left to
+    right, as in a standard PDN diagram with BLACK at the top.
+    """
+    return row * (COLS // 2) + col // 2 + 1
+
+def square_coords(number):
+    """Returns the (row, col) of a PDN square number."""
+    row, index = divmod(number - 1, COLS // 2)
+    return row, index * 2 + (row + 1) % 2
+
+def mirror_move(move_details):
+    """
+    Maps a move onto the mirror image of its position (see Board.canonical_key).
+
+    Args:
+        move_details (tuple): (start_coords, end_coords, skipped_coords), or None.
+
+    Returns:
+        tuple: The move with every square rotated by 180 degrees, or None.
+    """
+    if move_details is None:
+        return None
+    (start_row, start_col), (end_row, end_col), skipped = move_details
+    return ((ROWS - 1 - start_row, COLS - 1 - start_col), (ROWS - 1 - end_row, COLS - 1 - end_col),
+            type(skipped)((ROWS - 1 - row, COLS - 1 - col) for row, col in skipped))
+
+def move_to_text(move_details):
+    """
+    Formats a move in PDN style.
+
+    Quiet moves are written ``11-15`` and captures ``15x24``. Intermediate
+    squares of a multi-jump are not listed.
+
+    Args:
+        move_details (tuple): (start_coords, end_coords, skipped_coords).
+
+    Returns:
+        str: The move text.
+    """
+    start, end, skipped = move_details
+    separator = 'x' if skipped else '-'
+    return f"{square_number(*start)}{separator}{square_number(*end)}"
+
+def parse_move_text(text, legal_moves):
+    """
+    Finds the legal move matching a PDN move text.
+
+    Both ``-`` and ``x`` separators are accepted. For multi-jumps written
+    with intermediate squares (``15x24x31``) only the first and last square
+    are used.
+
+    Args:
+        text (str): The move text.
+        legal_moves (list): Move details to choose from.
+
+    Returns:
+        tuple or None: The matching move details, or None if none matches.
+    """
+    parts = text.lower().replace('x', '-').split('-')
+    if len(parts) < 2 or not all(part.isdigit() for part in parts):
+        return None
+    start = square_coords(int(parts[0]))
+    end = square_coords(int(parts[-1]))
+    for move_details in legal_moves:
+        if tuple(move_details[0]) == start and tuple(move_details[1]) == end:
+            return move_details
+    return None
+
+class Position:
+    """
+    An immutable checkers position.
+
+    Attributes:
+        squares (tuple): ROWS * COLS square codes in row-major order.
+        turn (int): The color to move (RED or BLACK).
+        hash (int): Zobrist key, equal to Board.position_key(turn) of the same position.
+    """
+    __slots__ = ('squares', 'turn', 'hash', '_pieces')
+
+    def __init__(self, squares, turn=RED):
+        """
+        Initializes a Position.
+
+        Args:
+            squares (iterable): ROWS * COLS square codes in row-major order.
+            turn (int, optional): The color to move. Defaults to RED.
+        """
+        squares = tuple(squares)
+        if len(squares) != ROWS * COLS:
+            raise ValueError(f"expected {ROWS * COLS} squares, got {len(squares)}")
+
+        h = ZOBRIST_BLACK_TO_MOVE if turn == BLACK else 0
+        for index, code in enumerate(squares):
+            if code:
+                row, col = divmod(index, COLS)
+                h ^= ZOBRIST_PIECES[row][col][code - 1]
+
+        object.__setattr__(self, 'squares', squares)
+        object.__setattr__(self, 'turn', turn)
+        object.__setattr__(self, 'hash', h)
+        object.__setattr__(self, '_pieces', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Position is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Position is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.turn == other.turn and self.squares == other.squares
+
+    def __hash__(self):
+        return self.hash
+
+    def __reduce__(self):
+        return (Position, (self.squares, self.turn))
+
+    def __repr__(self):
+        return f"Position.from_rows({self.rows()!r}, turn={'BLACK' if self.turn == BLACK else 'RED'})"
+
+    def __str__(self):
+        return "\n".join(self.rows())
+
+    @classmethod
+    def from_board(cls, board, turn=RED):
+        """
+        Creates a Position from a Board.
+
+        Args:
+            board (Board): The board to snapshot.
+            turn (int, optional): The color to move. Defaults to RED.
+
+        Returns:
+            Position: The snapshot.
+        """
+        return cls([encode_piece(piece) for row in board.board for piece in row], turn)
+
+    @classmethod
+    def from_rows(cls, rows, turn=RED):
+        """
+        Creates a Position from a text diagram.
+
+        Each row is a string of COLS characters: '.' for an empty square,
+        'r'/'b' for red/black men and 'R'/'B' for red/black kings. Row 0
+        (BLACK's home row) comes first.
+
+        Args:
+            rows (list): ROWS strings.
+            turn (int, optional): The color to move. Defaults to RED.
+
+        Returns:
+            Position: The parsed position.
+        """
+        if len(rows) != ROWS or any(len(row) != COLS for row in rows):
+            raise ValueError(f"expected {ROWS} rows of {COLS} characters")
+        return cls([CHAR_SQUARES[char] for row in rows for char in row], turn)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Creates a Position from a PDN FEN string.
+
+        The format is ``<turn>:W<squares>:B<squares>``, for example
+        ``W:W21,22,K30:B1,2,3``. ``W`` is RED and ``B`` is BLACK. A ``K``
+        prefix marks a king and ranges such as ``1-12`` are accepted.
+
+        Args:
+            fen (str): The FEN string.
+
+        Returns:
+            Position: The parsed position.
+
+        Raises:
+            ValueError: If the string is malformed.
+        """
+        fields = fen.strip().rstrip('.').split(':')
+        if len(fields) != 3 or fields[0].upper() not in FEN_TURNS:
+            raise ValueError(f"invalid FEN {fen!r}")
+
+        squares = [EMPTY_SQUARE] * (ROWS * COLS)
+        for field in fields[1:]:
+            color = FEN_TURNS.get(field[:1].upper())
+            if color is None:
+                raise ValueError(f"invalid FEN color field {field!r}")
+            for item in filter(None, field[1:].split(',')):
+                king = item[0].upper() == 'K'
+                item = item.lstrip('Kk')
+                first, _, last = item.partition('-')
+                if not first.isdigit() or (last and not last.isdigit()):
+                    raise ValueError(f"invalid FEN square {item!r}")
+                for number in range(int(first), int(last or first) + 1):
+                    if not 1 <= number <= ROWS * COLS // 2:
+                        raise ValueError(f"FEN square {number} out of range")
+                    row, col = square_coords(number)
+                    squares[row * COLS + col] = color + 2 * king
+        return cls(squares, FEN_TURNS[fields[0].upper()])
+
+    @classmethod
+    def initial(cls):
+        """Returns the starting position with RED to move."""
+        return cls.from_board(Board(), RED)
+
+    def rows(self):
+        """Returns the position as a list of text rows (see from_rows)."""
+        return ["".join(SQUARE_CHARS[code] for code in self.squares[row * COLS:(row + 1) * COLS])
+                for row in range(ROWS)]
+
+    def to_fen(self):
+        """Returns the position as a PDN FEN string (see from_fen)."""
+        fields = [FEN_COLORS[self.turn]]
+        for color in (RED, BLACK):
+            items = [f"{'K' if king else ''}{square_number(row, col)}"
+                     for row, col, king in sorted(self.pieces(color), key=lambda p: square_number(p[0], p[1]))]
+            fields.append(FEN_COLORS[color] + ",".join(items))
+        return ":".join(fields)
+
+    def to_board(self):
+        """
+        Builds a Board holding this position.
+
+        Returns:
+            Board: A new board with fresh Piece objects and matching counters.
+        """
+        board = Board()
+        board.board = []
+        for row in range(ROWS):
+            board.board.append([])
+            for col in range(COLS):
+                code = self.squares[row * COLS + col]
+                if code == EMPTY_SQUARE:
+                    board.board[row].append(0)
+                    continue
+
+                piece = Piece(row, col, code_color(code))
+                piece.king = code_is_king(code)
+                board.board[row].append(piece)
+        board.reindex()
+        return board
+
+    def get(self, row, col):
+        """Returns the square code at the given coordinates."""
+        return self.squares[row * COLS + col]
+
+    def pieces(self, color):
+        """
+        Lists the pieces of a color.
+
+        The lists for both colors are built on first use and cached.
+
+        Args:
+            color (int): RED or BLACK.
+
+        Returns:
+            tuple: Tuples (row, col, king) in row-major order.
+        """
+        if self._pieces is None:
+            red, black = [], []
+            for index, code in enumerate(self.squares):
+                if code:
+                    row, col = divmod(index, COLS)
+                    (red if code_color(code) == RED else black).append((row, col, code_is_king(code)))
+            object.__setattr__(self, '_pieces', (tuple(red), tuple(black)))
+        return self._pieces[0] if color == RED else self._pieces[1]
+
+    @property
+    def red_left(self):
+        """Number of red pieces on the board."""
+        return len(self.pieces(RED))
+
+    @property
+    def black_left(self):
+        """Number of black pieces on the board."""
+        return len(self.pieces(BLACK))
+
+    @property
+    def red_kings(self):
+        """Number of red kings on the board."""
+        return sum(king for _, _, king in self.pieces(RED))
+
+    @property
+    def black_kings(self):
+        """Number of black kings on the board."""
+        return sum(king for _, _, king in self.pieces(BLACK))
+
+    def mirror(self):
+        """
+        Returns the mirror image: the board rotated by 180 degrees, the colors
+        swapped and the other side to move.
+        """
+        swapped = {EMPTY_SQUARE: EMPTY_SQUARE, RED_MAN: BLACK_MAN, BLACK_MAN: RED_MAN,
+                   RED_KING: BLACK_KING, BLACK_KING: RED_KING}
+        return Position((swapped[code] for code in reversed(self.squares)), BLACK if self.turn == RED else RED)
+
+    def canonical_key(self):
+        """Returns (key, mirrored), equal to Board.canonical_key(turn) of the same position."""
+        mirrored = self.mirror().hash
+        return (mirrored, True) if mirrored < self.hash else (self.hash, False)
+
+    def apply(self, move_details):
+        """
+        Returns the position after a move, with the other side to move.
+
+        Args:
+            move_details (tuple): (start_coords, end_coords, skipped_coords).
+
+        Returns:
+            Position: The new position.
+        """
+        (start_row, start_col), (end_row, end_col), skipped = move_details
+        squares = list(self.squares)
+        code = squares[start_row * COLS + start_col]
+        squares[start_row * COLS + start_col] = EMPTY_SQUARE
+        for row, col in skipped:
+            squares[row * COLS + col] = EMPTY_SQUARE
+
+        if code == RED_MAN and end_row == 0:
+            code = RED_KING
+        elif code == BLACK_MAN and end_row == ROWS - 1:
+            code = BLACK_KING
+        squares[end_row * COLS + end_col] = code
+
+        return Position(squares, BLACK if self.turn == RED else RED)
@@ -0,0 +1,284 @@
+"""
+Engine Registry for Console Checkers.
+
+This module gives every move-choosing engine the same interface, so that the
+game loop, the benchmark, the tournament and the distributed runner pick
+engines by name instead of testing for particular functions. An engine is
+built from a spec string ``name[:key=value,...]``:
+
+- ``old[:depth=3]``: the baseline minimax from ``testing/old_ai.py``.
+- ``new[:time=0.5]``: the iterative deepening search from ``testing/new_ai.py``.
+- ``ai[:time=0.5,depth=N,nodes=N,seed=N,tt=SLOTS]``: the production search in
+  ``ai.py``. Giving depth or nodes without time disables the clock. ``tt``
+  keeps one TranspositionTable of SLOTS entries for the whole game instead of
+  a fresh table per move. Any field of ``ai.SearchSettings`` can also be set,
+  e.g. ``ai:lmr=1,futility=0`` or ``ai:lmr=1,lmr_min_moves=4,futility=1``.
+- ``mcts[:time=0.5,playouts=N,plies=N,c=1.4,seed=N,workers=N]``: the Monte
+  Carlo Tree Search in ``mcts.py``, keeping its tree between the moves of a
+  game. ``playouts`` without ``time`` gives a fixed playout budget per move.
+
+New engines are added by subclassing Engine and decorating the class with
+``@register('name')``; every runner can then play them without changes.
+"""
+
+import random
+from collections import namedtuple
+from constants import BLACK, MAX_SEARCH_DEPTH, MCTS_EXPLORATION, MCTS_PLAYOUT_PLIES
+from mcts import MCTS
+from tt import TranspositionTable
+import ai
+
+Budget = namedtuple('Budget', ['time', 'depth', 'nodes'], defaults=[None, None, None])
+Budget.__doc__ = """Search limits for one move: seconds, deepest iteration and nodes (or
+playouts). A field left as None is not limited. A budget given to
+Engine.choose_move replaces the limits of the engine's config."""
+
+# Engine classes by name, filled by register().
+ENGINES = {}
+
+def register(name):
+    """
+    Class decorator adding an Engine subclass to ENGINES under name.
+
+    Args:
+        name (str): The name used in spec strings.
+
+    Returns:
+        function: The decorator.
+    """
+    def decorator(cls):
+        cls.name = name
+        ENGINES[name] = cls
+        return cls
+    return decorator
+
+def parse_spec(spec):
+    """
+    Splits an engine spec string into its name and options.
+
+    Args:
+        spec (str): A spec such as ``ai:time=0.2,seed=1``.
+
+    Returns:
+        tuple: (name, options) where options maps keys to int or float values.
+
+    Raises:
+        ValueError: If an option is not of the form key=number.
+    """
+    name, _, rest = spec.partition(':')
+    options = {}
+    for item in filter(None, rest.split(',')):
+        key, _, value = item.partition('=')
+        try:
+            options[key.strip()] = float(value) if '.' in value else int(value)
+        except ValueError:
+            raise ValueError(f"bad option {item!r} in spec {spec!r}, expected key=number") from None
+    return name.strip(), options
+
+def format_spec(name, options):
+    """
+    Builds a spec string, the inverse of parse_spec.
+
+    Args:
+        name (str): The engine name.
+        options (dict): Option values.
+
+    Returns:
+        str: The spec, e.g. ``ai:time=0.2,seed=1``.
+    """
+    if not options:
+        return name
+    return name + ':' + ','.join(f"{key}={value}" for key, value in options.items())
+
+def make_engine(spec):
+    """
+    Builds an engine from a spec string.
+
+    Args:
+        spec (str): The engine spec (see the module docstring).
+
+    Returns:
+        Engine: The engine, with spec stored on it.
+
+    Raises:
+        ValueError: If the engine name or one of its options is unknown.
+    """
+    name, options = parse_spec(spec)
+    cls = ENGINES.get(name)
+    if cls is None:
+        raise ValueError(f"unknown engine {name!r} in spec {spec!r}, expected one of {', '.join(ENGINES)}")
+    return cls(spec, **options)
+
+class Engine:
+    """
+    Base class of the registered engines.
+
+    Subclasses set ``defaults`` to the options they accept and implement
+    choose_move.
+
+    Attributes:
+        name (str): The registered name.
+        spec (str): The spec string the engine was built from.
+        config (dict): The defaults updated with the spec options.
+        nodes (int): Nodes (or playouts) of the last search, None if the engine does not count them.
+        seed (int): Seed that reproduces the last search from its position,
+            None if the search cannot be replayed.
+    """
+    name = None
+    defaults = {}
+    DEFAULT_TIME = 0.5
+
+    def __init__(self, spec=None, **options):
+        """
+        Initializes the engine config.
+
+        Args:
+            spec (str, optional): The spec string. Defaults to the engine name.
+            **options: Values overriding the defaults.
+
+        Raises:
+            ValueError: If an option is not in defaults.
+        """
+        unknown = sorted(set(options) - set(self.defaults))
+        if unknown:
+            raise ValueError(f"engine {self.name!r} has no option {', '.join(unknown)}; "
+                             f"expected {', '.join(self.defaults) or 'none'}")
+        self.spec = spec or self.name
+        self.config = dict(self.defaults, **options)
+        self.nodes = None
+        self.seed = None
+
+    def limits(self, budget=None):
+        """
+        Returns the limits of one search.
+
+        A clock of DEFAULT_TIME seconds is used unless the budget, or the
+        config when no budget is given, sets a time, a depth or a node limit.
+
+        Args:
+            budget (Budget, optional): Limits replacing the config. Defaults to None.
+
+        Returns:
+            Budget: The limits to search with.
+        """
+        if budget is None:
+            budget = Budget(self.config.get('time'), self.config.get('depth'), self.config.get('nodes'))
+        if budget == Budget():
+            budget = Budget(self.DEFAULT_TIME)
+        return budget
+
+    def choose_move(self, position, budget=None, history=None):
+        """
+        Chooses a move.
+
+        Args:
+            position (Position): The position to move in.
+            budget (Budget, optional): Limits replacing the config. Defaults to None.
+            history (GameHistory, optional): Positions played so far. Defaults to None.
+
+        Returns:
+            tuple: The move details, or None if there is no legal move.
+        """
+        raise NotImplementedError
+
+    def new_game(self):
+        """Forgets anything kept from the previous game."""
+
+    def close(self):
+        """Releases processes or tables held by the engine."""
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.spec}>"
+
+@register('old')
+class OldEngine(Engine):
+    """The baseline fixed-depth minimax. Only the depth of a budget is used."""
+    defaults = {'depth': 3}
+
+    def choose_move(self, position, budget=None, history=None):
+        from testing import old_ai
+        depth = budget.depth if budget is not None and budget.depth else self.config['depth']
+        return old_ai.minimax(position.to_board(), depth, float('-inf'), float('inf'), position.turn == BLACK)[1]
+
+@register('new')
+class NewEngine(Engine):
+    """The baseline iterative deepening search. Only the time of a budget is used."""
+    defaults = {'time': 0.5}
+
+    def choose_move(self, position, budget=None, history=None):
+        from testing import new_ai
+        time_limit = budget.time if budget is not None and budget.time else self.config['time']
+        return new_ai.iterative_deepening(position.to_board(), position.turn == BLACK, time_limit=time_limit)
+
+@register('ai')
+class AlphaBetaEngine(Engine):
+    """
+    The production alpha-beta search of ai.py.
+
+    Attributes:
+        shared_tt (SharedTranspositionTable): Table used instead of the
+            engine's own, e.g. one shared by all tournament workers. Defaults to None.
+        tracer (SearchTracer): Records the searched trees. Defaults to None.
+    """
+    defaults = dict({'time': None, 'depth': None, 'nodes': None, 'seed': None, 'tt': 0},
+                    **ai.SearchSettings()._asdict())
+
+    def __init__(self, spec=None, **options):
+        """Initializes the engine; see Engine."""
+        super().__init__(spec, **options)
+        self.settings = ai.SearchSettings(**{key: self.config[key] for key in ai.SearchSettings._fields})
+        self.shared_tt = None
+        self.tracer = None
+        self._tt = TranspositionTable(self.config['tt']) if self.config['tt'] else None
+
+    def choose_move(self, position, budget=None, history=None):
+        limits = self.limits(budget)
+        tt = self.shared_tt if self.shared_tt is not None else self._tt
+        # Unseeded searches draw a seed so that the move can still be replayed.
+        self.seed = self.config['seed'] if self.config['seed'] is not None else random.randrange(2 ** 31)
+        context = ai.SearchContext(limits.time, limits.nodes, self.seed, history, ai.default_move_cache,
+                                   tt=tt if tt is not None else TranspositionTable(), settings=self.settings,
+                                   tracer=self.tracer)
+        result = ai.search(position.to_board(), position.turn == BLACK, context, limits.depth or MAX_SEARCH_DEPTH)
+        self.nodes = result.nodes
+        return result.move
+
+    def new_game(self):
+        if self._tt is not None:
+            self._tt.clear()
+
+@register('mcts')
+class MCTSEngine(Engine):
+    """
+    The Monte Carlo Tree Search of mcts.py. The nodes of a budget count playouts.
+
+    Searches build on the tree and generator state of earlier moves, so they
+    cannot be replayed from their position alone and seed stays None.
+    """
+    defaults = {'time': None, 'playouts': None, 'plies': MCTS_PLAYOUT_PLIES, 'c': MCTS_EXPLORATION,
+                'seed': None, 'workers': 1}
+
+    def __init__(self, spec=None, **options):
+        """Initializes the engine; see Engine."""
+        super().__init__(spec, **options)
+        self.player = MCTS(self.config['c'], self.config['plies'], seed=self.config['seed'],
+                           workers=self.config['workers'])
+
+    def limits(self, budget=None):
+        if budget is None:
+            budget = Budget(self.config['time'], None, self.config['playouts'])
+        if budget.time is None and budget.nodes is None:
+            budget = Budget(self.DEFAULT_TIME)
+        return budget
+
+    def choose_move(self, position, budget=None, history=None):
+        limits = self.limits(budget)
+        result = self.player.search(position.to_board(), position.turn == BLACK, limits.time, limits.nodes)
+        self.nodes = result.playouts
+        return result.move
+
+    def new_game(self):
+        self.player.root = None
+
+    def close(self):
+        self.player.close()
@@ -0,0 +1,222 @@
+"""
+Shared Transposition Table Module for Console Checkers.
+
+This module provides a transposition table that lives in a
+multiprocessing.shared_memory block, so that several processes searching in
+parallel (or playing batches of games) read and extend the same results
+instead of each building a private table. The block has a fixed number of
+fixed-size slots, so memory does not grow with the number of processes.
+
+Probes and stores take no locks. Every slot holds a check word equal to the
+position key XORed with the other words of the entry. A slot torn by two
+processes writing at once, or holding another position, fails the check
+and reads as a miss, so readers never act on a corrupted entry.
+
+The table has the same probe/store/get/clear/stats interface as
+TranspositionTable and can be passed wherever one is expected.
+"""
+
+import sys
+import struct
+from multiprocessing import shared_memory
+from constants import ROWS, COLS, TT_SIZE
+from position import square_number, square_coords
+
+# Slot layout: check word, score bits, info word, capture path word.
+SLOT = struct.Struct('<QQQQ')
+DOUBLE = struct.Struct('<d')
+WORD = struct.Struct('<Q')
+
+# Info word: depth (8 bits), flag (2), has move (1), start square (5), end square (5),
+# captures (4) and a used bit that tells a stored entry from an empty slot.
+FLAG_SHIFT = 8
+MOVE_BIT = 1 << 10
+START_SHIFT = 11
+END_SHIFT = 16
+CAPTURES_SHIFT = 21
+USED_BIT = 1 << 25
+
+# Capture path word: up to 12 captured squares of 5 bits each.
+MAX_CAPTURES = 12
+
+MASK_64 = (1 << 64) - 1
+
+def pack_entry(key, depth, score, flag, move):
+    """
+    Packs a search result into the four words of a slot.
+
+    Args:
+        key (int): The position key.
+        depth (int): Remaining depth the position was searched to.
+        score (float): The search score.
+        flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+        move (tuple): Best move details, or None.
+
+    Returns:
+        tuple: (check, score_bits, info, path) words.
+    """
+    score_bits = WORD.unpack(DOUBLE.pack(score))[0]
+    info = USED_BIT | depth | flag << FLAG_SHIFT
+    path = 0
+    if isinstance(move, tuple):
+        start, end, skipped = move
+        info |= MOVE_BIT | (square_number(*start) - 1) << START_SHIFT | (square_number(*end) - 1) << END_SHIFT
+        info |= len(skipped) << CAPTURES_SHIFT
+        for i, (row, col) in enumerate(skipped):
+            path |= (square_number(row, col) - 1) << (5 * i)
+    return (key & MASK_64) ^ score_bits ^ info ^ path, score_bits, info, path
+
+def unpack_entry(score_bits, info, path):
+    """
+    Unpacks the words of a slot.
+
+    Returns:
+        tuple: (depth, score, flag, move) with the move in the same form as
+        the move details produced by the search, or None.
+    """
+    score = DOUBLE.unpack(WORD.pack(score_bits))[0]
+    depth = info & 0xFF
+    flag = info >> FLAG_SHIFT & 0x3
+    move = None
+    if info & MOVE_BIT:
+        start = square_coords((info >> START_SHIFT & 0x1F) + 1)
+        end = square_coords((info >> END_SHIFT & 0x1F) + 1)
+        captures = info >> CAPTURES_SHIFT & 0xF
+        skipped = [square_coords((path >> (5 * i) & 0x1F) + 1) for i in range(captures)]
+        move = (start, end, skipped)
+    return depth, score, flag, move
+
+class SharedTranspositionTable:
+    """
+    A fixed-size transposition table in shared memory.
+
+    Each position key maps to one slot (key modulo capacity). A store
+    replaces the slot unless it already holds the same position searched
+    deeper. Counters are kept per process.
+
+    Attributes:
+        capacity (int): Number of slots.
+        name (str): Name of the shared memory block, used to attach to it.
+        probes (int): Number of lookups made by this process.
+        hits (int): Number of those lookups that found an entry.
+    """
+    def __init__(self, capacity=TT_SIZE, name=None):
+        """
+        Creates a new table, or attaches to an existing one.
+
+        Args:
+            capacity (int, optional): Number of slots. Defaults to TT_SIZE.
+            name (str, optional): Name of an existing block to attach to.
+                Defaults to None, which creates a new zeroed block.
+        """
+        if ROWS * COLS // 2 > 32 or MAX_CAPTURES * 5 > 64:
+            raise ValueError("board too large for the packed entry format")
+        self.capacity = capacity
+        self.owner = name is None
+        if self.owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(capacity, 1) * SLOT.size)
+            self._shm.buf[:] = bytes(len(self._shm.buf))
+        else:
+            self._shm = _attach(name)
+        self.name = self._shm.name
+        self.probes = 0
+        self.hits = 0
+
+    def __getstate__(self):
+        # Pickling (e.g. to pool workers) sends the block name, not the contents.
+        return {"capacity": self.capacity, "name": self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["capacity"], state["name"])
+
+    def __len__(self):
+        buf = self._shm.buf
+        return sum(1 for index in range(self.capacity) if SLOT.unpack_from(buf, index * SLOT.size)[2] & USED_BIT)
+
+    def _read(self, key):
+        """Returns the entry stored for a key, or None if the slot holds another key or is torn."""
+        if self.capacity <= 0:
+            return None
+        check, score_bits, info, path = SLOT.unpack_from(self._shm.buf, key % self.capacity * SLOT.size)
+        if not info & USED_BIT or check ^ score_bits ^ info ^ path != key & MASK_64:
+            return None
+        return unpack_entry(score_bits, info, path)
+
+    def probe(self, key):
+        """
+        Looks up a position.
+
+        Args:
+            key (int): The position key.
+
+        Returns:
+            tuple or None: (depth, score, flag, move) if the position is stored.
+        """
+        self.probes += 1
+        entry = self._read(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def get(self, key):
+        """Looks up a position without counting a probe."""
+        return self._read(key)
+
+    def store(self, key, depth, score, flag, move):
+        """
+        Stores a search result.
+
+        Args:
+            key (int): The position key.
+            depth (int): Remaining depth the position was searched to.
+            score (float): The search score.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            move (tuple): Best move details found, or None.
+        """
+        if self.capacity <= 0:
+            return
+        existing = self._read(key)
+        if existing is not None and existing[0] > depth:
+            return
+        if isinstance(move, tuple) and len(move[2]) > MAX_CAPTURES:
+            move = None
+        SLOT.pack_into(self._shm.buf, key % self.capacity * SLOT.size, *pack_entry(key, depth, score, flag, move))
+
+    def clear(self):
+        """Empties every slot and resets this process's counters."""
+        self._shm.buf[:] = bytes(len(self._shm.buf))
+        self.probes = self.hits = 0
+
+    def stats(self):
+        """
+        Summarizes table usage.
+
+        Returns:
+            dict: size, capacity, probes, hits and hit_rate.
+        """
+        return {
+            "size": len(self),
+            "capacity": self.capacity,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+        }
+
+    def close(self):
+        """Detaches this process from the block. The creator also frees it."""
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+def _attach(name):
+    """
+    Attaches to an existing shared memory block without taking ownership of it.
+
+    Before Python 3.13 attaching also registers the block with the resource
+    tracker. Worker processes started by multiprocessing share the tracker
+    of the process that created the block, where the registration is already
+    present, so the block is still freed exactly once, by its creator.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
@@ -0,0 +1,180 @@
+"""
+Spectator Module for Console Checkers.
+
+This module lets two AIs play each other while the board is shown in the
+console. The game and its searches run without touching the terminal: after
+every move the game thread only publishes an immutable snapshot of the
+position. A separate render thread wakes up at a capped frame rate, draws
+the newest snapshot and skips any older ones it missed. Slow terminal
+output therefore never holds up a search.
+"""
+
+import time
+import threading
+import bext
+from constants import *
+from board import Board, Piece
+from history import GameHistory, is_irreversible
+from position import Position, code_color, code_is_king
+
+class Renderer:
+    """
+    Draws published board snapshots from a background thread.
+
+    Attributes:
+        fps (float): Maximum frames drawn per second.
+        frames (int): Snapshots drawn so far.
+        dropped (int): Snapshots replaced by a newer one before they were drawn.
+    """
+    def __init__(self, fps=SPECTATOR_FPS):
+        """
+        Initializes the renderer. Call start() to begin drawing.
+
+        Args:
+            fps (float, optional): Maximum frames per second. Defaults to SPECTATOR_FPS.
+        """
+        self.fps = fps
+        self.frames = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = 0
+        self._drawn_version = 0
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='renderer', daemon=True)
+        self._display = None
+        self._shown = None
+
+    def publish(self, position, last_move=None, status=""):
+        """
+        Hands a new snapshot to the render thread. Never blocks on output.
+
+        Args:
+            position (Position): The position to show.
+            last_move (tuple, optional): (start_coords, end_coords) to highlight.
+            status (str, optional): Text shown below the board.
+        """
+        with self._lock:
+            self._snapshot = (position, last_move, status)
+            self._version += 1
+
+    def start(self):
+        """Starts the render thread."""
+        self._thread.start()
+
+    def stop(self):
+        """Draws the last snapshot, if it is not shown yet, and stops the thread."""
+        self._stopping.set()
+        self._thread.join()
+
+    def _run(self):
+        """Render loop: draws the newest snapshot at most fps times per second."""
+        interval = 1 / self.fps
+        while True:
+            frame_start = time.monotonic()
+            self._draw_pending()
+            if self._stopping.is_set():
+                self._draw_pending()
+                return
+            self._stopping.wait(max(0.0, interval - (time.monotonic() - frame_start)))
+
+    def _draw_pending(self):
+        """Draws the newest snapshot if it changed since the last frame."""
+        with self._lock:
+            snapshot, version = self._snapshot, self._version
+        if snapshot is None or version == self._drawn_version:
+            return
+        self.dropped += version - self._drawn_version - 1
+        self._drawn_version = version
+        self.frames += 1
+        self._draw(*snapshot)
+
+    def _draw(self, position, last_move, status):
+        """Draws a snapshot, redrawing only the squares that changed."""
+        if self._display is None:
+            self._display = position.to_board()
+            self._display.last_move = last_move
+            self._display.draw()
+        else:
+            display = self._display
+            changed = {divmod(index, COLS) for index, (old, new) in enumerate(zip(self._shown, position.squares))
+                       if old != new}
+            for row, col in changed:
+                code = position.get(row, col)
+                if code:
+                    piece = Piece(row, col, code_color(code))
+                    piece.king = code_is_king(code)
+                    display.board[row][col] = piece
+                else:
+                    display.board[row][col] = 0
+            if display.last_move:
+                changed.update(display.last_move)
+            display.last_move = last_move
+            if last_move:
+                changed.update(last_move)
+            for row, col in changed:
+                display.update_piece_visual(row, col)
+        self._shown = position.squares
+
+        bext.goto(BOARD_OFFSET_X, 0)
+        print(f"{COLOR_RED}RED: {position.red_left} {KING_SYMBOL if position.red_kings > 0 else ''}   "
+              f"{COLOR_BLACK}BLACK: {position.black_left} {KING_SYMBOL if position.black_kings > 0 else ''}"
+              f"{COLOR_RESET}   ")
+        bext.goto(0, BOARD_OFFSET_Y + ROWS * 2 + 2)
+        print(status.ljust(80), flush=True)
+
+def watch_game(red_engine, black_engine, renderer, move_delay=0.0, max_moves=200):
+    """
+    Plays one engine-vs-engine game, publishing a snapshot after every move.
+
+    Args:
+        red_engine (Engine): The registry engine playing RED.
+        black_engine (Engine): The engine playing BLACK.
+        renderer (Renderer): Receives the snapshots.
+        move_delay (float, optional): Pause after each move, to make fast
+            games watchable. Defaults to 0.
+        max_moves (int, optional): Moves after which the game is drawn. Defaults to 200.
+
+    Returns:
+        str: 'RED', 'BLACK' or 'DRAW'.
+    """
+    board = Board()
+    turn = RED
+    history = GameHistory()
+    history.push(board.position_key(turn), True)
+    position = Position.from_board(board, turn)
+    renderer.publish(position, None, "RED to move")
+    last_move = None
+
+    for ply in range(max_moves):
+        name = "RED" if turn == RED else "BLACK"
+        engine = red_engine if turn == RED else black_engine
+        start = time.time()
+        move_details = engine.choose_move(position, history=history)
+        elapsed = time.time() - start
+        if move_details is None:
+            result = "BLACK" if turn == RED else "RED"
+            renderer.publish(position, last_move, f"{name} has no moves. {result} WINS!")
+            return result
+
+        irreversible = is_irreversible(board, move_details)
+        board.apply_move(move_details, visual=False)
+        last_move = (tuple(move_details[0]), tuple(move_details[1]))
+        turn = BLACK if turn == RED else RED
+        history.push(board.position_key(turn), irreversible)
+        position = Position.from_board(board, turn)
+
+        winner = board.winner()
+        if winner is not None:
+            result = "RED" if winner == RED else "BLACK"
+            renderer.publish(position, last_move, f"{result} WINS!")
+            return result
+        if history.is_draw():
+            renderer.publish(position, last_move, "DRAW! The position repeated or no progress was made.")
+            return "DRAW"
+        renderer.publish(position, last_move, f"Move {ply + 1}: {name} searched {elapsed:.2f}s")
+        if move_delay:
+            time.sleep(move_delay)
+
+    renderer.publish(position, last_move, f"DRAW after {max_moves} moves.")
+    return "DRAW"
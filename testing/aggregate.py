@@ -0,0 +1,303 @@
+"""
+Benchmark Aggregation for Console Checkers AI.
+
+This module summarizes benchmark results in a single streaming pass over
+the JSONL files written by benchmark.py. Memory use does not grow with the
+number of games or moves: win counts are kept per engine and color, and
+move latencies go into log-bucketed quantile sketches (as in DDSketch)
+instead of lists of samples. That makes it cheap enough to run on logs with
+millions of moves in CI, where loading everything into analysis.ipynb is not
+an option.
+"""
+
+import sys
+import os
+import json
+import math
+import argparse
+from bisect import bisect_right
+
+# Game phases by ply (move_count): name and first ply of the phase.
+PHASES = (("opening", 0), ("middlegame", 20), ("endgame", 60))
+PHASE_STARTS = [first_ply for _, first_ply in PHASES]
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Quantile estimates are within this fraction of the true value.
+RELATIVE_ACCURACY = 0.01
+
+class LatencySketch:
+    """
+    Streaming quantile sketch of move durations.
+
+    Durations are counted in buckets whose bounds grow geometrically by a
+    factor gamma = (1 + a) / (1 - a), where a is the relative accuracy. Any
+    quantile can then be read back within a relative error of a, and the
+    number of buckets only grows with the logarithm of the spread between
+    the fastest and slowest move. Sketches with the same accuracy can be
+    merged, so one sketch per engine and phase is enough to report every
+    grouping.
+
+    Attributes:
+        count (int): Number of durations added.
+        total (float): Sum of the durations in seconds.
+        maximum (float): Largest duration in seconds.
+        buckets (dict): Bucket index -> count of positive durations.
+        zeros (int): Count of durations that are zero or negative.
+    """
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            relative_accuracy (float, optional): Relative error bound. Defaults to RELATIVE_ACCURACY.
+        """
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inverse_log_gamma = 1 / math.log(self.gamma)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.buckets = {}
+        self.zeros = 0
+
+    def add(self, duration):
+        """Adds one duration in seconds."""
+        self.count += 1
+        self.total += duration
+        if duration > self.maximum:
+            self.maximum = duration
+        if duration > 0:
+            index = math.ceil(math.log(duration) * self._inverse_log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        else:
+            self.zeros += 1
+
+    def merge(self, other):
+        """Adds the counts of another sketch with the same accuracy."""
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+        self.zeros += other.zeros
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, p):
+        """
+        Estimates a quantile.
+
+        Args:
+            p (float): The quantile, between 0 and 1.
+
+        Returns:
+            float or None: The estimate in seconds, or None if the sketch is empty.
+        """
+        if self.count == 0:
+            return None
+        rank = p * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint (in relative terms) of the bucket (gamma^(i-1), gamma^i].
+                return min(2 * self.gamma ** index / (self.gamma + 1), self.maximum)
+        return self.maximum
+
+    def summary(self, quantiles=QUANTILES):
+        """
+        Returns the statistics in milliseconds.
+
+        Args:
+            quantiles (tuple, optional): Quantiles to report. Defaults to QUANTILES.
+
+        Returns:
+            dict: moves, mean_ms, p50_ms/p90_ms/... and max_ms.
+        """
+        data = {"moves": self.count, "mean_ms": self.total / self.count * 1000 if self.count else None}
+        for p in quantiles:
+            value = self.quantile(p)
+            data[f"p{p * 100:g}_ms"] = value * 1000 if value is not None else None
+        data["max_ms"] = self.maximum * 1000 if self.count else None
+        return data
+
+def phase_of(ply):
+    """Returns the name of the game phase a ply belongs to."""
+    return PHASES[max(bisect_right(PHASE_STARTS, ply) - 1, 0)][0]
+
+def iter_games(paths):
+    """
+    Yields the games of benchmark result files one at a time.
+
+    JSONL files are streamed line by line and a truncated last line is
+    skipped. A legacy benchmark_results.json list is loaded whole. A path
+    of ``-`` reads JSONL from stdin.
+
+    Args:
+        paths (list): Result file paths.
+
+    Yields:
+        dict: One game as written by benchmark.play_game.
+    """
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path)
+        try:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            if first == '[':
+                yield from json.loads(first + f.read())
+                continue
+            pending = first
+            for line in f:
+                line, pending = pending + line, ''
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping malformed line in {path}", file=sys.stderr)
+            if pending.strip():
+                try:
+                    yield json.loads(pending)
+                except json.JSONDecodeError:
+                    print(f"Skipping malformed line in {path}", file=sys.stderr)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+class Aggregator:
+    """
+    Accumulates win counts and latency sketches over a stream of games.
+
+    Attributes:
+        games (int): Number of games seen.
+        results (dict): (engine, color) -> {"win", "draw", "loss"} counts.
+        sketches (dict): (engine, phase) -> LatencySketch of that engine's moves.
+    """
+    def __init__(self):
+        """Initializes an empty aggregator."""
+        self.games = 0
+        self.results = {}
+        self.sketches = {}
+
+    def add_game(self, game):
+        """
+        Adds one game.
+
+        Args:
+            game (dict): A game as written by benchmark.play_game.
+        """
+        self.games += 1
+        engines = {"RED": game["red_ai"], "BLACK": game["black_ai"]}
+        for color, engine in engines.items():
+            counts = self.results.setdefault((engine, color), {"win": 0, "draw": 0, "loss": 0})
+            if game["winner"] == "DRAW":
+                counts["draw"] += 1
+            elif game["winner"] == color:
+                counts["win"] += 1
+            else:
+                counts["loss"] += 1
+
+        sketches = self.sketches
+        for move in game["moves"]:
+            key = (engines[move["turn"]], phase_of(move["move_count"]))
+            sketch = sketches.get(key)
+            if sketch is None:
+                sketch = sketches[key] = LatencySketch()
+            sketch.add(move["duration"])
+
+    def latency(self, engine=None, phase=None):
+        """
+        Merges the sketches of one engine and/or phase.
+
+        Args:
+            engine (str, optional): Only moves of this engine.
+            phase (str, optional): Only moves in this phase.
+
+        Returns:
+            LatencySketch: The merged sketch.
+        """
+        merged = LatencySketch()
+        for (sketch_engine, sketch_phase), sketch in self.sketches.items():
+            if engine in (None, sketch_engine) and phase in (None, sketch_phase):
+                merged.merge(sketch)
+        return merged
+
+    def report(self):
+        """
+        Returns the aggregated results.
+
+        Returns:
+            dict: games, win_rates (list of per engine and color rows) and
+            latency (overall, by_phase and by_engine summaries).
+        """
+        win_rates = []
+        for (engine, color), counts in sorted(self.results.items()):
+            games = sum(counts.values())
+            win_rates.append({
+                "engine": engine,
+                "color": color,
+                "games": games,
+                **counts,
+                "win_rate": counts["win"] / games,
+                "score": (counts["win"] + counts["draw"] / 2) / games,
+            })
+        return {
+            "games": self.games,
+            "win_rates": win_rates,
+            "latency": {
+                "overall": self.latency().summary(),
+                "by_phase": {phase: self.latency(phase=phase).summary() for phase, _ in PHASES},
+                "by_engine": {engine: self.latency(engine=engine).summary()
+                              for engine in sorted({engine for engine, _ in self.sketches})},
+            },
+        }
+
+def format_report(report):
+    """
+    Formats an aggregated report as text.
+
+    Args:
+        report (dict): The output of Aggregator.report.
+
+    Returns:
+        str: The report.
+    """
+    lines = [f"Games: {report['games']}", ""]
+    lines.append(f"{'Engine':<30}{'Color':<7}{'Games':>7}{'W':>7}{'D':>7}{'L':>7}{'Win%':>8}{'Score%':>8}")
+    for row in report["win_rates"]:
+        lines.append(f"{row['engine']:<30}{row['color']:<7}{row['games']:>7}{row['win']:>7}{row['draw']:>7}"
+                     f"{row['loss']:>7}{row['win_rate'] * 100:>8.1f}{row['score'] * 100:>8.1f}")
+
+    latency = report["latency"]
+    columns = [key for key in latency["overall"] if key.endswith("_ms")]
+    lines.append("")
+    lines.append(f"{'Latency (ms)':<30}{'Moves':>9}" + "".join(f"{key[:-3]:>10}" for key in columns))
+    groups = [("overall", latency["overall"])]
+    groups += [(f"phase {phase}", stats) for phase, stats in latency["by_phase"].items()]
+    groups += [(f"engine {engine}", stats) for engine, stats in latency["by_engine"].items()]
+    for name, stats in groups:
+        values = "".join(f"{stats[key]:>10.1f}" if stats[key] is not None else f"{'-':>10}" for key in columns)
+        lines.append(f"{name:<30}{stats['moves']:>9}{values}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize benchmark results in one streaming pass.")
+    parser.add_argument("paths", nargs="*", default=["benchmark_results.jsonl"],
+                        help="JSONL result files, '-' for stdin (default benchmark_results.jsonl)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    missing = [path for path in args.paths if path != '-' and not os.path.exists(path)]
+    if missing:
+        parser.error(f"results file not found: {missing[0]}")
+
+    aggregator = Aggregator()
+    for game in iter_games(args.paths):
+        aggregator.add_game(game)
+    report = aggregator.report()
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+if __name__ == "__main__":
+    main()
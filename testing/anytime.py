@@ -0,0 +1,150 @@
+"""
+Anytime Search Report for Console Checkers AI.
+
+This module measures what the search does at its time limit. The overshoot
+is how far past the limit a clock-stopped search returns. The quality gain
+compares the move the search plays, which may come from its interrupted last
+iteration, with the move of the last completed iteration, which it played
+before anytime search. Both moves are checked against the known best moves
+of a tactical suite and against a deeper fixed-depth reference search.
+
+Both moves come from the same search, so the comparison has no timing noise:
+
+    python testing/anytime.py --times 0.05 0.1 0.2 0.5 --ref-depth 6
+"""
+
+import sys
+import os
+import json
+import argparse
+from collections import namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import BLACK
+from move_cache import MoveCache
+from position import Position, move_to_text
+from testing.tactics import DEFAULT_SUITE, load_suite, normalize_move
+from tt import TranspositionTable
+import ai
+
+Sample = namedtuple('Sample', ['id', 'time_limit', 'elapsed', 'depth', 'partial', 'move', 'previous',
+                               'best_moves', 'reference'])
+Sample.__doc__ = """One timed search: position id, time limit, seconds used, completed depth,
+whether the move came from the interrupted iteration, the move played, the
+move of the last completed iteration, the suite's best moves and the move
+of the reference search (None without one). Moves are normalized PDN texts."""
+
+def _text(move_details):
+    """Returns a move as normalized PDN text, or None."""
+    return normalize_move(move_to_text(move_details)) if move_details else None
+
+def reference_move(entry, depth, seed=0):
+    """
+    Searches a suite position to a fixed depth without a clock.
+
+    Args:
+        entry (TacticalPosition): The position.
+        depth (int): Depth of the reference search.
+        seed (int, optional): Seed for move shuffling. Defaults to 0.
+
+    Returns:
+        str: The reference move as normalized PDN text, or None.
+    """
+    position = Position.from_fen(entry.fen)
+    context = ai.SearchContext(seed=seed, cache=MoveCache(), tt=TranspositionTable())
+    return _text(ai.search(position.to_board(), position.turn == BLACK, context, depth).move)
+
+def measure(entry, time_limit, seed=0, reference=None):
+    """
+    Runs one timed search and records the played and the discarded move.
+
+    Args:
+        entry (TacticalPosition): The position.
+        time_limit (float): Seconds for the search.
+        seed (int, optional): Seed for move shuffling. Defaults to 0.
+        reference (str, optional): Move of the reference search. Defaults to None.
+
+    Returns:
+        Sample: The measurement.
+    """
+    position = Position.from_fen(entry.fen)
+    iterations = []
+    context = ai.SearchContext(time_limit, seed=seed, cache=MoveCache(), tt=TranspositionTable(),
+                               settings=ai.SearchSettings(anytime=True))
+    result = ai.search(position.to_board(), position.turn == BLACK, context, callback=iterations.append)
+    previous = _text(iterations[-1].move) if iterations else None
+    return Sample(entry.id, time_limit, result.elapsed, result.depth, result.partial, _text(result.move),
+                  previous, entry.best_moves, reference)
+
+def percentile(values, fraction):
+    """Returns the value below which the given fraction of sorted values lie."""
+    if not values:
+        return float('nan')
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def format_report(samples):
+    """
+    Builds the quality and overshoot tables, one row per time limit.
+
+    Args:
+        samples (list): Sample per search.
+
+    Returns:
+        str: The report.
+    """
+    lines = [f"{'limit':>6} {'n':>4} {'partial':>8} {'changed':>8} {'bm before':>10} {'bm after':>9}"
+             f" {'ref before':>11} {'ref after':>10}"]
+    limits = sorted({s.time_limit for s in samples})
+    for limit in limits:
+        group = [s for s in samples if s.time_limit == limit]
+        partial = [s for s in group if s.partial]
+        changed = [s for s in partial if s.move != s.previous]
+        bm_before = sum(s.previous in s.best_moves for s in group)
+        bm_after = sum(s.move in s.best_moves for s in group)
+        with_ref = [s for s in group if s.reference is not None]
+        ref_before = sum(s.previous == s.reference for s in with_ref)
+        ref_after = sum(s.move == s.reference for s in with_ref)
+        ref_text = (f" {f'{ref_before}/{len(with_ref)}':>11} {f'{ref_after}/{len(with_ref)}':>10}"
+                    if with_ref else f" {'-':>11} {'-':>10}")
+        lines.append(f"{limit:>6g} {len(group):>4} {len(partial):>8} {len(changed):>8}"
+                     f" {f'{bm_before}/{len(group)}':>10} {f'{bm_after}/{len(group)}':>9}{ref_text}")
+
+    lines.append("")
+    lines.append("Overshoot past the limit in ms (clock-stopped searches only)")
+    lines.append(f"{'limit':>6} {'n':>4} {'mean':>7} {'p50':>7} {'p90':>7} {'p99':>7} {'max':>7}")
+    for limit in limits:
+        overshoot = sorted((s.elapsed - s.time_limit) * 1000 for s in samples
+                           if s.time_limit == limit and s.elapsed >= s.time_limit)
+        mean = sum(overshoot) / len(overshoot) if overshoot else float('nan')
+        lines.append(f"{limit:>6g} {len(overshoot):>4} {mean:>7.2f} {percentile(overshoot, 0.5):>7.2f}"
+                     f" {percentile(overshoot, 0.9):>7.2f} {percentile(overshoot, 0.99):>7.2f}"
+                     f" {percentile(overshoot, 1.0):>7.2f}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the move quality gained by anytime search and the clock overshoot.")
+    parser.add_argument("suite", nargs="?", default=DEFAULT_SUITE, help="suite file (default: testing/tactics.epd)")
+    parser.add_argument("--times", type=float, nargs="+", default=[0.05, 0.1, 0.2, 0.5],
+                        help="time limits per search in seconds (default 0.05 0.1 0.2 0.5)")
+    parser.add_argument("--ref-depth", type=int, default=6, help="depth of the reference search, 0 to skip (default 6)")
+    parser.add_argument("--seed", type=int, default=0, help="move shuffle seed (default 0)")
+    parser.add_argument("--filter", help="only run positions whose id contains this text")
+    parser.add_argument("--json", action="store_true", help="print the samples as JSON")
+    args = parser.parse_args()
+
+    suite = load_suite(args.suite)
+    if args.filter:
+        suite = [entry for entry in suite if args.filter in entry.id]
+    references = {entry.id: reference_move(entry, args.ref_depth, args.seed) if args.ref_depth else None
+                  for entry in suite}
+    samples = [measure(entry, time_limit, args.seed, references[entry.id])
+               for time_limit in args.times for entry in suite]
+
+    if args.json:
+        print(json.dumps([s._asdict() for s in samples], indent=2))
+    else:
+        print(format_report(samples))
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,11 @@ Benchmark Module for Console Checkers AI.
 This module provides tools to benchmark the performance of the AI algorithms.
 It runs games between different AI versions or configurations and records
 metrics such as win rates, move times, and game lengths.
+
+The two engines are given as registry spec strings (see registry.py) and
+default to ``old`` and ``new``, the baseline minimax at depth 3 against the
+iterative deepening search at 0.5 seconds per move. In phase 1 the first
+engine plays RED, in phase 2 it plays BLACK.
 """
 
 import sys
@@ -11,58 +16,75 @@ import os
 import time
 import json
 import random
+import argparse
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from board import Board
 from constants import RED, BLACK
-from testing import old_ai
-from testing import new_ai
+from history import GameHistory, is_irreversible
+from position import Position
+from profiling import add_profile_arguments, profiler_from_args
+from registry import make_engine
+from testing.slow_moves import add_slow_move_arguments, recorder_from_args
 
-def play_game(red_ai_func, black_ai_func, game_id):
+def play_game(red_engine, black_engine, game_id, profiler=None, profile_move=None, phase=None, recorder=None,
+              match=None):
     """
-    Simulates a single game between two AI functions.
+    Simulates a single game between two engines.
 
     Args:
-        red_ai_func (function): The AI function for the RED player.
-        black_ai_func (function): The AI function for the BLACK player.
+        red_engine (Engine): The engine for the RED player.
+        black_engine (Engine): The engine for the BLACK player.
         game_id (int): A unique identifier for the game.
+        profiler (SearchProfiler, optional): Profiles the AI searches when given.
+        profile_move (int, optional): Only profile the search at this move count.
+        phase (int, optional): Benchmark phase recorded with the game. Defaults to None.
+        recorder (SlowMoveRecorder, optional): Receives every move to capture slow ones.
+        match (dict, optional): Settings of the match, see open_results. Defaults to None.
 
     Returns:
         dict: A dictionary containing game statistics:
             - game_id: The game identifier.
             - winner: The color of the winner ('RED', 'BLACK', or 'DRAW').
+              A game is drawn by repetition, by the no-progress rule, or after 200 moves.
             - moves: A list of dictionaries detailing each move (turn, duration, move_count).
-            - red_ai: Name of the RED AI function.
-            - black_ai: Name of the BLACK AI function.
+            - red_ai: Spec of the RED engine.
+            - black_ai: Spec of the BLACK engine.
+            - phase: The benchmark phase.
+            - match: The match settings.
     """
+    for engine in (red_engine, black_engine):
+        engine.new_game()
     board = Board()
     turn = RED
     move_count = 0
+    history = GameHistory()
+    history.push(board.position_key(turn), True)
     game_data = {
         "game_id": game_id,
         "winner": None,
         "moves": [],
-        "red_ai": red_ai_func.__name__,
-        "black_ai": black_ai_func.__name__
+        "red_ai": red_engine.spec,
+        "black_ai": black_engine.spec,
+        "phase": phase,
+        "match": match
     }
     
     while True:
+        engine = red_engine if turn == RED else black_engine
+        position = Position.from_board(board, turn)
         start_time = time.time()
         
-        if turn == RED:
-            if red_ai_func == old_ai.minimax:
-                _, move_details = old_ai.minimax(board, 3, float('-inf'), float('inf'), False)
-            else:
-                move_details = new_ai.iterative_deepening(board, False, time_limit=0.5)
+        if profiler is not None and profile_move in (None, move_count):
+            move_details = profiler.run(engine.choose_move, position, history=history)
         else:
-            if black_ai_func == old_ai.minimax:
-                _, move_details = old_ai.minimax(board, 3, float('-inf'), float('inf'), True)
-            else:
-                move_details = new_ai.iterative_deepening(board, True, time_limit=0.5)
+            move_details = engine.choose_move(position, history=history)
         
         end_time = time.time()
         duration = end_time - start_time
+        if recorder is not None:
+            recorder.check(engine, position, duration, move_details, history, move_count, f"benchmark game {game_id}")
         
         if move_details is None:
             winner = BLACK if turn == RED else RED
@@ -70,6 +92,7 @@ def play_game(red_ai_func, black_ai_func, game_id):
             break
             
         start_coords, end_coords, skipped_coords = move_details
+        irreversible = is_irreversible(board, move_details)
         
         game_data["moves"].append({
             "turn": "RED" if turn == RED else "BLACK",
@@ -95,8 +118,9 @@ def play_game(red_ai_func, black_ai_func, game_id):
             
         turn = BLACK if turn == RED else RED
         move_count += 1
+        history.push(board.position_key(turn), irreversible)
         
-        if move_count > 200:
+        if history.is_draw() or move_count > 200:
             game_data["winner"] = "DRAW"
             break
             
@@ -125,28 +149,155 @@ def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, lengt
     if iteration == total: 
         print()
 
+def load_results(path):
+    """
+    Reads the finished games from a JSONL results file.
+
+    A truncated last line, left behind when a run is killed mid-write, is
+    ignored.
+
+    Args:
+        path (str): The results file.
+
+    Returns:
+        list: One dictionary per finished game.
+    """
+    games = []
+    if not os.path.exists(path):
+        return games
+    with open(path) as f:
+        for line in f:
+            try:
+                games.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return games
+
+def open_results(path, fresh=False, match=None):
+    """
+    Opens a JSONL results file for appending and lists the games already in it.
+
+    Any partial line at the end of the file is cut off first, so appended
+    games always start on a line of their own. Game ids only identify a game
+    within one match, so every record carries the settings of its match, and
+    a file written by a different match is not resumed.
+
+    Args:
+        path (str): The results file.
+        fresh (bool, optional): Discard existing results. Defaults to False.
+        match (dict, optional): Settings of the match being played, stored as
+            the "match" field of each record. Defaults to None (not checked).
+
+    Returns:
+        tuple: (file object, set of finished game ids).
+
+    Raises:
+        ValueError: If a record in the file belongs to a different match.
+    """
+    if fresh or not os.path.exists(path):
+        return open(path, 'w'), set()
+
+    finished = set()
+    valid_bytes = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                game = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break
+            if not line.endswith(b"\n"):
+                break
+            if match is not None and game.get("match") != match:
+                raise ValueError(f"{path} holds games of another match ({game.get('match')}) instead of {match}; "
+                                 "pass --fresh to overwrite it or choose another --output")
+            finished.add(game["game_id"])
+            valid_bytes += len(line)
+
+    f = open(path, 'r+')
+    f.truncate(valid_bytes)
+    f.seek(valid_bytes)
+    return f, finished
+
+def run_phase(title, red_engine, black_engine, first_game_id, games, results_file, finished, profiler, profile_move,
+              phase=None, recorder=None, match=None):
+    """
+    Plays one phase of the benchmark, streaming each game to the results file.
+
+    Games whose id is already in finished are skipped, which resumes an
+    interrupted run.
+
+    Args:
+        title (str): Heading printed before the phase.
+        red_engine (Engine): The engine for the RED player.
+        black_engine (Engine): The engine for the BLACK player.
+        first_game_id (int): Id of the first game of the phase.
+        games (int): Number of games in the phase.
+        results_file (file): Open JSONL file the games are appended to.
+        finished (set): Ids of games already recorded.
+        profiler (SearchProfiler): Profiler for the AI searches, or None.
+        profile_move (int): Move count to profile, or None for all.
+        phase (int, optional): Phase number recorded with each game. Defaults to None.
+        recorder (SlowMoveRecorder, optional): Captures slow moves. Defaults to None.
+        match (dict, optional): Settings of the match, see open_results. Defaults to None.
+    """
+    print(title)
+    done = sum(1 for game_id in range(first_game_id, first_game_id + games) if game_id in finished)
+    if done:
+        print(f"Resuming: {done} of {games} games already recorded.")
+    print_progress_bar(done, games, prefix='Progress:', suffix='Complete', length=50)
+    for game_id in range(first_game_id, first_game_id + games):
+        if game_id in finished:
+            continue
+        data = play_game(red_engine, black_engine, game_id, profiler, profile_move, phase, recorder, match)
+        results_file.write(json.dumps(data) + "\n")
+        results_file.flush()
+        done += 1
+        print_progress_bar(done, games, prefix='Progress:', suffix='Complete', length=50)
+
 def main():
-    results = []
-    total_games_per_phase = 50
-    
-    print("Starting Phase 1: Old AI (RED) vs New AI (BLACK)")
-    print_progress_bar(0, total_games_per_phase, prefix='Progress:', suffix='Complete', length=50)
-    for i in range(total_games_per_phase):
-        data = play_game(old_ai.minimax, new_ai.iterative_deepening, i+1)
-        results.append(data)
-        print_progress_bar(i + 1, total_games_per_phase, prefix='Progress:', suffix='Complete', length=50)
-        
-    print("Starting Phase 2: New AI (RED) vs Old AI (BLACK)")
-    print_progress_bar(0, total_games_per_phase, prefix='Progress:', suffix='Complete', length=50)
-    for i in range(total_games_per_phase):
-        data = play_game(new_ai.iterative_deepening, old_ai.minimax, i+51)
-        results.append(data)
-        print_progress_bar(i + 1, total_games_per_phase, prefix='Progress:', suffix='Complete', length=50)
-        
-    with open('benchmark_results.json', 'w') as f:
-        json.dump(results, f, indent=4)
+    parser = argparse.ArgumentParser(description="Benchmark two engines against each other, by default the old AI against the new AI.")
+    parser.add_argument("--engines", nargs=2, metavar=("BASELINE", "CANDIDATE"), default=["old", "new"],
+                        help="engine specs as in registry.py (default: old new)")
+    parser.add_argument("--games", type=int, default=50, help="games per phase (default 50)")
+    parser.add_argument("--output", default='benchmark_results.jsonl', help="JSONL results file, one game per line")
+    parser.add_argument("--fresh", action="store_true", help="discard existing results instead of resuming")
+    add_profile_arguments(parser)
+    add_slow_move_arguments(parser)
+    args = parser.parse_args()
+    try:
+        baseline, candidate = (make_engine(spec) for spec in args.engines)
+    except ValueError as e:
+        parser.error(str(e))
+    profiler = profiler_from_args(args)
+    recorder = recorder_from_args(args)
+
+    total_games_per_phase = args.games
+    match = {"engines": [baseline.spec, candidate.spec], "games": total_games_per_phase}
+    try:
+        results_file, finished = open_results(args.output, args.fresh, match)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        with results_file:
+            run_phase(f"Starting Phase 1: {baseline.spec} (RED) vs {candidate.spec} (BLACK)", baseline, candidate,
+                      1, total_games_per_phase, results_file, finished, profiler, args.profile_move, 1, recorder,
+                      match)
+            run_phase(f"Starting Phase 2: {candidate.spec} (RED) vs {baseline.spec} (BLACK)", candidate, baseline,
+                      total_games_per_phase + 1, total_games_per_phase, results_file, finished, profiler,
+                      args.profile_move, 2, recorder, match)
+    finally:
+        baseline.close()
+        candidate.close()
+        if recorder is not None:
+            recorder.close()
+            print(f"{recorder.captured} of {recorder.checked} moves captured to {recorder.path}")
         
-    print("Benchmark complete. Results saved to benchmark_results.json")
+    print(f"Benchmark complete. Results saved to {args.output}")
+
+    if profiler is not None:
+        for path in profiler.write(args.profile):
+            print(f"Profile written to {path}")
 
 if __name__ == "__main__":
     main()
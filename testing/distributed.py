@@ -0,0 +1,462 @@
+"""
+Distributed Benchmark for Console Checkers AI.
+
+This module spreads a benchmark match over several machines. A coordinator
+splits the match into game jobs and hands them to worker daemons over TCP.
+Workers play the games with the engine specs of registry.py and send each
+result back as soon as it is finished. The coordinator appends the results
+to a JSONL file in the format of benchmark.py, so aggregate.py and the
+analysis notebook read it unchanged, and a run that is stopped resumes from
+the file.
+
+Workers send a heartbeat every HEARTBEAT_INTERVAL seconds while playing. When
+a worker disconnects or misses heartbeats for --timeout seconds, its job is
+handed to another worker. A result that arrives for a job finished elsewhere
+is ignored.
+
+Messages are JSON objects, one per line:
+
+- worker -> coordinator: ``{"type": "hello", "name": ...}``,
+  ``{"type": "heartbeat"}``, ``{"type": "result", "id": ..., "game": {...}}``
+- coordinator -> worker: ``{"type": "job", "id": ..., "red": ..., "black": ...,
+  "opening_seed": ..., "opening_plies": ..., "max_moves": ...}`` and
+  ``{"type": "done"}`` when no work is left.
+
+The protocol has no authentication. Only listen on trusted networks.
+
+Run a coordinator and workers on other hosts:
+
+    python testing/distributed.py coordinator old ai:time=0.5 --games 200 --host 0.0.0.0
+    python testing/distributed.py worker coordinator-host:5555
+
+or everything on one machine:
+
+    python testing/distributed.py coordinator old ai:time=0.5 --games 20 --local-workers 4
+"""
+
+import sys
+import os
+import json
+import time
+import socket
+import argparse
+import threading
+import multiprocessing
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registry import make_engine
+from testing.benchmark import open_results
+from testing.tournament import play_engine_game, elo_estimate
+
+DEFAULT_PORT = 5555
+HEARTBEAT_INTERVAL = 2.0
+HEARTBEAT_TIMEOUT = 30.0
+
+def send_message(stream, message, lock=None):
+    """
+    Writes one JSON message line and flushes it.
+
+    Args:
+        stream (file): Text stream of a socket.
+        message (dict): The message.
+        lock (threading.Lock, optional): Serializes writers sharing the stream.
+    """
+    line = json.dumps(message) + "\n"
+    if lock is None:
+        stream.write(line)
+        stream.flush()
+        return
+    with lock:
+        stream.write(line)
+        stream.flush()
+
+def receive_message(stream):
+    """
+    Reads one JSON message line.
+
+    Args:
+        stream (file): Text stream of a socket.
+
+    Returns:
+        dict: The message.
+
+    Raises:
+        ConnectionError: If the peer closed the connection.
+    """
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("connection closed")
+    return json.loads(line)
+
+def make_jobs(red_spec, black_spec, games, opening_plies=4, max_moves=200, seed=1):
+    """
+    Splits a match into game jobs.
+
+    Games are played in color-swapped pairs from the same random opening, as
+    in tournament.py. Game ids start at 1, like benchmark.py.
+
+    Args:
+        red_spec (str): Engine spec playing RED in odd-numbered games.
+        black_spec (str): Engine spec playing BLACK in odd-numbered games.
+        games (int): Number of games.
+        opening_plies (int, optional): Random opening plies. Defaults to 4.
+        max_moves (int, optional): Moves after which a game is drawn. Defaults to 200.
+        seed (int, optional): Seed of the openings. Defaults to 1.
+
+    Returns:
+        list: Job dictionaries. Each carries the match settings, which are
+        stored with its result (see benchmark.open_results).
+    """
+    match = {"engines": [red_spec, black_spec], "games": games, "opening_plies": opening_plies,
+             "max_moves": max_moves, "seed": seed}
+    jobs = []
+    for index in range(games):
+        red, black = (red_spec, black_spec) if index % 2 == 0 else (black_spec, red_spec)
+        jobs.append({"type": "job", "id": index + 1, "red": red, "black": black,
+                     "opening_seed": seed * 1000003 + index // 2, "opening_plies": opening_plies,
+                     "max_moves": max_moves, "match": match})
+    return jobs
+
+def game_record(job, game, worker):
+    """
+    Converts a played game to a benchmark.py results record.
+
+    Args:
+        job (dict): The job that was played.
+        game (dict): The result of tournament.play_engine_game.
+        worker (str): Name of the worker that played it.
+
+    Returns:
+        dict: game_id, winner, moves, red_ai, black_ai, phase and match as
+              written by benchmark.py, plus opening_seed, plies and worker.
+    """
+    moves = [{"turn": turn, "duration": duration, "move_count": job["opening_plies"] + index}
+             for index, (turn, duration) in enumerate(game["durations"])]
+    return {"game_id": job["id"], "winner": game["winner"], "moves": moves, "red_ai": job["red"],
+            "black_ai": job["black"], "phase": 1 if job["id"] % 2 else 2, "match": job.get("match"),
+            "opening_seed": job["opening_seed"], "plies": game["plies"], "worker": worker}
+
+class Coordinator:
+    """
+    Hands game jobs to connected workers and collects their results.
+
+    Attributes:
+        address (tuple): (host, port) the coordinator listens on.
+        results (list): Records received in this run, in arrival order.
+        reassigned (int): Jobs handed out again after their worker was lost.
+        workers (dict): Worker name -> dict with games, busy seconds and status.
+    """
+    def __init__(self, jobs, results_file, host='127.0.0.1', port=DEFAULT_PORT, timeout=HEARTBEAT_TIMEOUT,
+                 log=print):
+        """
+        Binds the listening socket.
+
+        Args:
+            jobs (list): Jobs still to play.
+            results_file (file): Open JSONL file the records are appended to.
+            host (str, optional): Interface to listen on. Defaults to localhost.
+            port (int, optional): Port, 0 for any free port. Defaults to DEFAULT_PORT.
+            timeout (float, optional): Seconds without a message after which a
+                busy worker is considered dead. Defaults to HEARTBEAT_TIMEOUT.
+            log (function, optional): Receives progress lines. Defaults to print.
+        """
+        self.pending = deque(jobs)
+        self.total = len(jobs)
+        self.results_file = results_file
+        self.timeout = timeout
+        self.log = log
+        self.results = []
+        self.reassigned = 0
+        self.workers = {}
+        self._done_ids = set()
+        self._in_flight = {}
+        self._condition = threading.Condition()
+        self._handlers = []
+        self._server = socket.create_server((host, port))
+        self.address = self._server.getsockname()[:2]
+        self._start = None
+
+    @property
+    def finished(self):
+        """True once every job has a result."""
+        return len(self._done_ids) == self.total
+
+    def serve(self):
+        """Accepts workers in background threads until stop() is called."""
+        self._start = time.time()
+        threading.Thread(target=self._accept_loop, name='coordinator-accept', daemon=True).start()
+
+    def wait(self):
+        """Blocks until every job has a result."""
+        with self._condition:
+            while not self.finished:
+                self._condition.wait(1.0)
+
+    def stop(self, grace=5.0):
+        """
+        Stops accepting workers and gives connected ones time to receive done.
+
+        Args:
+            grace (float, optional): Seconds to wait for each connection to close. Defaults to 5.
+        """
+        self._server.close()
+        for handler in self._handlers:
+            handler.join(grace)
+
+    def _accept_loop(self):
+        """Starts a handler thread for every incoming connection."""
+        while True:
+            try:
+                connection, peer = self._server.accept()
+            except OSError:
+                return
+            handler = threading.Thread(target=self._handle, args=(connection, peer), daemon=True)
+            self._handlers.append(handler)
+            handler.start()
+
+    def _next_job(self):
+        """Waits for a job to hand out. Returns None when all jobs are finished."""
+        with self._condition:
+            while True:
+                while self.pending and self.pending[0]["id"] in self._done_ids:
+                    self.pending.popleft()
+                if self.pending:
+                    return self.pending.popleft()
+                if self.finished:
+                    return None
+                self._condition.wait(1.0)
+
+    def _handle(self, connection, peer):
+        """Serves one worker connection: hands out jobs until none are left."""
+        stream = connection.makefile('rw')
+        name = f"{peer[0]}:{peer[1]}"
+        job = None
+        try:
+            connection.settimeout(self.timeout)
+            hello = receive_message(stream)
+            name = hello.get("name") or name
+            with self._condition:
+                self.workers[name] = {"games": 0, "busy": 0.0, "status": "connected"}
+            self.log(f"Worker {name} connected")
+            while True:
+                job = self._next_job()
+                if job is None:
+                    send_message(stream, {"type": "done"})
+                    break
+                started = time.time()
+                with self._condition:
+                    self._in_flight[job["id"]] = name
+                send_message(stream, job)
+                while True:
+                    message = receive_message(stream)
+                    if message.get("type") == "result" and message.get("id") == job["id"]:
+                        break
+                self._record(job, message["game"], name, time.time() - started)
+                job = None
+        except (OSError, ConnectionError, ValueError) as e:
+            self.log(f"Worker {name} lost ({e or type(e).__name__})")
+        finally:
+            with self._condition:
+                if name in self.workers:
+                    self.workers[name]["status"] = "finished" if job is None else "lost"
+                if job is not None:
+                    self._in_flight.pop(job["id"], None)
+                    if job["id"] not in self._done_ids:
+                        self.pending.appendleft(job)
+                        self.reassigned += 1
+                        self.log(f"Game {job['id']} requeued")
+                self._condition.notify_all()
+            connection.close()
+
+    def _record(self, job, game, worker, seconds):
+        """Stores a result unless the job was already finished by another worker."""
+        record = game_record(job, game, worker)
+        with self._condition:
+            self._in_flight.pop(job["id"], None)
+            stats = self.workers[worker]
+            stats["games"] += 1
+            stats["busy"] += seconds
+            if job["id"] in self._done_ids:
+                return
+            self._done_ids.add(job["id"])
+            self.results.append(record)
+            self.results_file.write(json.dumps(record) + "\n")
+            self.results_file.flush()
+            self._condition.notify_all()
+            done = len(self._done_ids)
+        rate = done / max(time.time() - self._start, 1e-9) * 60
+        self.log(f"[{done}/{self.total}] game {job['id']}: {record['red_ai']} (RED) vs {record['black_ai']} (BLACK), "
+                 f"{record['winner']} in {record['plies']} plies on {worker}; {rate:.1f} games/min")
+
+    def report(self):
+        """
+        Builds the summary of the run: throughput, workers and match score.
+
+        Returns:
+            str: The report.
+        """
+        elapsed = time.time() - self._start
+        games = len(self.results)
+        moves = sum(len(record["moves"]) for record in self.results)
+        lines = [f"{games} games, {moves} engine moves in {elapsed:.1f}s: "
+                 f"{games / elapsed * 60:.1f} games/min, {moves / elapsed:.1f} moves/s; {self.reassigned} jobs reassigned",
+                 "",
+                 f"{'worker':<30} {'games':>6} {'busy s':>9} {'games/min':>10}  status"]
+        for name, stats in sorted(self.workers.items()):
+            per_minute = stats["games"] / stats["busy"] * 60 if stats["busy"] else 0.0
+            lines.append(f"{name:<30} {stats['games']:>6} {stats['busy']:>9.1f} {per_minute:>10.1f}  {stats['status']}")
+
+        engines = sorted({record["red_ai"] for record in self.results} | {record["black_ai"] for record in self.results})
+        if len(engines) == 2:
+            first = engines[0]
+            wins = sum(1 for r in self.results if r["winner"] != "DRAW"
+                       and (r["red_ai"] if r["winner"] == "RED" else r["black_ai"]) == first)
+            draws = sum(1 for r in self.results if r["winner"] == "DRAW")
+            losses = games - wins - draws
+            elo, error = elo_estimate(wins, draws, losses)
+            lines.append("")
+            lines.append(f"{first} vs {engines[1]}: +{wins} ={draws} -{losses}, elo {elo:.1f} +- {error:.1f}")
+        return "\n".join(lines)
+
+def run_worker(address, name=None, heartbeat=HEARTBEAT_INTERVAL, retry=10.0):
+    """
+    Connects to a coordinator and plays jobs until it sends done.
+
+    Args:
+        address (tuple): (host, port) of the coordinator.
+        name (str, optional): Worker name. Defaults to host name and process id.
+        heartbeat (float, optional): Seconds between heartbeats. Defaults to HEARTBEAT_INTERVAL.
+        retry (float, optional): Seconds to keep retrying the connection. Defaults to 10.
+
+    Returns:
+        int: Number of games played.
+
+    Raises:
+        OSError: If the coordinator cannot be reached, or the connection
+            fails while a result is sent.
+    """
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    deadline = time.time() + retry
+    while True:
+        try:
+            connection = socket.create_connection(address)
+            break
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.5)
+
+    stream = connection.makefile('rw')
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def beat():
+        while not stopped.wait(heartbeat):
+            try:
+                send_message(stream, {"type": "heartbeat"}, lock)
+            except OSError:
+                return
+
+    games = 0
+    try:
+        send_message(stream, {"type": "hello", "name": name}, lock)
+        threading.Thread(target=beat, name='worker-heartbeat', daemon=True).start()
+        while True:
+            try:
+                message = receive_message(stream)
+            except ConnectionError:
+                break
+            if message.get("type") != "job":
+                break
+            game = play_engine_game(message["red"], message["black"], message["opening_seed"],
+                                    message["opening_plies"], message["max_moves"])
+            send_message(stream, {"type": "result", "id": message["id"], "game": game}, lock)
+            games += 1
+    finally:
+        stopped.set()
+        connection.close()
+    return games
+
+def _local_worker(address, name):
+    """Process entry point of a local worker started by the coordinator."""
+    try:
+        run_worker(address, name)
+    except (OSError, ConnectionError):
+        pass
+
+def parse_address(text):
+    """Parses ``host:port`` (or ``host``, using DEFAULT_PORT) into a (host, port) tuple."""
+    host, _, port = text.rpartition(':') if ':' in text else (text, '', '')
+    return host, int(port) if port else DEFAULT_PORT
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a benchmark match on worker daemons across machines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = commands.add_parser("coordinator", help="hand out game jobs and collect the results")
+    coordinator.add_argument("engines", nargs="*", default=["old", "new"],
+                             help="two engine specs as in registry.py (default: old new)")
+    coordinator.add_argument("--games", type=int, default=100, help="games in the match (default 100)")
+    coordinator.add_argument("--output", default='distributed_results.jsonl', help="JSONL results file")
+    coordinator.add_argument("--fresh", action="store_true", help="discard existing results instead of resuming")
+    coordinator.add_argument("--host", default='127.0.0.1', help="interface to listen on (default 127.0.0.1)")
+    coordinator.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default {DEFAULT_PORT})")
+    coordinator.add_argument("--timeout", type=float, default=HEARTBEAT_TIMEOUT,
+                             help=f"seconds of silence before a worker is dropped (default {HEARTBEAT_TIMEOUT:g})")
+    coordinator.add_argument("--local-workers", type=int, default=0, help="worker processes to start on this machine")
+    coordinator.add_argument("--opening-plies", type=int, default=4, help="random plies at the start of each game")
+    coordinator.add_argument("--max-moves", type=int, default=200, help="moves after which a game is drawn")
+    coordinator.add_argument("--seed", type=int, default=1, help="seed of the random openings")
+
+    worker = commands.add_parser("worker", help="play game jobs for a coordinator")
+    worker.add_argument("address", help="coordinator host[:port]")
+    worker.add_argument("--name", help="worker name (default: host name and process id)")
+    worker.add_argument("--retry", type=float, default=10.0, help="seconds to retry connecting (default 10)")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        try:
+            games = run_worker(parse_address(args.address), args.name, retry=args.retry)
+        except OSError as e:
+            sys.exit(f"Worker stopped: {e}")
+        print(f"Played {games} games.")
+        return
+
+    if len(args.engines) != 2:
+        parser.error("exactly two engine specs are required")
+    for spec in args.engines:
+        try:
+            make_engine(spec).close()
+        except ValueError as e:
+            parser.error(str(e))
+
+    jobs = make_jobs(args.engines[0], args.engines[1], args.games, args.opening_plies, args.max_moves, args.seed)
+    try:
+        results_file, finished = open_results(args.output, args.fresh, jobs[0]["match"] if jobs else None)
+    except ValueError as e:
+        parser.error(str(e))
+    jobs = [job for job in jobs if job["id"] not in finished]
+    if finished:
+        print(f"Resuming: {args.games - len(jobs)} of {args.games} games already recorded.")
+
+    server = Coordinator(jobs, results_file, args.host, args.port, args.timeout)
+    server.serve()
+    print(f"Coordinator listening on {server.address[0]}:{server.address[1]} with {len(jobs)} jobs")
+    local = [multiprocessing.Process(target=_local_worker, args=(server.address, f"local-{i + 1}"), daemon=True)
+             for i in range(args.local_workers)]
+    for process in local:
+        process.start()
+    try:
+        server.wait()
+    finally:
+        server.stop()
+        results_file.close()
+        for process in local:
+            process.join(5)
+    print()
+    print(server.report())
+
+if __name__ == "__main__":
+    main()
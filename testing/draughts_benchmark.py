@@ -0,0 +1,86 @@
+"""
+Draughts Benchmark for Console Checkers AI.
+
+This module measures the table-driven draughts engine on both board sizes:
+move generation speed (perft from the starting position) and search speed
+(iterative deepening for a fixed time). With --verify it also checks the
+8x8 move generator against Board by comparing perft counts, and both
+variants against published perft values.
+"""
+
+import sys
+import os
+import time
+import argparse
+from copy import deepcopy
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board
+from constants import RED, BLACK
+from draughts import DraughtsBoard, VARIANTS, perft, search
+from tt import TranspositionTable
+import ai
+
+# Perft counts from the starting position, as published for each variant.
+KNOWN_PERFT = {
+    'english': [7, 49, 302, 1469, 7361, 36768, 179740],
+    'international': [9, 81, 658, 4265, 27117, 167140],
+}
+
+def board_perft(board, color, depth):
+    """Counts perft leaf nodes with the Board move generator of the console game."""
+    moves = board.get_all_valid_moves(color)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    total = 0
+    for piece, move, skipped in moves:
+        child = deepcopy(board)
+        child.apply_move(((piece.row, piece.col), move, [(p.row, p.col) for p in skipped]), visual=False)
+        total += board_perft(child, BLACK if color == RED else RED, depth - 1)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark draughts move generation and search on 8x8 and 10x10.")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS),
+                        help="variants to benchmark (default: all)")
+    parser.add_argument("--perft", type=int, default=6, help="perft depth (default 6)")
+    parser.add_argument("--time", type=float, default=2.0, help="seconds of search per variant (default 2)")
+    parser.add_argument("--verify", action="store_true", help="check perft counts against Board and published values")
+    args = parser.parse_args()
+
+    print(f"{'variant':<15} {'perft':>6} {'leaves':>10} {'leaves/s':>10} {'depth':>6} {'nodes/s':>10}  best move")
+    for name in args.variants:
+        board = DraughtsBoard(name)
+        start = time.perf_counter()
+        leaves = perft(board, args.perft)
+        perft_time = time.perf_counter() - start
+
+        context = ai.SearchContext(args.time, tt=TranspositionTable())
+        result = search(board, context)
+        nps = result.nodes / result.elapsed if result.elapsed > 0 else 0
+        move = board.move_text(result.move) if result.move else '-'
+        print(f"{name:<15} {args.perft:>6} {leaves:>10} {leaves / perft_time:>10.0f} {result.depth:>6} {nps:>10.0f}  {move}")
+
+    if args.verify:
+        failures = 0
+        for name in args.variants:
+            board = DraughtsBoard(name)
+            for depth, expected in enumerate(KNOWN_PERFT[name][:args.perft], 1):
+                count = perft(board, depth)
+                if count != expected:
+                    failures += 1
+                    print(f"{name} perft({depth}) = {count}, expected {expected}")
+        if 'english' in args.variants:
+            board = DraughtsBoard('english')
+            for depth in range(1, min(args.perft, 5) + 1):
+                count, expected = perft(board, depth), board_perft(Board(), RED, depth)
+                if count != expected:
+                    failures += 1
+                    print(f"english perft({depth}) = {count}, Board gives {expected}")
+        print("Perft verified." if not failures else f"{failures} perft mismatches.")
+        if failures:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
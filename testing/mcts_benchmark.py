@@ -0,0 +1,58 @@
+"""
+MCTS Benchmark for Console Checkers AI.
+
+This module compares the throughput of the Monte Carlo Tree Search engine
+with the alpha-beta search under the same time per move. Both engines
+search the positions of a sampled game, and the script reports playouts
+per second for MCTS, nodes per second and completed depth for alpha-beta,
+and how often the two choose the same move. Use tournament.py with the
+``mcts`` and ``ai`` specs to compare playing strength.
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import BLACK, MCTS_PLAYOUT_PLIES
+from mcts import MCTS
+from testing.move_cache_benchmark import sample_game_positions
+import ai
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare MCTS and alpha-beta throughput at equal time per move.")
+    parser.add_argument("--plies", type=int, default=20, help="number of game positions to search")
+    parser.add_argument("--time", type=float, default=0.5, help="seconds per search (default 0.5)")
+    parser.add_argument("--playout-plies", type=int, default=MCTS_PLAYOUT_PLIES, help="random plies per MCTS playout")
+    parser.add_argument("--workers", type=int, default=1, help="MCTS search processes")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the sampled game")
+    args = parser.parse_args()
+
+    positions = sample_game_positions(args.plies, args.seed)
+    player = MCTS(playout_plies=args.playout_plies, seed=args.seed, workers=args.workers)
+    playouts = nodes = depth = same = 0
+    mcts_time = ab_time = 0.0
+    try:
+        for board, turn in positions:
+            result = player.search(board, turn == BLACK, args.time)
+            playouts += result.playouts
+            mcts_time += result.elapsed
+
+            context = ai.SearchContext(args.time, seed=args.seed)
+            ab_result = ai.search(board, turn == BLACK, context)
+            nodes += ab_result.nodes
+            depth += ab_result.depth
+            ab_time += ab_result.elapsed
+            same += result.move == ab_result.move
+    finally:
+        player.close()
+
+    count = len(positions)
+    print(f"{count} positions, {args.time}s per search")
+    print(f"MCTS:       {playouts / mcts_time:>10.0f} playouts/s  ({playouts / count:.0f} per move)")
+    print(f"Alpha-beta: {nodes / ab_time:>10.0f} nodes/s     (depth {depth / count:.1f} on average)")
+    print(f"Same move chosen in {same} of {count} positions")
+
+if __name__ == "__main__":
+    main()
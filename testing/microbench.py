@@ -0,0 +1,226 @@
+"""
+Microbenchmark Suite for Console Checkers.
+
+This module times the hot operations of the engine on a fixed set of
+positions (opening, middlegame and king endgame) and compares the results
+against a committed baseline. Each benchmark reports operations per second
+and the memory allocated per call. The run fails when a benchmark is slower,
+or allocates more, than the baseline by more than a configurable threshold.
+"""
+
+import sys
+import os
+import gc
+import time
+import json
+import argparse
+import platform
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import BLACK, RED
+from position import Position
+import ai
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'microbench_baseline.json')
+
+POSITIONS = {
+    "opening": Position.initial(),
+    "middlegame": Position.from_rows([
+        ".b.b...b",
+        "..b.b.b.",
+        ".b...b..",
+        "b.b.....",
+        ".......r",
+        "r.r.r...",
+        ".r...r.r",
+        "r.r.....",
+    ], turn=RED),
+    "endgame": Position.from_rows([
+        "........",
+        "......B.",
+        ".R......",
+        "........",
+        ".....B..",
+        "..R.....",
+        ".....r..",
+        "........",
+    ], turn=RED),
+}
+
+def build_benchmarks(minimax_depth):
+    """
+    Creates the benchmark callables for every position.
+
+    Args:
+        minimax_depth (int): Depth of the fixed-depth minimax benchmark.
+
+    Returns:
+        list: Tuples (name, func, calls_per_run), where one run of func
+              performs calls_per_run operations.
+    """
+    benchmarks = []
+    for pos_name, position in POSITIONS.items():
+        board = position.to_board()
+        color = position.turn
+        pieces = board.get_all_pieces(color)
+
+        def valid_moves(board=board, pieces=pieces):
+            for piece in pieces:
+                board.get_valid_moves(piece)
+
+        def fixed_minimax(board=board, color=color):
+            ai.minimax(board, minimax_depth, float('-inf'), float('inf'), color == BLACK, ai.SearchContext(seed=0))
+
+        benchmarks.extend([
+            (f"get_valid_moves/{pos_name}", valid_moves, len(pieces)),
+            (f"get_all_valid_moves/{pos_name}", lambda board=board, color=color: board.get_all_valid_moves(color), 1),
+            (f"evaluate_board/{pos_name}", lambda board=board: ai.evaluate_board(board), 1),
+            (f"get_all_moves/{pos_name}", lambda board=board, color=color: ai.get_all_moves(board, color), 1),
+            (f"minimax_d{minimax_depth}/{pos_name}", fixed_minimax, 1),
+        ])
+    return benchmarks
+
+def measure_speed(func, calls_per_run, min_time, repeats):
+    """
+    Measures operations per second, keeping the best of several repeats.
+
+    The number of runs per repeat doubles until one repeat lasts at least
+    min_time, so fast and slow operations are timed equally well.
+
+    Args:
+        func (function): The operation to time.
+        calls_per_run (int): Operations performed by one call of func.
+        min_time (float): Minimum duration of a repeat in seconds.
+        repeats (int): Number of timed repeats.
+
+    Returns:
+        float: Operations per second.
+    """
+    runs = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(runs):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        runs *= 2
+
+    best = elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(runs):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return runs * calls_per_run / best
+
+def measure_memory(func, calls_per_run, samples=5):
+    """
+    Measures the peak memory allocated by one call.
+
+    The first call after tracemalloc starts, and a call that happens to
+    trigger a collection or refill a free list, can differ from a steady
+    call by a third. The garbage is collected and one warm-up call is made
+    before measuring, and the median of several measured calls is kept.
+
+    Args:
+        func (function): The operation to measure.
+        calls_per_run (int): Operations performed by one call of func.
+        samples (int, optional): Measured calls. Defaults to 5.
+
+    Returns:
+        float: Median peak bytes allocated per operation.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peaks = []
+        for _ in range(samples):
+            gc.collect()
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            func()
+            peaks.append(max(tracemalloc.get_traced_memory()[1] - before, 0))
+    finally:
+        tracemalloc.stop()
+    return sorted(peaks)[len(peaks) // 2] / calls_per_run
+
+def compare(results, baseline, threshold):
+    """
+    Compares results against a baseline.
+
+    Args:
+        results (dict): Benchmark name -> {"ops_per_sec", "bytes_per_call"}.
+        baseline (dict): Same layout as results.
+        threshold (float): Allowed relative slowdown or memory growth (0.2 = 20%).
+
+    Returns:
+        list: Descriptions of every regression found.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{name}: {result['ops_per_sec']:.0f} ops/s vs baseline {base['ops_per_sec']:.0f}")
+        if base["bytes_per_call"] and result["bytes_per_call"] > base["bytes_per_call"] * (1 + threshold):
+            regressions.append(f"{name}: {result['bytes_per_call']:.0f} B/call vs baseline {base['bytes_per_call']:.0f}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the engine microbenchmarks and compare against a baseline.")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.3, help="allowed regression as a fraction (default 0.3)")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timed repeat")
+    parser.add_argument("--repeats", type=int, default=5, help="timed repeats per benchmark (best is kept)")
+    parser.add_argument("--depth", type=int, default=3, help="depth of the minimax benchmark")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["benchmarks"]
+
+    results = {}
+    for name, func, calls in build_benchmarks(args.depth):
+        if args.filter not in name:
+            continue
+        results[name] = {
+            "ops_per_sec": measure_speed(func, calls, args.min_time, args.repeats),
+            "bytes_per_call": measure_memory(func, calls),
+        }
+        if not args.json:
+            result = results[name]
+            line = f"{name:<32} {result['ops_per_sec']:>12.1f} ops/s {result['bytes_per_call']:>12.0f} B/call"
+            if name in baseline:
+                change = result["ops_per_sec"] / baseline[name]["ops_per_sec"] - 1
+                line += f"  {change:+.1%}"
+            print(line)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump({"python": platform.python_version(), "benchmarks": baseline}, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions}, indent=4))
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+    elif baseline:
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
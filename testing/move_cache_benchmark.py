@@ -0,0 +1,92 @@
+"""
+Move Cache Benchmark for Console Checkers AI.
+
+This module measures when the LRU move cache pays off. It replays the
+searches of a short game (iterative deepening to a fixed depth at every
+move) once without a cache and once per cache capacity, and reports the
+search time and hit rate of each run, with its speed-up over the uncached run.
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+from copy import deepcopy
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board
+from constants import RED, BLACK
+from move_cache import MoveCache
+import ai
+
+def sample_game_positions(plies, seed):
+    """
+    Plays random legal moves from the start and records each position.
+
+    Args:
+        plies (int): Number of moves to play.
+        seed (int): Seed for the random move choice.
+
+    Returns:
+        list: Tuples (board, turn) for every position reached.
+    """
+    rng = random.Random(seed)
+    board = Board()
+    turn = RED
+    positions = []
+    for _ in range(plies):
+        moves = board.get_all_valid_moves(turn)
+        if not moves or board.winner() is not None:
+            break
+        positions.append((deepcopy(board), turn))
+        piece, move, skipped = rng.choice(moves)
+        board.move(piece, move[0], move[1], visual=False)
+        if skipped:
+            board.remove(skipped, visual=False)
+        turn = BLACK if turn == RED else RED
+    return positions
+
+def run_searches(positions, depth, cache):
+    """
+    Searches every position with iterative deepening up to a fixed depth.
+
+    Args:
+        positions (list): Tuples (board, turn).
+        depth (int): Deepest iteration to run.
+        cache (MoveCache): Cache shared by all searches.
+
+    Returns:
+        float: Total search time in seconds.
+    """
+    start = time.perf_counter()
+    for board, turn in positions:
+        context = ai.SearchContext(seed=0, cache=cache)
+        ai.search(board, turn == BLACK, context, max_depth=depth)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare search time with and without the move cache.")
+    parser.add_argument("--plies", type=int, default=30, help="number of game positions to search")
+    parser.add_argument("--depth", type=int, default=4, help="deepest iteration per position")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 50000], help="cache capacities to try; 0 (no caching) always runs first as the reference")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the sampled game")
+    args = parser.parse_args()
+
+    positions = sample_game_positions(args.plies, args.seed)
+    print(f"{len(positions)} positions, iterative deepening to depth {args.depth}")
+    print(f"{'capacity':>10} {'time (s)':>10} {'hits':>10} {'misses':>10} {'hit rate':>9}")
+
+    baseline = None
+    for size in [0] + [size for size in args.sizes if size != 0]:
+        cache = MoveCache(size)
+        elapsed = run_searches(positions, args.depth, cache)
+        if baseline is None:
+            baseline = elapsed
+        stats = cache.stats()
+        print(f"{size:>10} {elapsed:>10.3f} {stats['hits']:>10} {stats['misses']:>10} {stats['hit_rate']:>8.1%}"
+              f"  ({baseline / elapsed:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -176,13 +176,11 @@ def get_all_moves(board, color):
               is (start_coords, end_coords, skipped_coords).
     """
     moves = []
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)
-        for move, skip in valid_moves.items():
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, skip)
-            skipped_coords = [(p.row, p.col) for p in skip]
-            move_details = ((piece.row, piece.col), move, skipped_coords)
-            moves.append((new_board, move_details))
+    for piece, move, skip in board.get_all_valid_moves(color):
+        temp_board = deepcopy(board)
+        temp_piece = temp_board.get_piece(piece.row, piece.col)
+        new_board = simulate_move(temp_piece, move, temp_board, skip)
+        skipped_coords = [(p.row, p.col) for p in skip]
+        move_details = ((piece.row, piece.col), move, skipped_coords)
+        moves.append((new_board, move_details))
     return moves
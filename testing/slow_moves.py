@@ -0,0 +1,286 @@
+"""
+Slow Move Corpus for Console Checkers AI.
+
+Benchmark and tournament games sometimes contain a move that takes far
+longer than its budget, and such a spike is gone by the time anyone looks at
+the results. With ``--slow-moves PATH`` the game runners hand every engine
+move to a SlowMoveRecorder, which appends the moves whose search time or
+node count exceeds a threshold to a JSONL corpus. Each record holds:
+
+- ``fen``: the position, with the side to move.
+- ``engine`` and ``seed``: the engine spec and the seed that reproduces its
+  search (null for engines that cannot be replayed exactly, such as mcts).
+- ``history``: the position keys since the last irreversible move, so
+  repetition detection sees the same game.
+- ``seconds``, ``nodes`` and ``move``: what the search took and chose.
+- ``ply`` and ``game``: where the move was played.
+
+Running this module replays a corpus, optionally under the profiler, and
+compares each search with the recorded one::
+
+    python testing/slow_moves.py slow.jsonl --profile slow --profile-mode deterministic
+
+Replays use a fresh transposition table, so searches that relied on a table
+kept between moves can differ from the recorded ones. Node counts of seeded
+searches without a clock are reproduced exactly; time-limited searches are
+reproduced up to timing noise.
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from collections import namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import GameHistory
+from position import Position, move_to_text
+from profiling import add_profile_arguments, profiler_from_args
+from registry import ENGINES, make_engine, parse_spec, format_spec
+
+# Search time above which a move is captured when no threshold is given.
+SLOW_MOVE_SECONDS = 1.0
+
+Replay = namedtuple('Replay', ['move', 'seconds', 'nodes'])
+Replay.__doc__ = """Outcome of replaying a corpus record: the move as PDN text (or None), the
+seconds the search took and its node count (None if the engine does not count)."""
+
+class SlowMoveRecorder:
+    """
+    Appends moves over a time or node threshold to a corpus file.
+
+    Attributes:
+        path (str): The corpus file.
+        max_seconds (float): Search time above which a move is captured, or None.
+        max_nodes (int): Node count above which a move is captured, or None.
+        checked (int): Moves checked.
+        captured (int): Moves written to the corpus.
+    """
+    def __init__(self, path, max_seconds=None, max_nodes=None):
+        """
+        Opens the corpus for appending.
+
+        Args:
+            path (str): The corpus file, created if missing.
+            max_seconds (float, optional): Time threshold. Defaults to None.
+            max_nodes (int, optional): Node threshold. Defaults to None.
+
+        Raises:
+            ValueError: If neither threshold is given.
+        """
+        if max_seconds is None and max_nodes is None:
+            raise ValueError("a time or node threshold is required")
+        self.path = path
+        self.max_seconds = max_seconds
+        self.max_nodes = max_nodes
+        self.checked = 0
+        self.captured = 0
+        self._file = open(path, 'a')
+
+    def is_slow(self, seconds, nodes=None):
+        """Returns True if a search of this time and node count exceeds a threshold."""
+        if self.max_seconds is not None and seconds > self.max_seconds:
+            return True
+        return self.max_nodes is not None and nodes is not None and nodes > self.max_nodes
+
+    def check(self, engine, position, seconds, move_details, history=None, ply=None, game=None):
+        """
+        Captures a finished engine move if it was slow.
+
+        Args:
+            engine (Engine): The engine that just moved; its nodes and seed
+                describe the search.
+            position (Position): The position it moved in.
+            seconds (float): Wall-clock time of the search.
+            move_details (tuple): The chosen move, or None.
+            history (GameHistory, optional): Positions played so far, up to
+                and including position. Defaults to None.
+            ply (int, optional): Ply of the move in its game. Defaults to None.
+            game (str, optional): Label of the game. Defaults to None.
+
+        Returns:
+            bool: True if the move was written to the corpus.
+        """
+        self.checked += 1
+        if not self.is_slow(seconds, engine.nodes):
+            return False
+        keys = []
+        if history is not None and history.keys:
+            keys = history.keys[len(history.keys) - history.quiet_plies[-1] - 1:]
+        record = {
+            "fen": position.to_fen(), "engine": engine.spec, "seed": engine.seed, "history": keys,
+            "seconds": seconds, "nodes": engine.nodes, "move": move_to_text(move_details) if move_details else None,
+            "ply": ply, "game": game,
+        }
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self.captured += 1
+        return True
+
+    def close(self):
+        """Closes the corpus file."""
+        self._file.close()
+
+def load_corpus(path):
+    """
+    Reads the records of a corpus file.
+
+    Args:
+        path (str): The corpus file.
+
+    Returns:
+        list: One dictionary per captured move.
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def replay_spec(record):
+    """Returns the engine spec of a record with its recorded seed filled in."""
+    name, options = parse_spec(record["engine"])
+    if record.get("seed") is not None and 'seed' in ENGINES[name].defaults:
+        options['seed'] = record["seed"]
+    return format_spec(name, options)
+
+def has_clock(spec):
+    """
+    Tells whether an engine spec searches against the clock.
+
+    That is the case when it sets a time, or when it sets no depth, node or
+    playout limit and the engine falls back to its default time.
+    """
+    name, options = parse_spec(spec)
+    config = dict(ENGINES[name].defaults, **options)
+    if config.get('time') is not None:
+        return True
+    return not any(config.get(key) is not None for key in ('depth', 'nodes', 'playouts'))
+
+def replay(record, profiler=None):
+    """
+    Repeats the search of a corpus record.
+
+    Args:
+        record (dict): The captured move.
+        profiler (SearchProfiler, optional): Profiles the search when given. Defaults to None.
+
+    Returns:
+        Replay: The move, time and nodes of the repeated search.
+    """
+    position = Position.from_fen(record["fen"])
+    history = GameHistory()
+    for index, key in enumerate(record.get("history") or [position.hash]):
+        history.push(key, index == 0)
+    engine = make_engine(replay_spec(record))
+    try:
+        start = time.perf_counter()
+        if profiler is not None:
+            move_details = profiler.run(engine.choose_move, position, history=history)
+        else:
+            move_details = engine.choose_move(position, history=history)
+        seconds = time.perf_counter() - start
+    finally:
+        engine.close()
+    return Replay(move_to_text(move_details) if move_details else None, seconds, engine.nodes)
+
+def format_report(records, replays, indices=None):
+    """
+    Builds the comparison table of recorded and replayed searches.
+
+    Args:
+        records (list): Corpus records.
+        replays (list): Replay per record.
+        indices (list, optional): Corpus index of each record. Defaults to 0, 1, 2...
+
+    Returns:
+        str: The report.
+    """
+    lines = [f"{'#':>3} {'engine':<24} {'ply':>4} {'recorded':>9} {'nodes':>9} {'replayed':>9} {'nodes':>9}  move"]
+    for index, record, result in zip(indices or range(len(records)), records, replays):
+        same = "same" if result.move == record.get("move") else f"{record.get('move')} -> {result.move}"
+        lines.append(f"{index:>3} {record['engine']:<24} {str(record.get('ply', '-')):>4} "
+                     f"{record['seconds']:>8.3f}s {str(record.get('nodes', '-')):>9} "
+                     f"{result.seconds:>8.3f}s {str(result.nodes if result.nodes is not None else '-'):>9}  {same}")
+    return "\n".join(lines)
+
+def regressions(records, replays, ratio):
+    """
+    Lists the replays that took more than ratio times their recorded cost.
+
+    Nodes are compared for seeded searches without a clock, which replay
+    exactly, and seconds otherwise. Under a clock a slower search visits
+    fewer nodes, so only its time shows a regression.
+
+    Returns:
+        list: Indices of the regressed records.
+    """
+    failed = []
+    for index, (record, result) in enumerate(zip(records, replays)):
+        exact = record.get("seed") is not None and not has_clock(record["engine"])
+        if exact and record.get("nodes") is not None and result.nodes is not None:
+            if result.nodes > ratio * record["nodes"]:
+                failed.append(index)
+        elif result.seconds > ratio * record["seconds"]:
+            failed.append(index)
+    return failed
+
+def add_slow_move_arguments(parser):
+    """
+    Adds the shared slow move capture options to an argparse parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to extend.
+    """
+    group = parser.add_argument_group("slow move capture")
+    group.add_argument("--slow-moves", metavar="PATH", help="append moves over a threshold to the corpus PATH")
+    group.add_argument("--slow-time", type=float, metavar="S",
+                       help=f"capture searches longer than S seconds (default {SLOW_MOVE_SECONDS:g} "
+                            "unless --slow-nodes is given)")
+    group.add_argument("--slow-nodes", type=int, metavar="N", help="capture searches of more than N nodes")
+
+def recorder_options(args):
+    """Returns the (path, max_seconds, max_nodes) of the parsed options, or None."""
+    if not args.slow_moves:
+        return None
+    max_seconds = args.slow_time
+    if max_seconds is None and args.slow_nodes is None:
+        max_seconds = SLOW_MOVE_SECONDS
+    return args.slow_moves, max_seconds, args.slow_nodes
+
+def recorder_from_args(args):
+    """Returns a SlowMoveRecorder configured from parsed arguments, or None."""
+    options = recorder_options(args)
+    return SlowMoveRecorder(*options) if options else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a corpus of slow moves, optionally under the profiler.")
+    parser.add_argument("corpus", help="corpus file written with --slow-moves")
+    parser.add_argument("--index", type=int, nargs="+", help="only replay these records (0-based)")
+    parser.add_argument("--fail-ratio", type=float, metavar="R",
+                        help="exit with status 1 if a replay costs more than R times the recorded seconds "
+                             "(nodes for seeded searches without a clock)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = profiler_from_args(args)
+
+    records = load_corpus(args.corpus)
+    indices = args.index or list(range(len(records)))
+    records = [records[index] for index in indices]
+    replays = []
+    for record in records:
+        profiled = profiler is not None and args.profile_move in (None, record.get("ply"))
+        replays.append(replay(record, profiler if profiled else None))
+    print(format_report(records, replays, indices))
+
+    if profiler is not None:
+        for path in profiler.write(args.profile):
+            print(f"Profile written to {path}")
+    if args.fail_ratio is not None:
+        failed = regressions(records, replays, args.fail_ratio)
+        if failed:
+            print(f"{len(failed)} replays exceeded {args.fail_ratio:g}x their recorded cost: "
+                  f"{', '.join(str(indices[index]) for index in failed)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
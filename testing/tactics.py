@@ -0,0 +1,169 @@
+"""
+Tactical Test Suite for Console Checkers AI.
+
+This module measures how fast the AI finds known best moves. Each position
+of a suite file is searched with iterative deepening, and the runner records
+the time and nodes at which the correct move first became the best move of a
+completed iteration and stayed so until the end of the search. Totals and
+the number of positions solved within the budget are reported, so search
+speedups show up directly rather than through win rates.
+
+Suite files hold one position per line, with fields separated by ``;``::
+
+    W:W18,22,23,K30:B5,9,10,14 ; bm 22-17 ; id shot-1
+
+``bm`` lists one or more accepted moves in PDN notation, ``id`` names the
+position. Blank lines and lines starting with ``#`` are ignored.
+"""
+
+import sys
+import os
+import json
+import argparse
+from collections import namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import BLACK, MAX_SEARCH_DEPTH
+from move_cache import MoveCache
+from position import Position, move_to_text
+from tt import TranspositionTable
+import ai
+
+DEFAULT_SUITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tactics.epd')
+
+TacticalPosition = namedtuple('TacticalPosition', ['id', 'fen', 'best_moves'])
+TacticalPosition.__doc__ = """A suite entry: name, FEN and the accepted best moves as PDN texts."""
+
+Solution = namedtuple('Solution', ['id', 'solved', 'depth', 'nodes', 'seconds', 'move', 'total_nodes', 'total_seconds'])
+Solution.__doc__ = """Outcome of one position: whether it was solved, the depth, nodes and
+seconds at which the correct move appeared for good (None if unsolved), the
+final move, and the nodes and seconds of the whole search."""
+
+def normalize_move(text):
+    """Returns a PDN move text without intermediate squares, e.g. ``15x24x31`` -> ``15x31``."""
+    separator = 'x' if 'x' in text.lower() else '-'
+    parts = text.lower().replace('x', '-').split('-')
+    return f"{int(parts[0])}{separator}{int(parts[-1])}"
+
+def load_suite(path):
+    """
+    Reads a suite file.
+
+    Args:
+        path (str): The suite file.
+
+    Returns:
+        list: TacticalPosition entries in file order.
+
+    Raises:
+        ValueError: If a line has no FEN or no ``bm`` field.
+    """
+    suite = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split(';')]
+            fen, best_moves, name = fields[0], [], f"line-{number}"
+            for field in fields[1:]:
+                opcode, _, value = field.partition(' ')
+                if opcode == 'bm':
+                    best_moves = [normalize_move(move) for move in value.split()]
+                elif opcode == 'id':
+                    name = value.strip().strip('"')
+            if not fen or not best_moves:
+                raise ValueError(f"{path}:{number}: expected '<fen> ; bm <move> ; id <name>'")
+            suite.append(TacticalPosition(name, fen, best_moves))
+    return suite
+
+def solve(entry, time_limit=None, max_nodes=None, max_depth=MAX_SEARCH_DEPTH, seed=0, settings=None):
+    """
+    Searches one suite position and finds when the correct move settled.
+
+    Args:
+        entry (TacticalPosition): The position and its best moves.
+        time_limit (float, optional): Seconds for the search, or None for no clock. Defaults to None.
+        max_nodes (int, optional): Node budget. Defaults to None.
+        max_depth (int, optional): Deepest iteration. Defaults to MAX_SEARCH_DEPTH.
+        seed (int, optional): Seed for move shuffling. Defaults to 0.
+        settings (SearchSettings, optional): Selective search settings. Defaults to SearchSettings().
+
+    Returns:
+        Solution: The outcome.
+    """
+    position = Position.from_fen(entry.fen)
+    iterations = []
+    context = ai.SearchContext(time_limit, max_nodes, seed, cache=MoveCache(), tt=TranspositionTable(),
+                               settings=settings)
+    result = ai.search(position.to_board(), position.turn == BLACK, context, max_depth, iterations.append)
+
+    settled = None
+    for iteration in reversed(iterations):
+        if iteration.move is None or move_to_text(iteration.move) not in entry.best_moves:
+            break
+        settled = iteration
+    move = move_to_text(result.move) if result.move else None
+    if settled is None:
+        return Solution(entry.id, False, None, None, None, move, result.nodes, result.elapsed)
+    return Solution(entry.id, True, settled.depth, settled.nodes, settled.elapsed, move, result.nodes, result.elapsed)
+
+def format_report(solutions, budget_seconds=None):
+    """
+    Builds the text report of a suite run.
+
+    Args:
+        solutions (list): Solution per position.
+        budget_seconds (float, optional): Time limit per position; unsolved
+            positions count as this much time in the penalized total. Defaults to None.
+
+    Returns:
+        str: The report.
+    """
+    lines = [f"{'id':<20} {'result':<7} {'depth':>5} {'nodes':>9} {'seconds':>8}  move"]
+    for s in solutions:
+        if s.solved:
+            lines.append(f"{s.id:<20} {'solved':<7} {s.depth:>5} {s.nodes:>9} {s.seconds:>8.3f}  {s.move}")
+        else:
+            lines.append(f"{s.id:<20} {'failed':<7} {'-':>5} {'-':>9} {'-':>8}  {s.move or '-'}")
+
+    solved = [s for s in solutions if s.solved]
+    lines.append("")
+    lines.append(f"Solved {len(solved)}/{len(solutions)} within budget")
+    lines.append(f"Time to solution (solved): {sum(s.seconds for s in solved):.3f}s, "
+                 f"{sum(s.nodes for s in solved)} nodes")
+    if budget_seconds is not None:
+        penalized = sum(s.seconds if s.solved else budget_seconds for s in solutions)
+        lines.append(f"Total time (unsolved counted as {budget_seconds:g}s): {penalized:.3f}s")
+    lines.append(f"Search total: {sum(s.total_seconds for s in solutions):.3f}s, "
+                 f"{sum(s.total_nodes for s in solutions)} nodes")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time and nodes to solution on a tactical position suite.")
+    parser.add_argument("suite", nargs="?", default=DEFAULT_SUITE, help="suite file (default: testing/tactics.epd)")
+    parser.add_argument("--time", type=float, default=2.0, help="seconds per position (default 2)")
+    parser.add_argument("--nodes", type=int, help="node budget per position; with --time 0 results are machine-independent")
+    parser.add_argument("--depth", type=int, default=MAX_SEARCH_DEPTH, help="deepest iteration")
+    parser.add_argument("--seed", type=int, default=0, help="move shuffle seed (default 0)")
+    parser.add_argument("--lmr", action="store_true", help="enable late move reductions")
+    parser.add_argument("--futility", action="store_true", help="enable futility pruning")
+    parser.add_argument("--filter", help="only run positions whose id contains this text")
+    parser.add_argument("--json", action="store_true", help="print the solutions as JSON")
+    args = parser.parse_args()
+
+    suite = load_suite(args.suite)
+    if args.filter:
+        suite = [entry for entry in suite if args.filter in entry.id]
+    time_limit = args.time or None
+    settings = ai.SearchSettings(lmr=args.lmr, futility=args.futility)
+    solutions = [solve(entry, time_limit, args.nodes, args.depth, args.seed, settings) for entry in suite]
+
+    if args.json:
+        print(json.dumps([s._asdict() for s in solutions], indent=2))
+    else:
+        print(format_report(solutions, time_limit))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Tournament Module for Console Checkers AI.
+
+This module plays a round-robin between any number of engine configurations.
+Games run in parallel worker processes. Every pairing is scored with an Elo
+estimate and 95% error bars, and is monitored by a sequential probability
+ratio test (SPRT) so that clearly decided pairings stop early instead of
+playing all of their games.
+
+Engines are given as spec strings ``name[:key=value,...]`` and built by
+``registry.make_engine``, e.g. ``old``, ``new``, ``ai:time=0.2,lmr=1`` or
+``mcts:playouts=2000``; see the registry module for the engines and options.
+
+With ``--shared-tt SLOTS`` every ``ai`` search in every worker process uses
+one SharedTranspositionTable, so positions analysed in one game speed up
+the others. Results then depend on game scheduling and are no longer
+reproducible move for move.
+"""
+
+import sys
+import os
+import math
+import time
+import random
+import argparse
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board
+from constants import RED, BLACK
+from history import GameHistory, is_irreversible
+from position import Position
+from registry import AlphaBetaEngine, make_engine
+from shared_tt import SharedTranspositionTable
+from testing.slow_moves import SlowMoveRecorder, add_slow_move_arguments, recorder_options
+
+# Table used by all ai engines of this process, set by _init_worker.
+_shared_tt = None
+# Slow move recorder of this process, set by _init_worker.
+_recorder = None
+
+def _init_worker(tt, slow_moves=None):
+    """
+    Pool initializer: installs the tournament's shared transposition table
+    and opens this process's slow move recorder.
+
+    Args:
+        tt (SharedTranspositionTable): The shared table, or None.
+        slow_moves (tuple, optional): (path, max_seconds, max_nodes) of the
+            slow move corpus, or None. Defaults to None.
+    """
+    global _shared_tt, _recorder
+    _shared_tt = tt
+    _recorder = SlowMoveRecorder(*slow_moves) if slow_moves else None
+
+def play_engine_game(red_spec, black_spec, opening_seed, opening_plies=4, max_moves=200):
+    """
+    Plays one game between two engine specs.
+
+    The game starts with opening_plies random legal moves chosen by a
+    generator seeded with opening_seed, so both color assignments of a
+    pairing can replay the same opening.
+
+    Args:
+        red_spec (str): Engine spec for RED.
+        black_spec (str): Engine spec for BLACK.
+        opening_seed (int): Seed of the random opening.
+        opening_plies (int, optional): Random plies before the engines take over. Defaults to 4.
+        max_moves (int, optional): Moves after which the game is drawn. Defaults to 200.
+
+    Returns:
+        dict: red, black, winner ('RED', 'BLACK' or 'DRAW'), plies, opening_seed
+              and the per-move search times of each side.
+    """
+    engines = {RED: make_engine(red_spec), BLACK: make_engine(black_spec)}
+    for engine in engines.values():
+        if isinstance(engine, AlphaBetaEngine):
+            engine.shared_tt = _shared_tt
+    rng = random.Random(opening_seed)
+    board = Board()
+    turn = RED
+    history = GameHistory()
+    history.push(board.position_key(turn), True)
+    durations = []
+    winner = None
+
+    for ply in range(max_moves):
+        if ply < opening_plies:
+            moves = board.get_all_valid_moves(turn)
+            if moves:
+                piece, move, skipped = rng.choice(moves)
+                move_details = ((piece.row, piece.col), move, [(p.row, p.col) for p in skipped])
+            else:
+                move_details = None
+        else:
+            position = Position.from_board(board, turn)
+            start_time = time.time()
+            move_details = engines[turn].choose_move(position, history=history)
+            duration = time.time() - start_time
+            durations.append(("RED" if turn == RED else "BLACK", duration))
+            if _recorder is not None:
+                _recorder.check(engines[turn], position, duration, move_details, history, ply,
+                                f"{red_spec} vs {black_spec}, opening {opening_seed}")
+
+        if move_details is None:
+            winner = BLACK if turn == RED else RED
+            break
+
+        irreversible = is_irreversible(board, move_details)
+        board.apply_move(move_details, visual=False)
+        turn = BLACK if turn == RED else RED
+        history.push(board.position_key(turn), irreversible)
+
+        winner = board.winner()
+        if winner is not None or history.is_draw():
+            break
+
+    for engine in engines.values():
+        engine.close()
+    return {
+        "red": red_spec,
+        "black": black_spec,
+        "winner": {RED: "RED", BLACK: "BLACK"}.get(winner, "DRAW"),
+        "plies": len(history.keys) - 1,
+        "opening_seed": opening_seed,
+        "durations": durations,
+    }
+
+def _play_job(job):
+    """Worker entry point: plays the game described by a job tuple."""
+    pair, red_spec, black_spec, opening_seed, opening_plies, max_moves = job
+    return pair, play_engine_game(red_spec, black_spec, opening_seed, opening_plies, max_moves)
+
+def expected_score(elo):
+    """Returns the expected score for an Elo difference."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def elo_from_score(score):
+    """Returns the Elo difference for a score fraction, clamped away from 0 and 1."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+def elo_estimate(wins, draws, losses):
+    """
+    Estimates the Elo difference with a 95% confidence interval.
+
+    Args:
+        wins (int): Wins of the first engine.
+        draws (int): Draws.
+        losses (int): Losses of the first engine.
+
+    Returns:
+        tuple: (elo, error) where the interval is elo +- error. Both are NaN before the first game.
+    """
+    n = wins + draws + losses
+    if n == 0:
+        return float('nan'), float('nan')
+    score = (wins + 0.5 * draws) / n
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / n
+    margin = 1.96 * math.sqrt(variance / n)
+    low = elo_from_score(score - margin)
+    high = elo_from_score(score + margin)
+    return elo_from_score(score), (high - low) / 2
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    """
+    Computes the log-likelihood ratio of H1 (elo = elo1) against H0 (elo = elo0).
+
+    Uses the normal approximation of the trinomial game-outcome model. While
+    every game has the same outcome the score variance is zero, so one
+    win, draw and loss are added as a prior to keep the LLR finite.
+
+    Returns:
+        float: The LLR, 0 before the first game.
+    """
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0
+    if n in (wins, draws, losses):
+        wins, draws, losses, n = wins + 1, draws + 1, losses + 1, n + 3
+    score = (wins + 0.5 * draws) / n
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / n
+    s0, s1 = expected_score(elo0), expected_score(elo1)
+    return n * (s1 - s0) * (2 * score - s0 - s1) / (2 * variance)
+
+def sprt_bounds(alpha, beta):
+    """Returns the (lower, upper) LLR bounds for error rates alpha and beta."""
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+class Pairing:
+    """
+    Tracks the games and SPRT state of two engines.
+
+    Attributes:
+        first (str): Engine spec whose results are counted as wins.
+        second (str): The opponent engine spec.
+        wins (int): Wins of first.
+        draws (int): Draws.
+        losses (int): Losses of first.
+        scheduled (int): Games handed to workers so far.
+        decision (str or None): 'H1' (first is stronger), 'H0' or None while running.
+    """
+    def __init__(self, first, second):
+        """Initializes an empty pairing."""
+        self.first = first
+        self.second = second
+        self.wins = self.draws = self.losses = 0
+        self.scheduled = 0
+        self.decision = None
+
+    @property
+    def games(self):
+        """Number of finished games."""
+        return self.wins + self.draws + self.losses
+
+    def record(self, game):
+        """Counts a finished game from the point of view of first."""
+        if game["winner"] == "DRAW":
+            self.draws += 1
+        elif (game["winner"] == "RED") == (game["red"] == self.first):
+            self.wins += 1
+        else:
+            self.losses += 1
+
+def run_tournament(specs, games_per_pair, workers, elo0, elo1, alpha, beta, opening_plies, max_moves, seed, tt=None,
+                   slow_moves=None):
+    """
+    Plays a round-robin tournament with SPRT early stopping.
+
+    Games of each pairing are played in color-swapped pairs from the same
+    random opening. A pairing stops scheduling games once its SPRT accepts
+    H0 or H1, or after games_per_pair games.
+
+    Args:
+        specs (list): Engine spec strings.
+        games_per_pair (int): Maximum games per pairing.
+        workers (int): Number of worker processes (1 plays in this process).
+        elo0 (float): Elo difference under H0.
+        elo1 (float): Elo difference under H1.
+        alpha (float): False positive rate of the SPRT.
+        beta (float): False negative rate of the SPRT.
+        opening_plies (int): Random opening plies per game.
+        max_moves (int): Moves after which a game is drawn.
+        seed (int): Seed of the opening sequence.
+        tt (SharedTranspositionTable, optional): Table shared by the ai
+            engines of all workers. Defaults to None (a fresh table per search).
+        slow_moves (tuple, optional): (path, max_seconds, max_nodes) of a slow
+            move corpus every worker appends to. Defaults to None.
+
+    Returns:
+        list: The Pairing objects.
+    """
+    pairings = [Pairing(specs[i], specs[j]) for i in range(len(specs)) for j in range(i + 1, len(specs))]
+    lower, upper = sprt_bounds(alpha, beta)
+
+    def next_job():
+        open_pairings = [p for p in pairings if p.decision is None and p.scheduled < games_per_pair]
+        if not open_pairings:
+            return None
+        index = pairings.index(min(open_pairings, key=lambda p: p.scheduled))
+        pairing = pairings[index]
+        game_number = pairing.scheduled
+        pairing.scheduled += 1
+        opening_seed = seed * 1000003 + index * 10007 + game_number // 2
+        if game_number % 2 == 0:
+            red, black = pairing.first, pairing.second
+        else:
+            red, black = pairing.second, pairing.first
+        return (index, red, black, opening_seed, opening_plies, max_moves)
+
+    def finish(index, game):
+        pairing = pairings[index]
+        pairing.record(game)
+        llr = sprt_llr(pairing.wins, pairing.draws, pairing.losses, elo0, elo1)
+        if pairing.decision is None:
+            if llr >= upper:
+                pairing.decision = 'H1'
+            elif llr <= lower:
+                pairing.decision = 'H0'
+        print(f"{pairing.first} vs {pairing.second}: +{pairing.wins} ={pairing.draws} -{pairing.losses}"
+              f"  LLR {llr:.2f} [{lower:.2f}, {upper:.2f}]", flush=True)
+
+    if workers <= 1:
+        _init_worker(tt, slow_moves)
+        job = next_job()
+        while job is not None:
+            finish(*_play_job(job))
+            job = next_job()
+        return pairings
+
+    with multiprocessing.Pool(workers, _init_worker, (tt, slow_moves)) as pool:
+        pending = []
+        for _ in range(workers):
+            job = next_job()
+            if job is not None:
+                pending.append(pool.apply_async(_play_job, (job,)))
+        while pending:
+            done = [result for result in pending if result.ready()]
+            if not done:
+                time.sleep(0.01)
+                continue
+            for result in done:
+                pending.remove(result)
+                finish(*result.get())
+                job = next_job()
+                if job is not None:
+                    pending.append(pool.apply_async(_play_job, (job,)))
+    return pairings
+
+def format_report(pairings, elo0, elo1):
+    """
+    Formats the final tournament table.
+
+    Args:
+        pairings (list): Finished Pairing objects.
+        elo0 (float): Elo difference under H0.
+        elo1 (float): Elo difference under H1.
+
+    Returns:
+        str: The report.
+    """
+    lines = [f"{'pairing':<40} {'games':>5} {'W-D-L':>11} {'elo':>8} {'+-':>7}  SPRT [{elo0}, {elo1}]"]
+    scores = {}
+    for p in pairings:
+        elo, error = elo_estimate(p.wins, p.draws, p.losses)
+        verdict = {'H1': 'H1 accepted', 'H0': 'H0 accepted'}.get(p.decision, 'inconclusive')
+        lines.append(f"{p.first + ' vs ' + p.second:<40} {p.games:>5} {f'{p.wins}-{p.draws}-{p.losses}':>11}"
+                     f" {elo:>8.1f} {error:>7.1f}  {verdict}")
+        for spec, points in ((p.first, p.wins + 0.5 * p.draws), (p.second, p.losses + 0.5 * p.draws)):
+            total, games = scores.get(spec, (0.0, 0))
+            scores[spec] = (total + points, games + p.games)
+
+    lines.append("")
+    lines.append(f"{'engine':<30} {'score':>12}")
+    for spec, (points, games) in sorted(scores.items(), key=lambda item: -item[1][0] / max(item[1][1], 1)):
+        lines.append(f"{spec:<30} {f'{points:g}/{games}':>12}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a round-robin engine tournament with SPRT early stopping.")
+    parser.add_argument("engines", nargs="+", help="engine specs, e.g. old new ai:time=0.2")
+    parser.add_argument("--games", type=int, default=100, help="maximum games per pairing (default 100)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel worker processes")
+    parser.add_argument("--elo0", type=float, default=0.0, help="Elo difference under H0 (default 0)")
+    parser.add_argument("--elo1", type=float, default=50.0, help="Elo difference under H1 (default 50)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="SPRT false positive rate")
+    parser.add_argument("--beta", type=float, default=0.05, help="SPRT false negative rate")
+    parser.add_argument("--opening-plies", type=int, default=4, help="random plies at the start of each game")
+    parser.add_argument("--max-moves", type=int, default=200, help="moves after which a game is drawn")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the random openings")
+    parser.add_argument("--shared-tt", type=int, metavar="SLOTS",
+                        help="share one transposition table of SLOTS entries between all ai searches")
+    add_slow_move_arguments(parser)
+    args = parser.parse_args()
+
+    if len(args.engines) < 2:
+        parser.error("at least two engines are required")
+    for spec in args.engines:
+        try:
+            make_engine(spec).close()
+        except ValueError as e:
+            parser.error(str(e))
+
+    tt = SharedTranspositionTable(args.shared_tt) if args.shared_tt else None
+    start = time.time()
+    try:
+        pairings = run_tournament(args.engines, args.games, args.workers, args.elo0, args.elo1,
+                                  args.alpha, args.beta, args.opening_plies, args.max_moves, args.seed, tt,
+                                  recorder_options(args))
+    finally:
+        if tt is not None:
+            print(f"Shared table: {len(tt)} of {tt.capacity} slots used")
+            tt.close()
+    print()
+    print(format_report(pairings, args.elo0, args.elo1))
+    print(f"\n{sum(p.games for p in pairings)} games in {time.time() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Search Trace Viewer for Console Checkers AI.
+
+This module summarizes a trace written by tracer.SearchTracer: how each
+iteration ended, the largest traced subtrees, and move ordering failures,
+i.e. beta cutoffs that only came after the first move had been searched.
+Moves skipped by futility pruning do not count as searched.
+The cutoff statistics only cover the traced nodes; raise the sampling rate
+or lower the subtree size threshold for fuller counts.
+
+With --record it first traces a search of a position given as FEN:
+
+    python testing/trace_view.py trace.jsonl --record --fen "B:W21,22,...:B1,2,..." --time 2
+"""
+
+import sys
+import os
+import argparse
+from collections import Counter, defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import BLACK
+from position import Position
+from tracer import SearchTracer, read_trace, CUTOFF
+import ai
+
+def record(path, fen, time_limit, max_depth, sample, min_nodes, max_records):
+    """
+    Traces one search and writes the trace to a file.
+
+    Args:
+        path (str): Output trace file.
+        fen (str): Position to search, or None for the starting position.
+        time_limit (float): Seconds to search.
+        max_depth (int): Deepest iteration.
+        sample (float): Sampling probability of the tracer.
+        min_nodes (int): Subtree size that is always traced.
+        max_records (int): Record cap of the tracer.
+    """
+    position = Position.from_fen(fen) if fen else Position.initial()
+    tracer = SearchTracer(path, sample, min_nodes=min_nodes, max_records=max_records, seed=0)
+    tracer.begin(position.to_fen())
+    try:
+        context = ai.SearchContext(time_limit, seed=0, cache=ai.default_move_cache, tt=ai.TranspositionTable(),
+                                   tracer=tracer)
+        result = ai.search(position.to_board(), position.turn == BLACK, context, max_depth)
+    finally:
+        tracer.close()
+    print(f"Searched depth {result.depth}, {result.nodes} nodes in {result.elapsed:.2f}s; "
+          f"{tracer.written} records written, {tracer.dropped} dropped.")
+
+def path_text(record):
+    """Returns the move path of a record as text."""
+    return " ".join(record['path']) or "(root)"
+
+def summarize(records, top=10):
+    """
+    Builds the text summary of trace records.
+
+    Args:
+        records (iterable): Node records from read_trace().
+        top (int, optional): Rows in the subtree and failure tables. Defaults to 10.
+
+    Returns:
+        str: The summary.
+    """
+    records = list(records)
+    lines = []
+    roots = [r for r in records if r['ply'] == 0]
+    lines.append(f"{len(records)} records, {len(roots)} completed root iterations")
+    for root in roots:
+        lines.append(f"  search {root['search']} iteration {root['iter']}: depth {root['depth']}, "
+                     f"{root['nodes']} nodes, score {root['score']}, {root['reason']}")
+
+    reasons = Counter(r['reason'] for r in records)
+    lines.append("")
+    lines.append("Node endings: " + ", ".join(f"{reason} {count}" for reason, count in reasons.most_common()))
+
+    lines.append("")
+    lines.append("Largest subtrees:")
+    lines.append(f"  {'nodes':>8} {'ply':>4} {'depth':>5} {'reason':<9} {'window':<22} path")
+    inner = sorted((r for r in records if r['ply'] > 0), key=lambda r: r['nodes'], reverse=True)
+    for r in inner[:top]:
+        window = f"[{r['alpha']}, {r['beta']}]"
+        lines.append(f"  {r['nodes']:>8} {r['ply']:>4} {r['depth']:>5} {r['reason']:<9} {window:<22} {path_text(r)}")
+
+    cutoffs = [r for r in records if r['reason'] == CUTOFF]
+    by_ply = defaultdict(lambda: [0, 0, 0])
+    for r in cutoffs:
+        stats = by_ply[r['ply']]
+        stats[0] += 1
+        stats[1] += r['cutoff'] == 0
+        stats[2] += r['cutoff']
+    lines.append("")
+    lines.append("Beta cutoffs by ply (share on the first move, mean cutoff move index):")
+    for ply in sorted(by_ply):
+        count, first, index_sum = by_ply[ply]
+        lines.append(f"  ply {ply:>2}: {count:>6} cutoffs, {first / count:>6.1%} first move, mean index {index_sum / count:.2f}")
+
+    failures = sorted((r for r in cutoffs if r['cutoff'] > 0), key=lambda r: r['nodes'], reverse=True)
+    lines.append("")
+    lines.append(f"Costliest ordering failures ({len(failures)} late cutoffs):")
+    lines.append(f"  {'nodes':>8} {'ply':>4} {'depth':>5} {'cutoff':>6} {'moves':>5} {'tt':>3} path")
+    for r in failures[:top]:
+        tt = 'yes' if r['tt_move'] else 'no'
+        lines.append(f"  {r['nodes']:>8} {r['ply']:>4} {r['depth']:>5} {r['cutoff']:>6} {r['moves']:>5} {tt:>3} {path_text(r)}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize (and optionally record) a search tree trace.")
+    parser.add_argument("trace", help="trace file written by SearchTracer")
+    parser.add_argument("--top", type=int, default=10, help="rows in the subtree and failure tables (default 10)")
+    parser.add_argument("--search", type=int, help="only summarize this search number")
+    parser.add_argument("--record", action="store_true", help="trace a search first, overwriting the trace file")
+    parser.add_argument("--fen", help="position to record (default: the starting position)")
+    parser.add_argument("--time", type=float, default=1.0, help="seconds to search when recording (default 1)")
+    parser.add_argument("--depth", type=int, default=ai.MAX_SEARCH_DEPTH, help="deepest iteration when recording")
+    parser.add_argument("--sample", type=float, default=0.01, help="sampling probability when recording (default 0.01)")
+    parser.add_argument("--min-nodes", type=int, default=1000,
+                        help="always trace subtrees of at least this many nodes (default 1000)")
+    parser.add_argument("--max-records", type=int, default=100000, help="record cap when recording (default 100000)")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.trace, args.fen, args.time, args.depth, args.sample, args.min_nodes, args.max_records)
+    records = read_trace(args.trace)
+    if args.search is not None:
+        records = (r for r in records if r['search'] == args.search)
+    print(summarize(records, args.top))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Search Tracing Module for Console Checkers.
+
+This module records the tree searched by minimax so slow searches can be
+examined afterwards. A SearchTracer is attached to a SearchContext. minimax
+reports every node it enters and leaves, and the tracer writes one JSON line
+per kept node with:
+
+- ``search``: number of the traced search (see begin()).
+- ``iter``: number of the root iteration within the search.
+- ``path``: the moves from the root, in PDN notation.
+- ``ply`` and ``depth``: distance from the root and remaining depth.
+- ``alpha`` and ``beta``: the window the node was entered with.
+- ``score``: the value returned.
+- ``reason``: how the node ended (see REASONS).
+- ``moves``: legal moves; ``cutoff``: number of moves searched before the
+  one that caused a beta cutoff, or null. Moves skipped by futility pruning
+  are not counted, so 0 means the first searched move cut off.
+  ``tt_move``: whether a table move was tried first.
+- ``nodes``: size of the subtree, this node included.
+
+Records are written when a node is left, so children come before parents.
+Writing every node is too large for real searches, so nodes are sampled:
+nodes up to ``full_plies`` from the root and subtrees of at least
+``min_nodes`` nodes are always kept, other nodes with probability
+``sample``. After ``max_records`` records the tracer stops writing and only
+counts what it drops.
+
+Without a tracer the search only tests ``context.tracer`` for None.
+"""
+
+import json
+import random
+from position import move_to_text
+
+# Ways a node can end.
+LEAF = 'leaf'            # Depth exhausted or game over; static evaluation.
+TT_HIT = 'tt'            # Answered by the transposition table.
+CUTOFF = 'cutoff'        # Fail-high: the score reached beta.
+FAIL_LOW = 'fail-low'    # No move reached alpha.
+EXACT = 'exact'          # The score fell inside the window.
+NO_MOVES = 'no-moves'    # The side to move had no legal move.
+REASONS = (LEAF, TT_HIT, CUTOFF, FAIL_LOW, EXACT, NO_MOVES)
+
+def _number(value):
+    """Returns a score in a JSON-safe form (infinities as strings)."""
+    if value in (float('inf'), float('-inf')):
+        return str(value)
+    return value
+
+def _move_text(move):
+    """Returns the PDN text of a noted (index, move_details) pair, '?' if no move was noted."""
+    if move is None:
+        return "?"
+    return move_to_text(move[1])
+
+class SearchTracer:
+    """
+    Writes a sampled trace of the searched tree as JSON lines.
+
+    Attributes:
+        written (int): Records written.
+        dropped (int): Records skipped because max_records was reached.
+        searches (int): Searches started with begin().
+    """
+    def __init__(self, path, sample=0.01, full_plies=2, min_nodes=1000, max_records=100000, seed=None):
+        """
+        Opens the trace file.
+
+        Args:
+            path (str): Output file, overwritten.
+            sample (float, optional): Probability of keeping any other node. Defaults to 0.01.
+            full_plies (int, optional): Nodes up to this ply are always kept. Defaults to 2.
+            min_nodes (int, optional): Subtrees of at least this many nodes are
+                always kept. Defaults to 1000.
+            max_records (int, optional): Records written before the tracer stops. Defaults to 100000.
+            seed (int, optional): Seed of the sampling generator. Defaults to None.
+        """
+        self.path = path
+        self.sample = sample
+        self.full_plies = full_plies
+        self.min_nodes = min_nodes
+        self.max_records = max_records
+        self.written = 0
+        self.dropped = 0
+        self.searches = 0
+        self._rng = random.Random(seed)
+        self._file = open(path, 'w')
+        self._stack = []
+        self._move = None
+        self._iteration = 0
+
+    def begin(self, label=None):
+        """
+        Marks the start of a new search, e.g. one move of a game.
+
+        Args:
+            label (optional): Stored in a ``{"search": n, "label": ...}`` line.
+        """
+        self.abort()
+        self.searches += 1
+        self._iteration = 0
+        self._file.write(json.dumps({'search': self.searches, 'label': label}) + "\n")
+
+    def child(self, index, move_details):
+        """Notes the move about to be searched from the current node."""
+        self._move = (index, move_details)
+
+    def enter(self, depth, alpha, beta, nodes):
+        """
+        Opens a node.
+
+        Args:
+            depth (int): Remaining depth.
+            alpha (float): Alpha on entry.
+            beta (float): Beta on entry.
+            nodes (int): Node count of the search, this node included.
+        """
+        if not self._stack:
+            self._iteration += 1
+            self._move = None
+        self._stack.append((self._move, depth, alpha, beta, nodes))
+        self._move = None
+
+    def leave(self, nodes, score, reason, moves=0, cutoff=None, tt_move=False):
+        """
+        Closes the current node and writes it if it is sampled.
+
+        Args:
+            nodes (int): Node count of the search when the node finished.
+            score (float): The value returned.
+            reason (str): One of REASONS.
+            moves (int, optional): Number of legal moves. Defaults to 0.
+            cutoff (int, optional): Moves searched before the one causing a beta
+                cutoff, pruned moves not counted. Defaults to None.
+            tt_move (bool, optional): True if a table move was ordered first. Defaults to False.
+        """
+        move, depth, alpha, beta, start = self._stack.pop()
+        ply = len(self._stack)
+        size = nodes - start + 1
+        if ply > self.full_plies and size < self.min_nodes and self._rng.random() >= self.sample:
+            return
+        if self.written >= self.max_records:
+            self.dropped += 1
+            return
+        path = [_move_text(frame[0]) for frame in self._stack[1:]]
+        if self._stack:
+            path.append(_move_text(move))
+        record = {
+            'search': self.searches, 'iter': self._iteration, 'path': path, 'ply': ply, 'depth': depth,
+            'index': None if move is None else move[0], 'alpha': _number(alpha), 'beta': _number(beta),
+            'score': _number(score), 'reason': reason, 'moves': moves, 'cutoff': cutoff, 'tt_move': tt_move,
+            'nodes': size,
+        }
+        self._file.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self.written += 1
+
+    def abort(self):
+        """Drops the nodes left open by an interrupted search."""
+        self._stack.clear()
+        self._move = None
+
+    def close(self):
+        """Closes the trace file."""
+        self.abort()
+        self._file.close()
+
+def read_trace(path):
+    """
+    Reads the node records of a trace file.
+
+    Args:
+        path (str): The trace file.
+
+    Yields:
+        dict: One record per traced node. Search marker lines are skipped.
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if 'path' in record:
+                yield record
+
+def add_trace_arguments(parser):
+    """
+    Adds the shared search tracing options to an argparse parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to extend.
+    """
+    group = parser.add_argument_group("search tracing")
+    group.add_argument("--trace", metavar="PATH", help="write a sampled trace of the AI search trees to PATH")
+    group.add_argument("--trace-sample", type=float, metavar="P", default=0.01,
+                       help="probability of keeping a node below the full plies (default 0.01)")
+    group.add_argument("--trace-full-plies", type=int, metavar="N", default=2,
+                       help="always keep nodes up to this ply (default 2)")
+    group.add_argument("--trace-min-nodes", type=int, metavar="N", default=1000,
+                       help="always keep subtrees of at least this many nodes (default 1000)")
+    group.add_argument("--trace-max-records", type=int, metavar="N", default=100000,
+                       help="stop writing after this many records (default 100000)")
+
+def tracer_from_args(args):
+    """Returns a SearchTracer configured from parsed arguments, or None."""
+    if not args.trace:
+        return None
+    return SearchTracer(args.trace, args.trace_sample, args.trace_full_plies, args.trace_min_nodes,
+                        args.trace_max_records)
@@ -0,0 +1,107 @@
+"""
+Transposition Table Module for Console Checkers.
+
+This module stores search results by position key so that positions reached
+through different move orders, in later iterations or in later searches are
+not searched again from scratch. Each entry keeps the searched depth, the
+score, whether the score is exact or only a bound, and the best move.
+"""
+
+from constants import TT_SIZE
+
+# Entry Flags
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Flag of the same bound on the negated score, for entries stored by the mirror image.
+NEGATED_FLAGS = {EXACT: EXACT, LOWER_BOUND: UPPER_BOUND, UPPER_BOUND: LOWER_BOUND}
+
+class TranspositionTable:
+    """
+    A bounded table of search results.
+
+    When the table is full, the oldest entry is evicted. An existing entry is
+    only overwritten by a result searched at least as deep.
+
+    Attributes:
+        capacity (int): Maximum number of entries.
+        entries (dict): Position key -> (depth, score, flag, move).
+        probes (int): Number of lookups.
+        hits (int): Number of lookups that found an entry.
+    """
+    def __init__(self, capacity=TT_SIZE):
+        """
+        Initializes an empty table.
+
+        Args:
+            capacity (int, optional): Maximum number of entries. Defaults to TT_SIZE.
+        """
+        self.capacity = capacity
+        self.entries = {}
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def probe(self, key):
+        """
+        Looks up a position.
+
+        Args:
+            key (int): The position key.
+
+        Returns:
+            tuple or None: (depth, score, flag, move) if the position is stored.
+        """
+        self.probes += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def get(self, key):
+        """Looks up a position without counting a probe."""
+        return self.entries.get(key)
+
+    def store(self, key, depth, score, flag, move):
+        """
+        Stores a search result.
+
+        Args:
+            key (int): The position key.
+            depth (int): Remaining depth the position was searched to.
+            score (float): The search score.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            move (tuple): Best move details found, or None.
+        """
+        existing = self.entries.get(key)
+        if existing is not None:
+            if existing[0] > depth:
+                return
+        elif len(self.entries) >= self.capacity:
+            if self.capacity <= 0:
+                return
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = (depth, score, flag, move)
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        self.entries.clear()
+        self.probes = self.hits = 0
+
+    def stats(self):
+        """
+        Summarizes table usage.
+
+        Returns:
+            dict: size, capacity, probes, hits and hit_rate.
+        """
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+        }